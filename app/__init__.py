@@ -5,30 +5,45 @@ from flask_cors import CORS
 from flask_jwt_extended import JWTManager
 from flask_limiter import Limiter
 from flask_limiter.util import get_remote_address
-import logging
-from logging.handlers import RotatingFileHandler
+from sqlalchemy import event
+from app.utils.assets import Assets
+from app.utils.compression import Compressor
+from app.utils.json_provider import FastJSONProvider
+from app.utils.log import StructuredLogging
+from app.utils.profiler import Profiler
+from app.utils.scheduler import Scheduler
 import os
 from datetime import timedelta
 
 # Initialize extensions
+structured_log = StructuredLogging()
 db = SQLAlchemy()
 migrate = Migrate()
 jwt = JWTManager()
 limiter = Limiter(key_func=get_remote_address)
+compress = Compressor()
+profiler = Profiler()
+assets = Assets()
+scheduler = Scheduler()
 
 def create_app():
     app = Flask(__name__, 
                 template_folder='../templates',
                 static_folder='../static')
+    app.json = FastJSONProvider(app)
     
     # Load configuration
     app.config.from_object('app.config.Config')
     
-    # Initialize extensions
+    # Initialize extensions; logging first, so its request hooks wrap all the others
+    structured_log.init_app(app)
     db.init_app(app)
     migrate.init_app(app, db)
     jwt.init_app(app)
     limiter.init_app(app)
+    profiler.init_app(app)
+    compress.init_app(app)
+    assets.init_app(app)
     CORS(app, supports_credentials=True)
     
     # JWT configuration
@@ -37,17 +52,48 @@ def create_app():
     app.config['JWT_REFRESH_TOKEN_EXPIRES'] = timedelta(days=30)
     
     # Import models to ensure they are registered with SQLAlchemy
-    from app.models import user, lab
+    from app.models import user, lab, task, notification, job, term
+    from app.services import job_handlers
     
     # Register blueprints
     from app.routes.auth import auth_bp
     from app.routes.labs import labs_bp
     from app.routes.api import api_bp
+    from app.routes.tasks import tasks_bp
+    from app.routes.search import search_bp
+    from app.routes.notifications import notifications_bp
     
     app.register_blueprint(auth_bp, url_prefix='/auth')
     app.register_blueprint(labs_bp, url_prefix='/api')
+    app.register_blueprint(tasks_bp, url_prefix='/api')
+    app.register_blueprint(search_bp, url_prefix='/api')
+    app.register_blueprint(notifications_bp, url_prefix='/api')
+    
+    # Periodic scans run in the background once the first request arrives
+    from app.services.notification_service import NotificationService
+    scheduler.init_app(app)
+    scheduler.add_job('notifications', NotificationService.run_scans, app.config['SCHEDULER_SCAN_INTERVAL'])
+    
+    from app.services.job_queue import JobQueue
+    scheduler.add_job('prune_jobs', JobQueue.prune, 6 * 60 * 60)
+    
+    # Keep this week's recurring occurrences as rows for reminders and stats
+    if app.config['RECURRENCE_MATERIALIZE']:
+        from app.services.reservation_service import ReservationService
+        scheduler.add_job('materialize_recurrences', ReservationService.materialize_current_week, 60 * 60)
     app.register_blueprint(api_bp)
     
+    # Web workers, the scheduler and the job worker all write to the same
+    # SQLite file; WAL lets readers proceed while one of them writes
+    if app.config['SQLALCHEMY_DATABASE_URI'].startswith('sqlite') and ':memory:' not in app.config['SQLALCHEMY_DATABASE_URI']:
+        with app.app_context():
+            @event.listens_for(db.engine, 'connect')
+            def set_sqlite_pragmas(dbapi_connection, connection_record):
+                cursor = dbapi_connection.cursor()
+                cursor.execute('PRAGMA journal_mode=WAL')
+                cursor.execute('PRAGMA busy_timeout=5000')
+                cursor.close()
+    
     # FORCE CREATE ALL TABLES ON STARTUP
     with app.app_context():
         try:
@@ -55,6 +101,11 @@ def create_app():
             db.create_all()
             print("✅ Database tables created successfully!")
             
+            # Full-text search indexes (FTS5 virtual tables and sync triggers)
+            from app.services.search_service import SearchService
+            if SearchService.install():
+                print("✅ Search index ready!")
+            
             # Verify the users table has the role column
             from app.models.user import User
             # This will trigger an error if the column doesn't exist
@@ -76,17 +127,6 @@ def create_app():
             finally:
                 conn.close()
     
-    # Configure logging
-    if not app.debug:
-        if not os.path.exists('logs'):
-            os.mkdir('logs')
-        file_handler = RotatingFileHandler('logs/app.log', maxBytes=10240, backupCount=10)
-        file_handler.setFormatter(logging.Formatter(
-            '%(asctime)s %(levelname)s: %(message)s [in %(pathname)s:%(lineno)d]'
-        ))
-        file_handler.setLevel(logging.INFO)
-        app.logger.addHandler(file_handler)
-        app.logger.setLevel(logging.INFO)
-        app.logger.info('IT Lab Scheduler startup')
+    app.logger.info('IT Lab Scheduler startup')
     
     return app
\ No newline at end of file
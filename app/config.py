@@ -12,6 +12,7 @@ class Config:
     
     # Rate Limiting
     RATELIMIT_STORAGE_URI = 'memory://'
+    RATELIMIT_ENABLED = os.getenv('RATELIMIT_ENABLED', 'true').lower() == 'true'  # off only for load tests
     
     # JWT Settings
     JWT_ACCESS_TOKEN_EXPIRES = timedelta(hours=1)
@@ -19,6 +20,72 @@ class Config:
     
     # Application Settings
     MAX_CONTENT_LENGTH = 16 * 1024 * 1024  # 16MB max file size
+    TASK_BULK_MAX_OPERATIONS = int(os.getenv('TASK_BULK_MAX_OPERATIONS', 200))
+    RESERVATION_BULK_MAX_DECISIONS = int(os.getenv('RESERVATION_BULK_MAX_DECISIONS', 500))
+    RESERVATION_MAX_DURATION_HOURS = int(os.getenv('RESERVATION_MAX_DURATION_HOURS', 24))  # also bounds conflict-check scans
+    RESERVATION_SYNC_OVERLAP = int(os.getenv('RESERVATION_SYNC_OVERLAP', 30))  # seconds a sync token lags behind now
+    
+    # Recurring reservations
+    RECURRENCE_MAX_OCCURRENCES = int(os.getenv('RECURRENCE_MAX_OCCURRENCES', 200))
+    RECURRENCE_DEFAULT_WINDOW_DAYS = int(os.getenv('RECURRENCE_DEFAULT_WINDOW_DAYS', 28))
+    RECURRENCE_MATERIALIZE = os.getenv('RECURRENCE_MATERIALIZE', 'true').lower() == 'true'
+    
+    # Registrar timetable import
+    TIMETABLE_IMPORT_CHUNK_SIZE = int(os.getenv('TIMETABLE_IMPORT_CHUNK_SIZE', 1000))
+    TIMETABLE_IMPORT_MAX_ERRORS = int(os.getenv('TIMETABLE_IMPORT_MAX_ERRORS', 500))
+    
+    # Archival of closed terms
+    ARCHIVE_BATCH_SIZE = int(os.getenv('ARCHIVE_BATCH_SIZE', 5000))
+    
+    # Response Compression
+    COMPRESS_ENABLED = os.getenv('COMPRESS_ENABLED', 'true').lower() == 'true'
+    COMPRESS_MIN_SIZE = int(os.getenv('COMPRESS_MIN_SIZE', 1024))  # bytes
+    COMPRESS_LEVEL = int(os.getenv('COMPRESS_LEVEL', 6))  # gzip 1-9
+    COMPRESS_BROTLI_QUALITY = int(os.getenv('COMPRESS_BROTLI_QUALITY', 4))  # brotli 0-11
+    COMPRESS_CACHE_SIZE = 256  # compressed bodies kept per worker
+    COMPRESS_CACHE_ENDPOINTS = [
+        'labs.get_labs',
+        'labs.get_reservations',
+        'labs.get_schedule',
+        'labs.get_stats',
+        'labs.get_dashboard'
+    ]
+
+    # Background scheduler (overdue tasks, session reminders); one leader per host via a file lock
+    SCHEDULER_ENABLED = os.getenv('SCHEDULER_ENABLED', 'true').lower() == 'true'
+    SCHEDULER_LOCK_FILE = os.getenv('SCHEDULER_LOCK_FILE')  # defaults to <instance>/scheduler.lock
+    SCHEDULER_SCAN_INTERVAL = int(os.getenv('SCHEDULER_SCAN_INTERVAL', 60))  # seconds
+    SESSION_REMINDER_LEAD_MINUTES = int(os.getenv('SESSION_REMINDER_LEAD_MINUTES', 30))
+
+    # Background job queue (processed by `flask run-worker`)
+    JOB_WORKER_THREADS = int(os.getenv('JOB_WORKER_THREADS', 4))
+    JOB_POLL_INTERVAL = float(os.getenv('JOB_POLL_INTERVAL', 1.0))  # seconds between empty polls
+    JOB_VISIBILITY_TIMEOUT = int(os.getenv('JOB_VISIBILITY_TIMEOUT', 300))  # lease before another worker may retry
+    JOB_MAX_ATTEMPTS = int(os.getenv('JOB_MAX_ATTEMPTS', 5))
+    JOB_BACKOFF_BASE = 10  # seconds, doubled per attempt
+    JOB_BACKOFF_MAX = 3600
+    JOB_RETENTION_DAYS = 7
+
+    # Logging: JSON lines written by a background thread (app/utils/log.py)
+    LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
+    LOG_FILE = os.getenv('LOG_FILE', 'logs/app.log')  # empty logs to stderr
+    LOG_MAX_BYTES = int(os.getenv('LOG_MAX_BYTES', 10 * 1024 * 1024))
+    LOG_BACKUP_COUNT = int(os.getenv('LOG_BACKUP_COUNT', 10))
+    LOG_QUEUE_SIZE = 10000  # records beyond this are dropped and counted, never waited for
+    LOG_SUCCESS_SAMPLE_RATE = float(os.getenv('LOG_SUCCESS_SAMPLE_RATE', 1.0))  # share of 2xx/3xx requests logged
+    LOG_SLOW_REQUEST_MS = int(os.getenv('LOG_SLOW_REQUEST_MS', 1000))  # slower requests are always logged
+
+    # Per-request profiling (summarised by `flask profile-report`)
+    PROFILER_ENABLED = os.getenv('PROFILER_ENABLED', 'false').lower() == 'true'
+    PROFILER_SAMPLE_RATE = float(os.getenv('PROFILER_SAMPLE_RATE', 0))  # share of all requests, 0-1
+    PROFILER_HEADER = 'X-Profile'  # lets an admin profile a single request
+    PROFILER_DIR = os.getenv('PROFILER_DIR')  # defaults to <instance>/profiles
+
+    # Health probes (/health/live, /health/ready)
+    HEALTH_CACHE_TTL = float(os.getenv('HEALTH_CACHE_TTL', 2))  # seconds a readiness report is reused
+    HEALTH_DB_TIMEOUT_MS = int(os.getenv('HEALTH_DB_TIMEOUT_MS', 500))  # SQLite busy timeout of the probe query
+    HEALTH_DB_SLOW_MS = int(os.getenv('HEALTH_DB_SLOW_MS', 250))  # slower round trips report "degraded"
+    HEALTH_JOB_LAG_WARN = int(os.getenv('HEALTH_JOB_LAG_WARN', 300))  # seconds the oldest due job may wait
 
 class DevelopmentConfig(Config):
     DEBUG = True
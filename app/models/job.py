@@ -0,0 +1,38 @@
+from app import db
+from app.utils.serializers import SerializerMixin
+from datetime import datetime
+
+class JobStatus:
+    QUEUED = 'queued'
+    RUNNING = 'running'
+    DONE = 'done'
+    DEAD = 'dead'
+
+class Job(SerializerMixin, db.Model):
+    __tablename__ = 'jobs'
+    __table_args__ = (
+        # Claim order: ready jobs by run_at, and running jobs whose lease expired
+        db.Index('ix_jobs_status_run_at', 'status', 'run_at'),
+        db.Index('ix_jobs_status_locked_until', 'status', 'locked_until'),
+    )
+    __serialize_columns__ = (
+        'id', 'name', 'payload', 'status', 'attempts', 'max_attempts', 'run_at',
+        'locked_until', 'last_error', 'created_at', 'started_at', 'finished_at'
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(100), nullable=False)
+    payload = db.Column(db.Text, nullable=False, default='{}')
+    status = db.Column(db.String(20), nullable=False, default=JobStatus.QUEUED)
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    max_attempts = db.Column(db.Integer, nullable=False, default=5)
+    run_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    locked_by = db.Column(db.String(64))
+    locked_until = db.Column(db.DateTime)
+    last_error = db.Column(db.Text)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime)
+    finished_at = db.Column(db.DateTime)
+    
+    def __repr__(self):
+        return f'<Job {self.id} {self.name} {self.status}>'
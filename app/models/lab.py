@@ -1,9 +1,15 @@
 from app import db
+from app.utils.serializers import SerializerMixin, Derived
 from datetime import datetime
+from sqlalchemy import event, select
 import uuid
 
-class Lab(db.Model):
+class Lab(SerializerMixin, db.Model):
     __tablename__ = 'labs'
+    __serialize_columns__ = (
+        'id', 'name', 'location', 'capacity', 'equipment', 'description',
+        'is_active', 'admin_id', 'created_at', 'updated_at'
+    )
     
     id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     name = db.Column(db.String(100), nullable=False, unique=True)
@@ -18,20 +24,6 @@ class Lab(db.Model):
     
     reservations = db.relationship('Reservation', backref='lab', lazy='dynamic')
     
-    def to_dict(self):
-        return {
-            'id': self.id,
-            'name': self.name,
-            'location': self.location,
-            'capacity': self.capacity,
-            'equipment': self.equipment,
-            'description': self.description,
-            'is_active': self.is_active,
-            'admin_id': self.admin_id,
-            'created_at': self.created_at.isoformat(),
-            'updated_at': self.updated_at.isoformat()
-        }
-    
     def __repr__(self):
         return f'<Lab {self.name}>'
 
@@ -41,8 +33,35 @@ class ReservationStatus:
     REJECTED = 'rejected'
     CANCELLED = 'cancelled'
 
-class Reservation(db.Model):
+class Reservation(SerializerMixin, db.Model):
     __tablename__ = 'reservations'
+    __table_args__ = (
+        # Status-filtered time ranges: upcoming approved sessions, reminder scans
+        db.Index('ix_reservations_status_start', 'status', 'start_time'),
+        # Per-lab time ranges: conflict checks and lab schedules
+        db.Index('ix_reservations_lab_start', 'lab_id', 'start_time'),
+    )
+    __serialize_columns__ = (
+        'id', 'instructor_id', 'lab_id', 'course_code', 'course_name', 'section',
+        'student_count', 'start_time', 'end_time', 'duration_minutes', 'status',
+        'purpose', 'admin_notes', 'rejection_reason', 'series_id', 'created_at', 'updated_at'
+    )
+    __serialize_derived__ = {
+        'instructor_name': Derived(
+            lambda r: r.instructor.full_name if r.instructor else 'Unknown',
+            relationship='instructor',
+            related_columns=('first_name', 'last_name')
+        ),
+        'lab_name': Derived(
+            lambda r: r.lab.name if r.lab else 'Unknown',
+            relationship='lab',
+            related_columns=('name',)
+        ),
+        'recurrence': Derived(
+            lambda r: r.recurrence.to_dict() if r.recurrence else None,
+            relationship='recurrence'
+        )
+    }
     
     id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     instructor_id = db.Column(db.String(36), db.ForeignKey('users.id'), nullable=False)
@@ -55,7 +74,7 @@ class Reservation(db.Model):
     student_count = db.Column(db.Integer, default=0)
     
     # Timing
-    start_time = db.Column(db.DateTime, nullable=False)
+    start_time = db.Column(db.DateTime, nullable=False, index=True)
     end_time = db.Column(db.DateTime, nullable=False)
     duration_minutes = db.Column(db.Integer, nullable=False)
     
@@ -65,30 +84,114 @@ class Reservation(db.Model):
     admin_notes = db.Column(db.Text)
     rejection_reason = db.Column(db.Text)
     
+    # Materialized occurrence of a recurring series: points at the series' first reservation
+    series_id = db.Column(db.String(36), db.ForeignKey('reservations.id'), index=True)
+    
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
+    
+    recurrence = db.relationship('ReservationRecurrence', backref='reservation', uselist=False, cascade='all, delete-orphan')
+    
+    def __repr__(self):
+        return f'<Reservation {self.course_code} {self.section}>'
+
+class ReservationRecurrence(SerializerMixin, db.Model):
+    """Weekly recurrence rule (RRULE FREQ=WEEKLY) attached to a series' first reservation.
+
+    The first reservation carries the course details, status and the first
+    occurrence's times; later occurrences are expanded from the rule on
+    demand and only stored when materialized.
+    """
+    __tablename__ = 'reservation_recurrences'
+    __serialize_columns__ = ('weekdays', 'interval', 'until', 'exdates', 'series_end')
+    
+    id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    reservation_id = db.Column(db.String(36), db.ForeignKey('reservations.id'), nullable=False, unique=True)
+    weekdays = db.Column(db.String(20), nullable=False)  # BYDAY as Monday=0 ints, e.g. "0,2"
+    interval = db.Column(db.Integer, default=1, nullable=False)
+    until = db.Column(db.DateTime, nullable=False)  # last possible start; COUNT is converted on creation
+    exdates = db.Column(db.Text, default='')  # comma separated ISO dates that are skipped
+    # End of the last occurrence, so window queries can skip finished series via the index
+    series_end = db.Column(db.DateTime, nullable=False, index=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    def __repr__(self):
+        return f'<ReservationRecurrence {self.reservation_id} {self.weekdays}>'
+
+class ReservationTombstone(db.Model):
+    """Record of a hard-deleted reservation, kept so sync clients can drop it"""
+    __tablename__ = 'reservation_tombstones'
+    
+    reservation_id = db.Column(db.String(36), primary_key=True)
+    instructor_id = db.Column(db.String(36), index=True)
+    deleted_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False, index=True)
+    
+    def __repr__(self):
+        return f'<ReservationTombstone {self.reservation_id}>'
+
+class ReservationArchive(SerializerMixin, db.Model):
+    """Reservations of archived terms, moved out of the hot reservations table.
+
+    Same columns as Reservation plus the term they were archived with, so
+    rows serialize the same way when reads reach back into the archive.
+    """
+    __tablename__ = 'reservations_archive'
+    __table_args__ = (
+        db.Index('ix_reservations_archive_status_start', 'status', 'start_time'),
+        db.Index('ix_reservations_archive_lab_start', 'lab_id', 'start_time'),
+    )
+    __serialize_columns__ = Reservation.__serialize_columns__
+    __serialize_derived__ = {
+        'instructor_name': Reservation.__serialize_derived__['instructor_name'],
+        'lab_name': Reservation.__serialize_derived__['lab_name'],
+        'recurrence': Derived(lambda r: None)
+    }
+    
+    id = db.Column(db.String(36), primary_key=True)
+    instructor_id = db.Column(db.String(36), db.ForeignKey('users.id'), nullable=False, index=True)
+    lab_id = db.Column(db.String(36), db.ForeignKey('labs.id'), nullable=False)
+    course_code = db.Column(db.String(20), nullable=False)
+    course_name = db.Column(db.String(100), nullable=False)
+    section = db.Column(db.String(10), nullable=False)
+    student_count = db.Column(db.Integer, default=0)
+    start_time = db.Column(db.DateTime, nullable=False, index=True)
+    end_time = db.Column(db.DateTime, nullable=False)
+    duration_minutes = db.Column(db.Integer, nullable=False)
+    status = db.Column(db.String(20), nullable=False)
+    purpose = db.Column(db.Text)
+    admin_notes = db.Column(db.Text)
+    rejection_reason = db.Column(db.Text)
+    series_id = db.Column(db.String(36))
+    created_at = db.Column(db.DateTime)
+    updated_at = db.Column(db.DateTime)
     
-    def to_dict(self):
-        return {
-            'id': self.id,
-            'instructor_id': self.instructor_id,
-            'lab_id': self.lab_id,
-            'course_code': self.course_code,
-            'course_name': self.course_name,
-            'section': self.section,
-            'student_count': self.student_count,
-            'start_time': self.start_time.isoformat(),
-            'end_time': self.end_time.isoformat(),
-            'duration_minutes': self.duration_minutes,
-            'status': self.status,
-            'purpose': self.purpose,
-            'admin_notes': self.admin_notes,
-            'rejection_reason': self.rejection_reason,
-            'created_at': self.created_at.isoformat(),
-            'updated_at': self.updated_at.isoformat(),
-            'instructor_name': self.instructor.full_name if self.instructor else 'Unknown',
-            'lab_name': self.lab.name if self.lab else 'Unknown'
-        }
+    term_id = db.Column(db.String(36), db.ForeignKey('terms.id'), nullable=False, index=True)
+    archived_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    
+    instructor = db.relationship('User', foreign_keys=[instructor_id])
+    lab = db.relationship('Lab')
     
     def __repr__(self):
-        return f'<Reservation {self.course_code} {self.section}>'
\ No newline at end of file
+        return f'<ReservationArchive {self.course_code} {self.section}>'
+
+@event.listens_for(Reservation, 'after_delete')
+def _record_tombstone(mapper, connection, target):
+    now = datetime.utcnow()
+    connection.execute(
+        ReservationTombstone.__table__.insert().values(
+            reservation_id=target.id,
+            instructor_id=target.instructor_id,
+            deleted_at=now
+        )
+    )
+    # Materialized occurrences of a deleted series go with it
+    table = Reservation.__table__
+    occurrences = connection.execute(
+        select(table.c.id, table.c.instructor_id).where(table.c.series_id == target.id)
+    ).all()
+    if occurrences:
+        connection.execute(table.delete().where(table.c.series_id == target.id))
+        connection.execute(ReservationTombstone.__table__.insert(), [
+            {'reservation_id': row.id, 'instructor_id': row.instructor_id, 'deleted_at': now}
+            for row in occurrences
+        ])
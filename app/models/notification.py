@@ -0,0 +1,48 @@
+from app import db
+from app.utils.serializers import SerializerMixin
+from datetime import datetime
+import uuid
+
+class NotificationKind:
+    TASK_OVERDUE = 'task_overdue'
+    SESSION_STARTING = 'session_starting'
+    RESERVATION_APPROVED = 'reservation_approved'
+    RESERVATION_REJECTED = 'reservation_rejected'
+
+class Notification(SerializerMixin, db.Model):
+    __tablename__ = 'notifications'
+    __table_args__ = (
+        # Unread list and badge count per user, newest first
+        db.Index('ix_notifications_user_read_created', 'user_id', 'read_at', 'created_at', 'id'),
+        db.Index('ix_notifications_user_created', 'user_id', 'created_at', 'id'),
+        # One notification per event; scanners check this before inserting
+        db.UniqueConstraint('user_id', 'kind', 'ref_id', name='uq_notifications_event'),
+    )
+    __serialize_columns__ = (
+        'id', 'user_id', 'kind', 'title', 'message', 'ref_type', 'ref_id',
+        'created_at', 'read_at'
+    )
+    
+    id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    user_id = db.Column(db.String(36), db.ForeignKey('users.id'), nullable=False)
+    kind = db.Column(db.String(30), nullable=False)
+    title = db.Column(db.String(255), nullable=False)
+    message = db.Column(db.Text)
+    ref_type = db.Column(db.String(30))
+    ref_id = db.Column(db.String(36))
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    read_at = db.Column(db.DateTime)
+    
+    def __repr__(self):
+        return f'<Notification {self.kind} {self.ref_id}>'
+
+class SchedulerState(db.Model):
+    """Watermarks for periodic scans, so each run only reads the new range"""
+    __tablename__ = 'scheduler_state'
+    
+    name = db.Column(db.String(50), primary_key=True)
+    watermark = db.Column(db.DateTime, nullable=False)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    def __repr__(self):
+        return f'<SchedulerState {self.name} {self.watermark}>'
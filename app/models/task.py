@@ -1,4 +1,5 @@
 from app import db
+from app.utils.serializers import SerializerMixin
 from datetime import datetime
 import uuid
 
@@ -14,33 +15,30 @@ class TaskPriority:
     HIGH = 'high'
     URGENT = 'urgent'
 
-class Task(db.Model):
+class Task(SerializerMixin, db.Model):
     __tablename__ = 'tasks'
+    __table_args__ = (
+        # Keyset pagination lists a user's tasks by (created_at, id), optionally
+        # filtered by status or priority; one index per filter-plus-order pattern
+        db.Index('ix_tasks_user_created', 'user_id', 'created_at', 'id'),
+        db.Index('ix_tasks_user_status_created', 'user_id', 'status', 'created_at', 'id'),
+        db.Index('ix_tasks_user_priority_created', 'user_id', 'priority', 'created_at', 'id'),
+    )
+    __serialize_columns__ = (
+        'id', 'title', 'description', 'status', 'priority', 'due_date',
+        'completed_at', 'user_id', 'created_at', 'updated_at'
+    )
     
     id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     title = db.Column(db.String(255), nullable=False, index=True)
     description = db.Column(db.Text)
     status = db.Column(db.String(20), default=TaskStatus.PENDING, index=True)
     priority = db.Column(db.String(20), default=TaskPriority.MEDIUM, index=True)
-    due_date = db.Column(db.DateTime)
+    due_date = db.Column(db.DateTime, index=True)
     completed_at = db.Column(db.DateTime)
     user_id = db.Column(db.String(36), db.ForeignKey('users.id'), nullable=False, index=True)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
-    
-    def to_dict(self):
-        return {
-            'id': self.id,
-            'title': self.title,
-            'description': self.description,
-            'status': self.status,
-            'priority': self.priority,
-            'due_date': self.due_date.isoformat() if self.due_date else None,
-            'completed_at': self.completed_at.isoformat() if self.completed_at else None,
-            'user_id': self.user_id,
-            'created_at': self.created_at.isoformat(),
-            'updated_at': self.updated_at.isoformat()
-        }
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
     
     def __repr__(self):
         return f'<Task {self.title}>'
\ No newline at end of file
@@ -0,0 +1,37 @@
+from app import db
+from app.utils.serializers import SerializerMixin
+from datetime import datetime, time, timedelta
+import uuid
+
+class Term(SerializerMixin, db.Model):
+    """An academic term; reservations belong to the term their start_time falls in"""
+    __tablename__ = 'terms'
+    __serialize_columns__ = ('id', 'name', 'start_date', 'end_date', 'archived_at', 'created_at')
+    
+    id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    name = db.Column(db.String(50), nullable=False, unique=True)
+    start_date = db.Column(db.Date, nullable=False)
+    end_date = db.Column(db.Date, nullable=False)  # inclusive
+    # Set once the term's reservations were moved to reservations_archive
+    archived_at = db.Column(db.DateTime)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    @property
+    def starts_at(self):
+        return datetime.combine(self.start_date, time.min)
+    
+    @property
+    def ends_at(self):
+        """Exclusive upper bound for start_time comparisons"""
+        return datetime.combine(self.end_date + timedelta(days=1), time.min)
+    
+    @staticmethod
+    def resolve(value):
+        """Look a term up by id or name; raises ValueError when it does not exist"""
+        term = db.session.get(Term, value) or Term.query.filter_by(name=value).first()
+        if term is None:
+            raise ValueError(f"Unknown term '{value}'")
+        return term
+    
+    def __repr__(self):
+        return f'<Term {self.name}>'
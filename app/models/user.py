@@ -1,4 +1,5 @@
 from app import db
+from app.utils.serializers import SerializerMixin, Derived
 from datetime import datetime
 import uuid
 
@@ -7,8 +8,15 @@ class UserRole:
     INSTRUCTOR = 'instructor' 
     STUDENT = 'student'
 
-class User(db.Model):
+class User(SerializerMixin, db.Model):
     __tablename__ = 'users'
+    __serialize_columns__ = (
+        'id', 'username', 'email', 'first_name', 'last_name', 'role',
+        'is_active', 'created_at', 'updated_at'
+    )
+    __serialize_derived__ = {
+        'full_name': Derived(lambda user: user.full_name, columns=('first_name', 'last_name'))
+    }
     
     id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     username = db.Column(db.String(80), unique=True, nullable=False, index=True)
@@ -25,19 +33,9 @@ class User(db.Model):
     reservations = db.relationship('Reservation', backref='instructor', lazy='dynamic', foreign_keys='Reservation.instructor_id')
     managed_labs = db.relationship('Lab', backref='admin', lazy='dynamic', foreign_keys='Lab.admin_id')
     
-    def to_dict(self):
-        return {
-            'id': self.id,
-            'username': self.username,
-            'email': self.email,
-            'first_name': self.first_name,
-            'last_name': self.last_name,
-            'role': self.role,
-            'is_active': self.is_active,
-            'created_at': self.created_at.isoformat(),
-            'updated_at': self.updated_at.isoformat(),
-            'full_name': f"{self.first_name} {self.last_name}".strip()
-        }
+    @property
+    def full_name(self):
+        return f"{self.first_name or ''} {self.last_name or ''}".strip()
     
     def is_admin(self):
         return self.role == UserRole.ADMIN
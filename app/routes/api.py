@@ -1,6 +1,11 @@
-from flask import Blueprint, jsonify, render_template
+from flask import Blueprint, jsonify, render_template, request
 from flask_jwt_extended import jwt_required, get_jwt_identity
+from app import db
+from app.models.job import Job, JobStatus
 from app.models.user import User
+from app.services.health_service import HealthService
+from app.services.job_queue import JobQueue
+from app.utils.serializers import parse_fields, apply_fields
 
 api_bp = Blueprint('api', __name__)
 
@@ -27,9 +32,41 @@ def api_index():
                 'list': 'GET /api/labs',
                 'create': 'POST /api/labs',
                 'reservations': 'GET /api/reservations',
+                'reservation_changes': 'GET /api/reservations/changes?since=<token>',
                 'create_reservation': 'POST /api/reservations',
-                'schedule': 'GET /api/schedule',
-                'stats': 'GET /api/stats'
+                'pending_clusters': 'GET /api/reservations/pending/clusters?lab_id=&from=&to=',
+                'bulk_decision': 'POST /api/reservations/bulk-decision',
+                'import_timetable': 'POST /api/reservations/import?dry_run=true (multipart file)',
+                'export': 'GET /api/reservations/export?kind=reservations|utilization&format=csv|parquet&lab_id=&term=&status=',
+                'terms': 'GET /api/terms',
+                'create_term': 'POST /api/terms',
+                'schedule': 'GET /api/schedule?date=&from=&to=&lab_id=',
+                'stats': 'GET /api/stats',
+                'lab_status': 'GET /api/labs/status',
+                'dashboard': 'GET /api/dashboard?include=stats,labs,reservations,lab_status'
+            },
+            'tasks': {
+                'list': 'GET /api/tasks?limit=&cursor=&status=&priority=',
+                'create': 'POST /api/tasks',
+                'bulk': 'POST /api/tasks/bulk',
+                'detail': 'GET /api/tasks/<id>',
+                'update': 'PUT /api/tasks/<id>',
+                'delete': 'DELETE /api/tasks/<id>',
+                'stats': 'GET /api/tasks/stats'
+            },
+            'search': 'GET /api/search?q=<text>&types=labs,reservations,tasks',
+            'notifications': {
+                'list': 'GET /api/notifications?unread=true&limit=&cursor=',
+                'mark_read': 'POST /api/notifications/read'
+            },
+            'admin': {
+                'job_metrics': 'GET /api/admin/jobs',
+                'retry_dead_jobs': 'POST /api/admin/jobs/retry'
+            },
+            'health': {
+                'basic': 'GET /health',
+                'live': 'GET /health/live',
+                'ready': 'GET /health/ready'
             }
         }
     })
@@ -40,7 +77,8 @@ def get_profile():
     """Get current user profile"""
     try:
         current_user_id = get_jwt_identity()
-        user = User.query.get(current_user_id)
+        fields = parse_fields(User, request.args.get('fields'))
+        user = apply_fields(User.query, User, fields).filter(User.id == current_user_id).first()
         
         if not user:
             return jsonify({
@@ -50,15 +88,77 @@ def get_profile():
         
         return jsonify({
             'success': True,
-            'user': user.to_dict()
+            'user': user.to_dict(fields)
         })
         
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'message': str(e)
+        }), 400
     except Exception as e:
         return jsonify({
             'success': False,
             'message': 'Failed to fetch profile'
         }), 500
 
+@api_bp.route('/api/admin/jobs', methods=['GET'])
+@jwt_required()
+def get_job_metrics():
+    """Job queue depth, lag and recent failures (Admin only)"""
+    try:
+        current_user_id = get_jwt_identity()
+        user = User.query.get(current_user_id)
+        
+        if not user or not user.is_admin():
+            return jsonify({
+                'success': False,
+                'message': 'Admin access required'
+            }), 403
+        
+        dead_jobs = Job.query.filter(Job.status == JobStatus.DEAD).order_by(Job.finished_at.desc()).limit(20).all()
+        
+        return jsonify({
+            'success': True,
+            'metrics': JobQueue.metrics(),
+            'dead_jobs': Job.serialize_many(dead_jobs)
+        })
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': 'Failed to fetch job metrics'
+        }), 500
+
+@api_bp.route('/api/admin/jobs/retry', methods=['POST'])
+@jwt_required()
+def retry_dead_jobs():
+    """Requeue dead jobs (Admin only)"""
+    try:
+        current_user_id = get_jwt_identity()
+        user = User.query.get(current_user_id)
+        
+        if not user or not user.is_admin():
+            return jsonify({
+                'success': False,
+                'message': 'Admin access required'
+            }), 403
+        
+        data = request.get_json(silent=True) or {}
+        requeued = JobQueue.retry_dead(data.get('ids'))
+        
+        return jsonify({
+            'success': True,
+            'requeued': requeued
+        })
+        
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({
+            'success': False,
+            'message': 'Failed to requeue jobs'
+        }), 500
+
 @api_bp.route('/health')
 def health_check():
     """Health check endpoint"""
@@ -68,4 +168,19 @@ def health_check():
         'status': 'healthy',
         'timestamp': datetime.utcnow().isoformat() + 'Z',
         'service': 'IT Lab Scheduler API'
-    })
\ No newline at end of file
+    })
+
+@api_bp.route('/health/live')
+def liveness():
+    """Liveness probe: the worker answers; no dependencies are checked"""
+    return jsonify({'success': True, **HealthService.live()})
+
+@api_bp.route('/health/ready')
+def readiness():
+    """Readiness probe: database round trip, pool, job lag, caches and process.
+
+    Reports are cached for HEALTH_CACHE_TTL seconds per worker. Responds
+    503 when the database check fails so load balancers stop routing here.
+    """
+    report, ready = HealthService.ready()
+    return jsonify({'success': ready, **report}), 200 if ready else 503
@@ -1,4 +1,4 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, current_app
 from app.services.auth_service import AuthService
 from app import limiter
 
@@ -32,10 +32,7 @@ def register():
         }), 201
         
     except Exception as e:
-        # Add detailed error logging
-        import traceback
-        print(f"Registration route error: {str(e)}")
-        print(f"Traceback: {traceback.format_exc()}")
+        current_app.logger.exception('Registration route error')
         
         return jsonify({
             'success': False,
@@ -1,22 +1,46 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, Response, request, jsonify, current_app, stream_with_context
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app import db
-from app.models.lab import Lab, Reservation, ReservationStatus
+from app.models.lab import Lab, Reservation, ReservationArchive, ReservationStatus, ReservationTombstone
+from app.models.term import Term
 from app.models.user import User, UserRole
-from datetime import datetime, timedelta
+from app.services.archive_service import ArchiveService
+from app.services.dashboard_service import DashboardService
+from app.services.export_service import ExportService
+from app.services.job_queue import JobQueue
+from app.services.reservation_service import ReservationService
+from app.services.timetable_service import TimetableService
+from app.utils.pagination import encode_cursor, decode_cursor
+from app.utils.serializers import parse_fields, apply_fields
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import joinedload
+from datetime import datetime, timedelta, timezone
+import csv
+import io
 
 labs_bp = Blueprint('labs', __name__)
 
+def _parse_query_time(value):
+    """An ISO 8601 query parameter as naive UTC, like the stored times (offsets are converted)"""
+    parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    return parsed.astimezone(timezone.utc).replace(tzinfo=None) if parsed.tzinfo else parsed
+
 @labs_bp.route('/labs', methods=['GET'])
 @jwt_required()
 def get_labs():
     """Get all labs"""
     try:
-        labs = Lab.query.filter_by(is_active=True).all()
+        fields = parse_fields(Lab, request.args.get('fields'))
+        labs = DashboardService.get_labs(fields)
         return jsonify({
             'success': True,
-            'labs': [lab.to_dict() for lab in labs]
+            'labs': Lab.serialize_many(labs, fields)
         })
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'message': str(e)
+        }), 400
     except Exception as e:
         return jsonify({
             'success': False,
@@ -78,26 +102,145 @@ def get_reservations():
         current_user_id = get_jwt_identity()
         user = User.query.get(current_user_id)
         
-        # Build query based on user role
-        if user.is_admin():
-            reservations = Reservation.query.all()
-        elif user.is_instructor():
-            reservations = Reservation.query.filter_by(instructor_id=current_user_id).all()
-        else:  # Student
-            # Students can see all approved reservations
-            reservations = Reservation.query.filter_by(status=ReservationStatus.APPROVED).all()
+        fields = parse_fields(Reservation, request.args.get('fields'))
+        
+        # Keyset pagination is opt-in so existing callers still get the full list
+        if request.args.get('limit') or request.args.get('cursor'):
+            limit = max(1, min(int(request.args.get('limit', 100)), 500))
+            reservations, next_cursor = DashboardService.get_reservations_page(
+                user, fields, limit=limit, cursor=request.args.get('cursor')
+            )
+            return jsonify({
+                'success': True,
+                'reservations': DashboardService.serialize_reservations(reservations, fields),
+                'next_cursor': next_cursor
+            })
+        
+        reservations = DashboardService.get_reservations(user, fields)
         
         return jsonify({
             'success': True,
-            'reservations': [reservation.to_dict() for reservation in reservations]
+            'reservations': DashboardService.serialize_reservations(reservations, fields)
         })
         
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'message': str(e)
+        }), 400
     except Exception as e:
         return jsonify({
             'success': False,
             'message': 'Failed to fetch reservations'
         }), 500
 
+@labs_bp.route('/reservations/changes', methods=['GET'])
+@jwt_required()
+def get_reservation_changes():
+    """Get reservations changed since a sync token, plus tombstones"""
+    try:
+        current_user_id = get_jwt_identity()
+        user = User.query.get(current_user_id)
+
+        since = request.args.get('since')
+        try:
+            limit = max(1, min(int(request.args.get('limit', 500)), 1000))
+        except ValueError:
+            return jsonify({
+                'success': False,
+                'message': 'limit must be an integer'
+            }), 400
+
+        cursor = None
+        if since:
+            try:
+                cursor = decode_cursor(since)
+            except ValueError:
+                return jsonify({
+                    'success': False,
+                    'message': 'Invalid sync token'
+                }), 400
+
+        # Changed rows, ordered by (updated_at, id) so the token is a stable keyset position
+        query = Reservation.query.options(
+            joinedload(Reservation.lab),
+            joinedload(Reservation.instructor),
+            joinedload(Reservation.recurrence)
+        )
+        tombstones = ReservationTombstone.query
+
+        if user.is_instructor():
+            query = query.filter(Reservation.instructor_id == current_user_id)
+            tombstones = tombstones.filter(ReservationTombstone.instructor_id == current_user_id)
+
+        if cursor:
+            since_time, since_id = cursor
+            query = query.filter(or_(
+                Reservation.updated_at > since_time,
+                and_(Reservation.updated_at == since_time, Reservation.id > since_id)
+            ))
+            tombstones = tombstones.filter(or_(
+                ReservationTombstone.deleted_at > since_time,
+                and_(ReservationTombstone.deleted_at == since_time, ReservationTombstone.reservation_id > since_id)
+            ))
+        elif user.is_student():
+            # A fresh snapshot only needs rows the client is allowed to keep
+            query = query.filter(Reservation.status == ReservationStatus.APPROVED)
+        else:
+            query = query.filter(Reservation.status != ReservationStatus.CANCELLED)
+
+        # Fetch one extra row from each source to know whether another page exists
+        rows = query.order_by(Reservation.updated_at, Reservation.id).limit(limit + 1).all()
+        deleted_rows = []
+        if cursor:
+            deleted_rows = tombstones.order_by(
+                ReservationTombstone.deleted_at, ReservationTombstone.reservation_id
+            ).limit(limit + 1).all()
+
+        events = [(r.updated_at, r.id, r) for r in rows]
+        events += [(t.deleted_at, t.reservation_id, None) for t in deleted_rows]
+        events.sort(key=lambda event: (event[0], event[1]))
+        has_more = len(events) > limit
+        events = events[:limit]
+
+        changes = []
+        deleted = []
+        for _, row_id, reservation in events:
+            if reservation is None or reservation.status == ReservationStatus.CANCELLED:
+                deleted.append(row_id)
+            elif user.is_student() and reservation.status != ReservationStatus.APPROVED:
+                # No longer visible to students, so it is a deletion from their point of view
+                deleted.append(row_id)
+            else:
+                changes.append(reservation.to_dict())
+
+        if events:
+            position = (events[-1][0], events[-1][1])
+            if not has_more:
+                # updated_at is stamped before a write waits for the database lock, so a
+                # row can commit after later-stamped ones. The final token of a sync stays
+                # RESERVATION_SYNC_OVERLAP behind now; the next sync re-reads that window
+                # and picks up such late rows (clients apply changes idempotently).
+                settled = (datetime.utcnow() - timedelta(seconds=current_app.config['RESERVATION_SYNC_OVERLAP']), '')
+                position = min(position, settled)
+            next_token = encode_cursor(*position)
+        else:
+            next_token = since
+
+        return jsonify({
+            'success': True,
+            'changes': changes,
+            'deleted': deleted,
+            'next_token': next_token,
+            'has_more': has_more
+        })
+
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': 'Failed to fetch reservation changes'
+        }), 500
+
 @labs_bp.route('/reservations', methods=['POST'])
 @jwt_required()
 def create_reservation():
@@ -126,20 +269,22 @@ def create_reservation():
         # Calculate duration
         start_time = datetime.fromisoformat(data['start_time'].replace('Z', '+00:00'))
         end_time = datetime.fromisoformat(data['end_time'].replace('Z', '+00:00'))
+        ReservationService.check_times(start_time, end_time)
         duration_minutes = int((end_time - start_time).total_seconds() / 60)
         
-        # Check for conflicts
-        conflicting_reservation = Reservation.query.filter(
-            Reservation.lab_id == data['lab_id'],
-            Reservation.status.in_([ReservationStatus.PENDING, ReservationStatus.APPROVED]),
-            Reservation.start_time < end_time,
-            Reservation.end_time > start_time
-        ).first()
+        # A recurring request is one reservation plus a rule; all of its
+        # occurrences are conflict-checked together in a single sweep
+        recurrence = None
+        intervals = [(start_time, end_time)]
+        if data.get('recurrence'):
+            recurrence, intervals = ReservationService.build_recurrence(start_time, end_time, data['recurrence'])
         
-        if conflicting_reservation:
+        conflicts = ReservationService.find_conflicts(data['lab_id'], intervals)
+        if conflicts:
             return jsonify({
                 'success': False,
-                'message': 'Time slot conflict with existing reservation'
+                'message': 'Time slot conflict with existing reservation',
+                'conflicts': [start.isoformat() for start in sorted(conflicts)]
             }), 400
         
         reservation = Reservation(
@@ -154,6 +299,7 @@ def create_reservation():
             duration_minutes=duration_minutes,
             purpose=data.get('purpose', '')
         )
+        reservation.recurrence = recurrence
         
         db.session.add(reservation)
         db.session.commit()
@@ -164,6 +310,12 @@ def create_reservation():
             'reservation': reservation.to_dict()
         }), 201
         
+    except ValueError as e:
+        db.session.rollback()
+        return jsonify({
+            'success': False,
+            'message': str(e)
+        }), 400
     except Exception as e:
         db.session.rollback()
         return jsonify({
@@ -194,7 +346,10 @@ def approve_reservation(reservation_id):
         
         reservation.status = ReservationStatus.APPROVED
         reservation.admin_notes = request.get_json().get('admin_notes', '')
+        ReservationService.sync_series_status([reservation.id], reservation.status)
         
+        # Notifying the instructor happens in the job worker, committed with the decision
+        JobQueue.enqueue('reservation.decided', {'reservation_id': reservation.id, 'status': reservation.status})
         db.session.commit()
         
         return jsonify({
@@ -234,7 +389,9 @@ def reject_reservation(reservation_id):
         data = request.get_json()
         reservation.status = ReservationStatus.REJECTED
         reservation.rejection_reason = data.get('rejection_reason', '')
+        ReservationService.sync_series_status([reservation.id], reservation.status)
         
+        JobQueue.enqueue('reservation.decided', {'reservation_id': reservation.id, 'status': reservation.status})
         db.session.commit()
         
         return jsonify({
@@ -250,31 +407,334 @@ def reject_reservation(reservation_id):
             'message': 'Failed to reject reservation'
         }), 500
 
+@labs_bp.route('/reservations/pending/clusters', methods=['GET'])
+@jwt_required()
+def get_pending_clusters():
+    """Group pending reservations into per-lab conflict clusters (Admin only)"""
+    try:
+        current_user_id = get_jwt_identity()
+        user = User.query.get(current_user_id)
+        
+        if not user.is_admin():
+            return jsonify({
+                'success': False,
+                'message': 'Admin access required'
+            }), 403
+        
+        # Sessions that already ended cannot be decided usefully, so default to upcoming ones
+        since = request.args.get('from')
+        until = request.args.get('to')
+        since = _parse_query_time(since) if since else datetime.utcnow()
+        until = _parse_query_time(until) if until else None
+        include_singletons = request.args.get('include_singletons', '').lower() in ('1', 'true', 'yes')
+        
+        clusters = ReservationService.pending_clusters(
+            lab_id=request.args.get('lab_id'),
+            since=since,
+            until=until,
+            include_singletons=include_singletons
+        )
+        
+        return jsonify({
+            'success': True,
+            'clusters': clusters,
+            'count': len(clusters)
+        })
+        
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'message': str(e)
+        }), 400
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': 'Failed to fetch pending clusters'
+        }), 500
+
+@labs_bp.route('/reservations/bulk-decision', methods=['POST'])
+@jwt_required()
+def bulk_decide_reservations():
+    """Approve or reject many pending reservations in one transaction (Admin only)"""
+    try:
+        current_user_id = get_jwt_identity()
+        user = User.query.get(current_user_id)
+        
+        if not user.is_admin():
+            return jsonify({
+                'success': False,
+                'message': 'Admin access required'
+            }), 403
+        
+        data = request.get_json(silent=True) or {}
+        decisions = data.get('decisions')
+        max_decisions = current_app.config['RESERVATION_BULK_MAX_DECISIONS']
+        
+        if not isinstance(decisions, list) or not decisions:
+            return jsonify({
+                'success': False,
+                'message': 'decisions must be a non-empty list'
+            }), 400
+        
+        if len(decisions) > max_decisions:
+            return jsonify({
+                'success': False,
+                'message': f'At most {max_decisions} decisions per request'
+            }), 400
+        
+        results = ReservationService.bulk_decide(decisions)
+        db.session.commit()
+        
+        failed = sum(1 for result in results if not result['success'])
+        summary = {'total': len(results), 'succeeded': len(results) - failed, 'failed': failed}
+        for decision in ('approve', 'reject'):
+            summary[decision] = sum(1 for result in results if result['success'] and result['decision'] == decision)
+        
+        return jsonify({
+            'success': failed == 0,
+            'summary': summary,
+            'results': results
+        })
+
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({
+            'success': False,
+            'message': 'Failed to apply reservation decisions'
+        }), 500
+
+@labs_bp.route('/reservations/import', methods=['POST'])
+@jwt_required()
+def import_timetable():
+    """Import a registrar timetable CSV (Admin only)"""
+    try:
+        current_user_id = get_jwt_identity()
+        user = User.query.get(current_user_id)
+        
+        if not user.is_admin():
+            return jsonify({
+                'success': False,
+                'message': 'Admin access required'
+            }), 403
+        
+        upload = request.files.get('file')
+        if not upload:
+            return jsonify({
+                'success': False,
+                'message': 'A CSV file is required'
+            }), 400
+        
+        dry_run = request.args.get('dry_run', '').lower() in ('1', 'true', 'yes')
+        
+        # Parse straight from the upload stream; MAX_CONTENT_LENGTH bounds its size
+        stream = io.TextIOWrapper(upload.stream, encoding='utf-8-sig', newline='')
+        report = TimetableService.import_csv(stream, dry_run=dry_run)
+        if dry_run:
+            db.session.rollback()
+        else:
+            db.session.commit()
+        
+        return jsonify({
+            'success': report['error_count'] == 0,
+            'report': report
+        })
+        
+    except (ValueError, UnicodeDecodeError, csv.Error) as e:
+        db.session.rollback()
+        return jsonify({
+            'success': False,
+            'message': str(e)
+        }), 400
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({
+            'success': False,
+            'message': 'Failed to import timetable'
+        }), 500
+
+@labs_bp.route('/reservations/export', methods=['GET'])
+@jwt_required()
+def export_reservations():
+    """Stream reservations or lab utilization as CSV or Parquet (Admin only)"""
+    try:
+        current_user_id = get_jwt_identity()
+        user = User.query.get(current_user_id)
+        
+        if not user.is_admin():
+            return jsonify({
+                'success': False,
+                'message': 'Admin access required'
+            }), 403
+        
+        kind = request.args.get('kind', 'reservations')
+        fmt = request.args.get('format', 'csv')
+        chunks = ExportService.stream(
+            kind=kind,
+            fmt=fmt,
+            lab_id=request.args.get('lab_id'),
+            term=request.args.get('term'),
+            status=request.args.get('status')
+        )
+        
+        filename = f"{kind}-{datetime.utcnow():%Y%m%d-%H%M%S}.{fmt}"
+        return Response(
+            stream_with_context(chunks),
+            mimetype='text/csv' if fmt == 'csv' else 'application/vnd.apache.parquet',
+            headers={'Content-Disposition': f'attachment; filename="{filename}"'}
+        )
+        
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'message': str(e)
+        }), 400
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': 'Failed to export reservations'
+        }), 500
+
+@labs_bp.route('/terms', methods=['GET'])
+@jwt_required()
+def get_terms():
+    """List academic terms, newest first"""
+    try:
+        terms = Term.query.order_by(Term.start_date.desc()).all()
+        
+        return jsonify({
+            'success': True,
+            'terms': Term.serialize_many(terms)
+        })
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': 'Failed to fetch terms'
+        }), 500
+
+@labs_bp.route('/terms', methods=['POST'])
+@jwt_required()
+def create_term():
+    """Create an academic term (Admin only)"""
+    try:
+        current_user_id = get_jwt_identity()
+        user = User.query.get(current_user_id)
+        
+        if not user.is_admin():
+            return jsonify({
+                'success': False,
+                'message': 'Admin access required'
+            }), 403
+        
+        data = request.get_json(silent=True) or {}
+        for field in ('name', 'start_date', 'end_date'):
+            if not data.get(field):
+                return jsonify({
+                    'success': False,
+                    'message': f'{field} is required'
+                }), 400
+        
+        start_date = datetime.fromisoformat(data['start_date']).date()
+        end_date = datetime.fromisoformat(data['end_date']).date()
+        if end_date < start_date:
+            return jsonify({
+                'success': False,
+                'message': 'end_date must not be before start_date'
+            }), 400
+        
+        if Term.query.filter_by(name=data['name']).first():
+            return jsonify({
+                'success': False,
+                'message': 'A term with this name already exists'
+            }), 400
+        
+        term = Term(name=data['name'], start_date=start_date, end_date=end_date)
+        db.session.add(term)
+        db.session.commit()
+        
+        return jsonify({
+            'success': True,
+            'message': 'Term created successfully',
+            'term': term.to_dict()
+        }), 201
+        
+    except ValueError as e:
+        db.session.rollback()
+        return jsonify({
+            'success': False,
+            'message': str(e)
+        }), 400
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({
+            'success': False,
+            'message': 'Failed to create term'
+        }), 500
+
 @labs_bp.route('/schedule', methods=['GET'])
 def get_schedule():
     """Get schedule for calendar view"""
     try:
         lab_id = request.args.get('lab_id')
         date_str = request.args.get('date')
+        fields = parse_fields(Reservation, request.args.get('fields'))
         
         query = Reservation.query.filter_by(status=ReservationStatus.APPROVED)
+        query = apply_fields(query, Reservation, fields)
         
         if lab_id:
             query = query.filter_by(lab_id=lab_id)
         
+        # Recurring series are expanded only inside the requested window: the
+        # day, an explicit from/to range, or the default horizon from today
         if date_str:
             target_date = datetime.fromisoformat(date_str)
-            start_of_day = target_date.replace(hour=0, minute=0, second=0, microsecond=0)
-            end_of_day = start_of_day + timedelta(days=1)
-            query = query.filter(Reservation.start_time >= start_of_day, Reservation.start_time < end_of_day)
+            window_start = target_date.replace(hour=0, minute=0, second=0, microsecond=0)
+            window_end = window_start + timedelta(days=1)
+            query = query.filter(Reservation.start_time >= window_start, Reservation.start_time < window_end)
+        elif request.args.get('from') or request.args.get('to'):
+            window_start = _parse_query_time(request.args['from']) if request.args.get('from') else datetime.utcnow()
+            window_end = _parse_query_time(request.args['to']) if request.args.get('to') else (
+                window_start + timedelta(days=current_app.config['RECURRENCE_DEFAULT_WINDOW_DAYS'])
+            )
+            query = query.filter(Reservation.end_time > window_start, Reservation.start_time < window_end)
+        else:
+            window_start = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+            window_end = window_start + timedelta(days=current_app.config['RECURRENCE_DEFAULT_WINDOW_DAYS'])
         
         reservations = query.all()
         
+        # Archived terms are only read when the window reaches back into them
+        if ArchiveService.reaches(window_start):
+            archived = apply_fields(ReservationArchive.query, ReservationArchive, fields).filter(
+                ReservationArchive.status == ReservationStatus.APPROVED,
+                ReservationArchive.start_time >= window_start if date_str else ReservationArchive.end_time > window_start,
+                ReservationArchive.start_time < window_end
+            )
+            if lab_id:
+                archived = archived.filter(ReservationArchive.lab_id == lab_id)
+            reservations = sorted(reservations + archived.all(), key=lambda r: r.start_time)
+        
+        occurrences = ReservationService.occurrences_in_window(window_start, window_end, lab_id=lab_id)
+        if date_str:
+            occurrences = [o for o in occurrences if o.start_time >= window_start]
+        if occurrences:
+            reservations = sorted(reservations + occurrences, key=lambda r: r.start_time)
+        
+        encode, encode_archived = Reservation.encoder(fields), ReservationArchive.encoder(fields)
         return jsonify({
             'success': True,
-            'schedule': [reservation.to_dict() for reservation in reservations]
+            'schedule': [
+                encode_archived(r) if isinstance(r, ReservationArchive) else encode(r)
+                for r in reservations
+            ]
         })
         
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'message': str(e)
+        }), 400
     except Exception as e:
         return jsonify({
             'success': False,
@@ -289,41 +749,59 @@ def get_stats():
         current_user_id = get_jwt_identity()
         user = User.query.get(current_user_id)
         
-        stats = {}
-        
-        if user.is_admin():
-            stats = {
-                'total_labs': Lab.query.filter_by(is_active=True).count(),
-                'total_reservations': Reservation.query.count(),
-                'pending_requests': Reservation.query.filter_by(status=ReservationStatus.PENDING).count(),
-                'approved_reservations': Reservation.query.filter_by(status=ReservationStatus.APPROVED).count()
-            }
-        elif user.is_instructor():
-            stats = {
-                'my_reservations': Reservation.query.filter_by(instructor_id=current_user_id).count(),
-                'upcoming_sessions': Reservation.query.filter(
-                    Reservation.instructor_id == current_user_id,
-                    Reservation.status == ReservationStatus.APPROVED,
-                    Reservation.start_time >= datetime.utcnow()
-                ).count(),
-                'pending_requests': Reservation.query.filter_by(
-                    instructor_id=current_user_id,
-                    status=ReservationStatus.PENDING
-                ).count()
-            }
-        else:  # Student
-            stats = {
-                'available_labs': Lab.query.filter_by(is_active=True).count(),
-                'scheduled_sessions': Reservation.query.filter_by(status=ReservationStatus.APPROVED).count()
-            }
-        
         return jsonify({
             'success': True,
-            'stats': stats
+            'stats': DashboardService.get_stats(user)
         })
         
     except Exception as e:
         return jsonify({
             'success': False,
             'message': 'Failed to fetch statistics'
+        }), 500
+
+@labs_bp.route('/labs/status', methods=['GET'])
+@jwt_required()
+def get_lab_status():
+    """Get live occupancy for every lab"""
+    try:
+        return jsonify({
+            'success': True,
+            'labs': DashboardService.get_lab_status()
+        })
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': 'Failed to fetch lab status'
+        }), 500
+
+@labs_bp.route('/dashboard', methods=['GET'])
+@jwt_required()
+def get_dashboard():
+    """Get the role-specific dashboard bundle in a single request"""
+    try:
+        current_user_id = get_jwt_identity()
+        user = User.query.get(current_user_id)
+        
+        include = None
+        if request.args.get('include'):
+            include = [section.strip() for section in request.args['include'].split(',') if section.strip()]
+            unknown = [section for section in include if section not in DashboardService.SECTIONS]
+            if unknown:
+                return jsonify({
+                    'success': False,
+                    'message': f"Unknown dashboard section(s): {', '.join(unknown)}"
+                }), 400
+        
+        return jsonify({
+            'success': True,
+            'user': user.to_dict(),
+            'dashboard': DashboardService.get_dashboard(user, include)
+        })
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': 'Failed to fetch dashboard'
         }), 500
\ No newline at end of file
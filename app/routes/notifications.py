@@ -0,0 +1,69 @@
+from flask import Blueprint, request, jsonify
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from app import db
+from app.models.notification import Notification
+from app.services.notification_service import NotificationService
+
+notifications_bp = Blueprint('notifications', __name__)
+
+@notifications_bp.route('/notifications', methods=['GET'])
+@jwt_required()
+def get_notifications():
+    """Get the current user's notifications, newest first"""
+    try:
+        current_user_id = get_jwt_identity()
+        
+        unread_only = request.args.get('unread', '').lower() in ('1', 'true', 'yes')
+        limit = max(1, min(int(request.args.get('limit', 20)), 100))
+        
+        notifications, next_cursor = NotificationService.get_page(
+            current_user_id, unread_only, limit=limit, cursor=request.args.get('cursor')
+        )
+        
+        return jsonify({
+            'success': True,
+            'notifications': Notification.serialize_many(notifications),
+            'unread_count': NotificationService.unread_count(current_user_id),
+            'next_cursor': next_cursor
+        })
+        
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'message': str(e)
+        }), 400
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': 'Failed to fetch notifications'
+        }), 500
+
+@notifications_bp.route('/notifications/read', methods=['POST'])
+@jwt_required()
+def mark_notifications_read():
+    """Mark notifications read (all of them when no ids are given)"""
+    try:
+        current_user_id = get_jwt_identity()
+        data = request.get_json(silent=True) or {}
+        ids = data.get('ids')
+        
+        if ids is not None and not isinstance(ids, list):
+            return jsonify({
+                'success': False,
+                'message': 'ids must be a list'
+            }), 400
+        
+        updated = NotificationService.mark_read(current_user_id, ids)
+        
+        return jsonify({
+            'success': True,
+            'updated': updated,
+            'unread_count': NotificationService.unread_count(current_user_id)
+        })
+        
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({
+            'success': False,
+            'message': 'Failed to update notifications'
+        }), 500
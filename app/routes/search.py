@@ -0,0 +1,59 @@
+from flask import Blueprint, request, jsonify
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from app import limiter
+from app.models.user import User
+from app.services.search_service import SearchService
+
+search_bp = Blueprint('search', __name__)
+
+@search_bp.route('/search', methods=['GET'])
+@jwt_required()
+@limiter.limit("60 per minute")
+def search():
+    """Full-text search across labs, reservations and tasks"""
+    try:
+        current_user_id = get_jwt_identity()
+        user = User.query.get(current_user_id)
+        
+        if not user:
+            return jsonify({
+                'success': False,
+                'message': 'User not found'
+            }), 404
+        
+        query = request.args.get('q', '').strip()
+        if not query:
+            return jsonify({
+                'success': False,
+                'message': 'Query parameter q is required'
+            }), 400
+        
+        types = SearchService.TYPES
+        if request.args.get('types'):
+            types = [t.strip() for t in request.args['types'].split(',') if t.strip()]
+            unknown = sorted(set(types) - set(SearchService.TYPES))
+            if unknown:
+                return jsonify({
+                    'success': False,
+                    'message': f"Unknown type(s): {', '.join(unknown)}"
+                }), 400
+        
+        limit = max(1, min(int(request.args.get('limit', 10)), 50))
+        results = SearchService.search(user, query, types, limit)
+        
+        return jsonify({
+            'success': True,
+            'query': query,
+            'results': results
+        })
+        
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'message': str(e)
+        }), 400
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': 'Search failed'
+        }), 500
@@ -1,8 +1,10 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, current_app, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app import db, limiter
 from app.models.task import Task, TaskStatus, TaskPriority
 from app.models.user import User
+from app.services.task_service import TaskService
+from app.utils.serializers import parse_fields
 from datetime import datetime
 
 # Create the blueprint
@@ -18,35 +20,32 @@ def get_tasks():
         # Get query parameters
         status = request.args.get('status')
         priority = request.args.get('priority')
-        page = int(request.args.get('page', 1))
-        per_page = min(int(request.args.get('per_page', 10)), 50)  # Limit per_page to 50
-        
-        # Build query
-        query = Task.query.filter_by(user_id=current_user_id)
-        
-        if status:
-            query = query.filter_by(status=status)
-        if priority:
-            query = query.filter_by(priority=priority)
-        
-        # Execute query with pagination
-        tasks = query.order_by(Task.created_at.desc()).paginate(
-            page=page, 
-            per_page=per_page, 
-            error_out=False
+        limit = max(1, min(int(request.args.get('limit', request.args.get('per_page', 10))), 50))  # Limit page size to 50
+        
+        fields = parse_fields(Task, request.args.get('fields'))
+        
+        # Keyset pagination on (created_at, id); the total comes from the count cache
+        tasks, next_cursor = TaskService.get_page(
+            current_user_id, status, priority, fields,
+            limit=limit, cursor=request.args.get('cursor')
         )
         
         return jsonify({
             'success': True,
-            'tasks': [task.to_dict() for task in tasks.items],
+            'tasks': Task.serialize_many(tasks, fields),
             'pagination': {
-                'page': tasks.page,
-                'per_page': tasks.per_page,
-                'total': tasks.total,
-                'pages': tasks.pages
+                'limit': limit,
+                'total': TaskService.count(current_user_id, status, priority),
+                'next_cursor': next_cursor,
+                'has_more': next_cursor is not None
             }
         })
         
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'message': str(e)
+        }), 400
     except Exception as e:
         return jsonify({
             'success': False,
@@ -80,6 +79,7 @@ def create_task():
         
         db.session.add(task)
         db.session.commit()
+        TaskService.invalidate_counts(current_user_id)
         
         return jsonify({
             'success': True,
@@ -94,6 +94,63 @@ def create_task():
             'message': 'Failed to create task'
         }), 500
 
+def bulk_operation_count():
+    """Limiter cost of a bulk request: one hit per operation.
+
+    Capped at TASK_BULK_MAX_OPERATIONS; larger batches are rejected by the
+    view anyway and should not lock the client out for the whole window.
+    """
+    data = request.get_json(silent=True) or {}
+    operations = data.get('operations') if isinstance(data, dict) else None
+    if not isinstance(operations, list):
+        return 1
+    return max(1, min(len(operations), current_app.config['TASK_BULK_MAX_OPERATIONS']))
+
+@tasks_bp.route('/tasks/bulk', methods=['POST'])
+@jwt_required()
+@limiter.limit("1000 per minute", cost=bulk_operation_count)
+def bulk_tasks():
+    """Create, update and delete many tasks in one transaction"""
+    try:
+        current_user_id = get_jwt_identity()
+        data = request.get_json(silent=True) or {}
+        operations = data.get('operations')
+        max_operations = current_app.config['TASK_BULK_MAX_OPERATIONS']
+        
+        if not isinstance(operations, list) or not operations:
+            return jsonify({
+                'success': False,
+                'message': 'operations must be a non-empty list'
+            }), 400
+        
+        if len(operations) > max_operations:
+            return jsonify({
+                'success': False,
+                'message': f'At most {max_operations} operations per request'
+            }), 400
+        
+        results = TaskService.apply_bulk(current_user_id, operations)
+        db.session.commit()
+        TaskService.invalidate_counts(current_user_id)
+        
+        failed = sum(1 for result in results if not result['success'])
+        summary = {'total': len(results), 'succeeded': len(results) - failed, 'failed': failed}
+        for op in ('create', 'update', 'delete'):
+            summary[op] = sum(1 for result in results if result['success'] and result['op'] == op)
+        
+        return jsonify({
+            'success': failed == 0,
+            'summary': summary,
+            'results': results
+        })
+        
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({
+            'success': False,
+            'message': 'Failed to apply bulk task operations'
+        }), 500
+
 @tasks_bp.route('/tasks/<task_id>', methods=['GET'])
 @jwt_required()
 def get_task(task_id):
@@ -154,6 +211,7 @@ def update_task(task_id):
             task.due_date = datetime.fromisoformat(data['due_date'].replace('Z', '+00:00')) if data.get('due_date') else None
         
         db.session.commit()
+        TaskService.invalidate_counts(current_user_id)
         
         return jsonify({
             'success': True,
@@ -185,6 +243,7 @@ def delete_task(task_id):
         
         db.session.delete(task)
         db.session.commit()
+        TaskService.invalidate_counts(current_user_id)
         
         return jsonify({
             'success': True,
@@ -205,46 +264,9 @@ def get_task_stats():
     try:
         current_user_id = get_jwt_identity()
         
-        total_tasks = Task.query.filter_by(user_id=current_user_id).count()
-        completed_tasks = Task.query.filter_by(
-            user_id=current_user_id, 
-            status=TaskStatus.COMPLETED
-        ).count()
-        pending_tasks = Task.query.filter_by(
-            user_id=current_user_id, 
-            status=TaskStatus.PENDING
-        ).count()
-        in_progress_tasks = Task.query.filter_by(
-            user_id=current_user_id, 
-            status=TaskStatus.IN_PROGRESS
-        ).count()
-        
-        # Count overdue tasks
-        overdue_tasks = Task.query.filter(
-            Task.user_id == current_user_id,
-            Task.status != TaskStatus.COMPLETED,
-            Task.due_date < datetime.utcnow()
-        ).count()
-        
-        # Priority distribution
-        priority_stats = {}
-        for priority in [TaskPriority.LOW, TaskPriority.MEDIUM, TaskPriority.HIGH, TaskPriority.URGENT]:
-            count = Task.query.filter_by(
-                user_id=current_user_id,
-                priority=priority
-            ).count()
-            priority_stats[priority] = count
-        
         return jsonify({
             'success': True,
-            'stats': {
-                'total': total_tasks,
-                'completed': completed_tasks,
-                'pending': pending_tasks,
-                'in_progress': in_progress_tasks,
-                'overdue': overdue_tasks,
-                'priority_distribution': priority_stats
-            }
+            'stats': TaskService.get_stats(current_user_id)
         })
         
     except Exception as e:
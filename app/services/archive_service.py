@@ -0,0 +1,105 @@
+from app import db
+from app.models.lab import Reservation, ReservationArchive, ReservationRecurrence
+from app.models.term import Term
+from app.utils.cache import LRUCache
+from sqlalchemy import select, insert, delete, exists, literal, func, text
+from datetime import datetime, time, timedelta
+
+# The archive horizon changes only when a term is archived; other workers
+# pick the new value up within the TTL
+archive_horizon = LRUCache('archive_horizon', maxsize=1, ttl=60)
+
+ARCHIVED_COLUMNS = [column.name for column in Reservation.__table__.columns]
+
+class ArchiveService:
+    @staticmethod
+    def horizon():
+        """End of the latest archived term; archived rows all start before it"""
+        cached = archive_horizon.get('horizon', False)
+        if cached is not False:
+            return cached
+
+        end_date = db.session.query(func.max(Term.end_date)).filter(Term.archived_at.isnot(None)).scalar()
+        horizon = datetime.combine(end_date + timedelta(days=1), time.min) if end_date else None
+        archive_horizon.set('horizon', horizon)
+        return horizon
+
+    @staticmethod
+    def reaches(start):
+        """Whether a read starting at start (None for unbounded) can touch archived rows"""
+        horizon = ArchiveService.horizon()
+        return horizon is not None and (start is None or start < horizon)
+
+    @staticmethod
+    def archive_term(term, batch_size=5000, now=None):
+        """Move a finished term's reservations into reservations_archive.
+
+        Runs in batches of batch_size rows, each an INSERT ... SELECT plus a
+        DELETE in its own transaction, so the hot table is never locked for
+        long and an interrupted run can simply be restarted. Recurring
+        series stay in the hot table: their first reservations carry the
+        rule later occurrences are expanded from, and expansion only skips
+        occurrences that are materialized in the hot table. Returns the
+        number of rows moved.
+        """
+        now = now or datetime.utcnow()
+        if term.ends_at > now:
+            raise ValueError(f"Term '{term.name}' has not ended yet")
+
+        in_term = (
+            Reservation.start_time >= term.starts_at,
+            Reservation.start_time < term.ends_at,
+            Reservation.series_id.is_(None),
+            ~exists().where(ReservationRecurrence.reservation_id == Reservation.id)
+        )
+        source_columns = [Reservation.__table__.c[name] for name in ARCHIVED_COLUMNS]
+
+        moved = 0
+        while True:
+            ids = [row[0] for row in db.session.execute(
+                select(Reservation.id).where(*in_term).order_by(Reservation.start_time).limit(batch_size)
+            )]
+            if not ids:
+                break
+
+            db.session.execute(
+                insert(ReservationArchive.__table__).from_select(
+                    ARCHIVED_COLUMNS + ['term_id', 'archived_at'],
+                    select(*source_columns, literal(term.id), literal(now)).where(Reservation.id.in_(ids))
+                )
+            )
+            db.session.execute(delete(Reservation.__table__).where(Reservation.id.in_(ids)))
+            db.session.commit()
+            moved += len(ids)
+
+        term.archived_at = now
+        db.session.commit()
+        archive_horizon.clear()
+        return moved
+
+    @staticmethod
+    def sizes():
+        """Row counts (and on SQLite, on-disk bytes) of the hot and archive tables"""
+        report = {
+            'hot_rows': db.session.query(func.count(Reservation.id)).scalar(),
+            'archive_rows': db.session.query(func.count(ReservationArchive.id)).scalar(),
+            'terms': [
+                {'term': name, 'rows': count}
+                for name, count in db.session.query(Term.name, func.count(ReservationArchive.id)).join(
+                    ReservationArchive, ReservationArchive.term_id == Term.id
+                ).group_by(Term.name).order_by(func.min(Term.start_date))
+            ]
+        }
+
+        # dbstat is an optional SQLite extension; sizes are reported when it is compiled in
+        try:
+            rows = db.session.execute(text(
+                "SELECT name, SUM(pgsize) FROM dbstat WHERE name IN "
+                "('reservations', 'reservations_archive') GROUP BY name"
+            )).all()
+            sizes = dict(rows)
+            report['hot_bytes'] = sizes.get('reservations', 0)
+            report['archive_bytes'] = sizes.get('reservations_archive', 0)
+        except Exception:
+            db.session.rollback()
+        return report
@@ -75,7 +75,7 @@ class AuthService:
             
         except Exception as e:
             db.session.rollback()
-            print(f"Registration error: {str(e)}")  # Debug logging
+            current_app.logger.exception('Registration error')
             return None, f"Registration failed: {str(e)}"
     
     @staticmethod
@@ -112,5 +112,5 @@ class AuthService:
             }, "Login successful"
             
         except Exception as e:
-            print(f"Login error: {str(e)}")  # Debug logging
+            current_app.logger.exception('Login error')
             return None, f"Login failed: {str(e)}"
\ No newline at end of file
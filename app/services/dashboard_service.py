@@ -0,0 +1,214 @@
+from app import db
+from app.models.lab import Lab, Reservation, ReservationArchive, ReservationStatus
+from app.services.archive_service import ArchiveService
+from app.utils.pagination import encode_cursor, decode_cursor
+from app.utils.serializers import apply_fields
+from sqlalchemy import and_, or_, func, case
+from sqlalchemy.orm import joinedload, load_only
+from datetime import datetime, timedelta
+
+class DashboardService:
+    SECTIONS = ('stats', 'labs', 'reservations', 'lab_status')
+
+    @staticmethod
+    def _count_if(condition):
+        return func.coalesce(func.sum(case((condition, 1), else_=0)), 0)
+
+    @staticmethod
+    def get_stats(user):
+        """Role-specific dashboard counters, one aggregate query per table"""
+        active_labs = db.session.query(func.count(Lab.id)).filter(Lab.is_active == True).scalar()
+
+        if user.is_admin():
+            total, pending, approved = db.session.query(
+                func.count(Reservation.id),
+                DashboardService._count_if(Reservation.status == ReservationStatus.PENDING),
+                DashboardService._count_if(Reservation.status == ReservationStatus.APPROVED)
+            ).one()
+            return {
+                'total_labs': active_labs,
+                'total_reservations': total,
+                'pending_requests': pending,
+                'approved_reservations': approved
+            }
+
+        if user.is_instructor():
+            total, upcoming, pending = db.session.query(
+                func.count(Reservation.id),
+                DashboardService._count_if(
+                    (Reservation.status == ReservationStatus.APPROVED) &
+                    (Reservation.start_time >= datetime.utcnow())
+                ),
+                DashboardService._count_if(Reservation.status == ReservationStatus.PENDING)
+            ).filter(Reservation.instructor_id == user.id).one()
+            return {
+                'my_reservations': total,
+                'upcoming_sessions': upcoming,
+                'pending_requests': pending
+            }
+
+        # Student
+        scheduled = db.session.query(func.count(Reservation.id)).filter(
+            Reservation.status == ReservationStatus.APPROVED
+        ).scalar()
+        return {
+            'available_labs': active_labs,
+            'scheduled_sessions': scheduled
+        }
+
+    @staticmethod
+    def get_labs(fields=None):
+        return apply_fields(Lab.query.filter_by(is_active=True), Lab, fields).all()
+
+    @staticmethod
+    def reservations_query(user, fields=None, model=Reservation):
+        """Query for the reservations visible to the user, loading only what fields needs.
+
+        model is Reservation or ReservationArchive; both have the same columns.
+        """
+        query = apply_fields(model.query, model, fields)
+
+        if user.is_instructor():
+            query = query.filter(model.instructor_id == user.id)
+        elif not user.is_admin():
+            # Students can see all approved reservations
+            query = query.filter(model.status == ReservationStatus.APPROVED)
+
+        return query
+
+    @staticmethod
+    def get_reservations(user, fields=None):
+        """Every visible reservation, archived terms included"""
+        reservations = DashboardService.reservations_query(user, fields).all()
+        if ArchiveService.reaches(None):
+            reservations += DashboardService.reservations_query(user, fields, ReservationArchive).all()
+        return reservations
+
+    @staticmethod
+    def _page_rows(user, fields, model, position, limit):
+        """Up to limit + 1 visible rows of one table after the keyset position"""
+        query = DashboardService.reservations_query(user, fields, model)
+
+        if position:
+            start_time, reservation_id = position
+            query = query.filter(or_(
+                model.start_time < start_time,
+                and_(model.start_time == start_time, model.id < reservation_id)
+            ))
+
+        # start_time and id drive the cursor, so they must be loaded even for sparse fieldsets
+        if fields:
+            query = query.options(load_only(model.start_time))
+
+        return query.order_by(model.start_time.desc(), model.id.desc()).limit(limit + 1).all()
+
+    @staticmethod
+    def get_reservations_page(user, fields=None, limit=100, cursor=None):
+        """One keyset page of visible reservations, newest start_time first.
+
+        Archived rows all start before the archive horizon, so the archive
+        is only read once a page runs out of hot rows or reaches below the
+        horizon; its rows are merged in under the same cursor. Returns
+        (reservations, next_cursor); next_cursor is None on the last page.
+        """
+        position = decode_cursor(cursor) if cursor else None
+        rows = DashboardService._page_rows(user, fields, Reservation, position, limit)
+
+        horizon = ArchiveService.horizon()
+        if horizon is not None and (len(rows) <= limit or rows[-1].start_time < horizon):
+            rows += DashboardService._page_rows(user, fields, ReservationArchive, position, limit)
+            rows.sort(key=lambda row: (row.start_time, row.id), reverse=True)
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(rows[-1].start_time, rows[-1].id)
+
+        return rows, next_cursor
+
+    @staticmethod
+    def serialize_reservations(rows, fields=None):
+        """Serialize a mix of hot and archived reservation rows"""
+        encode, encode_archived = Reservation.encoder(fields), ReservationArchive.encoder(fields)
+        return [encode_archived(row) if isinstance(row, ReservationArchive) else encode(row) for row in rows]
+
+    @staticmethod
+    def get_lab_status(now=None):
+        """Current and next approved booking for every lab"""
+        now = now or datetime.utcnow()
+        end_of_day = now.replace(hour=0, minute=0, second=0, microsecond=0) + timedelta(days=1)
+
+        labs = Lab.query.order_by(Lab.name).all()
+
+        # All of today's remaining bookings in one query, earliest first
+        bookings = Reservation.query.options(joinedload(Reservation.instructor)).filter(
+            Reservation.status == ReservationStatus.APPROVED,
+            Reservation.end_time > now,
+            Reservation.start_time < end_of_day
+        ).order_by(Reservation.start_time).all()
+
+        current_by_lab = {}
+        next_by_lab = {}
+        for booking in bookings:
+            if booking.start_time <= now:
+                current_by_lab.setdefault(booking.lab_id, booking)
+            else:
+                next_by_lab.setdefault(booking.lab_id, booking)
+
+        status_list = []
+        for lab in labs:
+            entry = {
+                'id': lab.id,
+                'name': lab.name,
+                'capacity': lab.capacity,
+                'location': lab.location
+            }
+
+            current = current_by_lab.get(lab.id)
+            upcoming = next_by_lab.get(lab.id)
+
+            if not lab.is_active:
+                entry['status'] = 'maintenance'
+            elif current:
+                remaining = int((current.end_time - now).total_seconds() // 60)
+                entry['status'] = 'occupied'
+                entry['current_booking'] = {
+                    'course_code': current.course_code,
+                    'instructor': current.instructor.full_name if current.instructor else 'Unknown',
+                    'time_remaining': f'{remaining} min'
+                }
+            else:
+                entry['status'] = 'available'
+
+            if upcoming and lab.is_active:
+                entry['next_booking'] = {
+                    'time': upcoming.start_time.strftime('%H:%M'),
+                    'course_code': upcoming.course_code
+                }
+
+            status_list.append(entry)
+
+        return status_list
+
+    @staticmethod
+    def get_dashboard(user, include=None):
+        """Bundle the requested dashboard sections for one user.
+
+        Reservations are the first keyset page only, with the cursor for the
+        rest under reservations_next_cursor (continue at GET /api/reservations).
+        """
+        sections = include or DashboardService.SECTIONS
+        dashboard = {}
+
+        if 'stats' in sections:
+            dashboard['stats'] = DashboardService.get_stats(user)
+        if 'labs' in sections:
+            dashboard['labs'] = Lab.serialize_many(DashboardService.get_labs())
+        if 'reservations' in sections:
+            reservations, next_cursor = DashboardService.get_reservations_page(user)
+            dashboard['reservations'] = DashboardService.serialize_reservations(reservations)
+            dashboard['reservations_next_cursor'] = next_cursor
+        if 'lab_status' in sections:
+            dashboard['lab_status'] = DashboardService.get_lab_status()
+
+        return dashboard
@@ -0,0 +1,280 @@
+import random
+import uuid
+from app import db
+from app.models.lab import Lab, Reservation, ReservationStatus
+from app.models.task import Task, TaskStatus, TaskPriority
+from app.models.term import Term
+from app.models.user import User, UserRole
+from app.services.search_service import SearchService
+from app.utils.security import hash_password
+from datetime import datetime, timedelta
+
+FIRST_NAMES = (
+    'Alex', 'Sam', 'Jordan', 'Taylor', 'Morgan', 'Casey', 'Riley', 'Jamie', 'Avery', 'Quinn',
+    'Maria', 'Jose', 'Ana', 'Juan', 'Mark', 'Grace', 'Paolo', 'Liza', 'Carlo', 'Nina'
+)
+LAST_NAMES = (
+    'Santos', 'Reyes', 'Cruz', 'Garcia', 'Mendoza', 'Torres', 'Flores', 'Ramos', 'Rivera', 'Lopez',
+    'Smith', 'Johnson', 'Lee', 'Brown', 'Nguyen', 'Chen', 'Kim', 'Patel', 'Walker', 'Young'
+)
+COURSES = (
+    ('IT101', 'Introduction to Computing'), ('IT102', 'Computer Programming 1'),
+    ('IT103', 'Computer Programming 2'), ('IT201', 'Data Structures and Algorithms'),
+    ('IT202', 'Database Management Systems'), ('IT203', 'Web Development'),
+    ('IT204', 'Networking 1'), ('IT301', 'Networking 2'), ('IT302', 'Systems Administration'),
+    ('IT303', 'Information Assurance and Security'), ('IT304', 'Mobile Development'),
+    ('IT401', 'Capstone Project'), ('CS210', 'Operating Systems'), ('CS310', 'Machine Learning')
+)
+EQUIPMENT = ('30 Desktop PCs', 'Projector', 'Smart Board', 'Network Rack', 'Cisco Routers', 'GPU Workstations')
+TASK_TITLES = (
+    'Prepare lab exercise', 'Grade submissions', 'Update course syllabus', 'Install software',
+    'Review project proposal', 'Check equipment', 'Write report', 'Plan laboratory session'
+)
+
+# Status mix per term phase: finished terms are decided, upcoming ones still have pending requests
+PAST_STATUS_WEIGHTS = {
+    ReservationStatus.APPROVED: 85, ReservationStatus.REJECTED: 7,
+    ReservationStatus.CANCELLED: 7, ReservationStatus.PENDING: 1
+}
+FUTURE_STATUS_WEIGHTS = {
+    ReservationStatus.APPROVED: 60, ReservationStatus.PENDING: 30,
+    ReservationStatus.REJECTED: 5, ReservationStatus.CANCELLED: 5
+}
+
+SLOT_HOURS = tuple(range(7, 22))  # one-hour slots, 07:00 to 22:00
+SLOT_DAYS = tuple(range(7))
+SECTION_HOURS = (1, 1, 2)
+AVERAGE_SECTION_HOURS = sum(SECTION_HOURS) / len(SECTION_HOURS)
+
+# Column order of the generated row tuples
+USER_COLUMNS = (
+    'id', 'username', 'email', 'password_hash', 'first_name', 'last_name',
+    'role', 'is_active', 'created_at', 'updated_at'
+)
+LAB_COLUMNS = (
+    'id', 'name', 'location', 'capacity', 'equipment', 'description',
+    'is_active', 'admin_id', 'created_at', 'updated_at'
+)
+TERM_COLUMNS = ('id', 'name', 'start_date', 'end_date', 'created_at')
+RESERVATION_COLUMNS = (
+    'id', 'instructor_id', 'lab_id', 'course_code', 'course_name', 'section', 'student_count',
+    'start_time', 'end_time', 'duration_minutes', 'status', 'purpose', 'created_at', 'updated_at'
+)
+TASK_COLUMNS = (
+    'id', 'title', 'description', 'status', 'priority', 'due_date', 'completed_at',
+    'user_id', 'created_at', 'updated_at'
+)
+
+class DataGenerator:
+    """Deterministic synthetic data at production-like volumes.
+
+    Everything is derived from one random seed, so the same options always
+    produce the same database. Rows are built as plain tuples and written with
+    executemany in chunks inside a single transaction.
+    """
+
+    def __init__(self, seed=42, labs=100, instructors=2000, students=30000, terms=10,
+                 weeks_per_term=16, reservations=1_000_000, tasks=100_000, prefix='gen',
+                 first_term_start=None, chunk_size=20000):
+        self.rng = random.Random(seed)
+        self.labs = labs
+        self.instructors = instructors
+        self.students = students
+        self.terms = terms
+        self.weeks_per_term = weeks_per_term
+        self.reservations = reservations
+        self.tasks = tasks
+        self.prefix = prefix
+        self.chunk_size = chunk_size
+        self.now = datetime.utcnow().replace(microsecond=0)
+        self._stamps = {}
+        self._text_datetimes = db.engine.dialect.name == 'sqlite'
+
+        # Terms run back to back and end around now, so most of the history is in the past
+        if first_term_start is None:
+            weeks_back = terms * (weeks_per_term + 2) - weeks_per_term // 2
+            first_term_start = (self.now - timedelta(weeks=weeks_back)).date()
+        self.first_term_start = first_term_start - timedelta(days=first_term_start.weekday())
+
+    @staticmethod
+    def username(prefix, role, number, count):
+        """Username of the number-th generated account of a role (benchmarks/loadtest.py logs in with these)"""
+        return f'{prefix}_{role}{number:0{len(str(count))}d}'
+
+    def _id(self):
+        return str(uuid.UUID(int=self.rng.getrandbits(128), version=4))
+
+    def _insert(self, model, columns, rows):
+        """executemany tuples (from any iterable) in chunks straight through the driver.
+
+        The rows never pile up in memory, and skipping SQLAlchemy's per-value
+        bind processing roughly halves the cost of a million-row load.
+        Values must already be in driver form; see _stamp for datetimes.
+        """
+        connection = db.session.connection()
+        placeholder = '?' if connection.dialect.paramstyle == 'qmark' else '%s'
+        statement = (
+            f"INSERT INTO {model.__tablename__} ({', '.join(columns)}) "
+            f"VALUES ({', '.join([placeholder] * len(columns))})"
+        )
+        total = 0
+        chunk = []
+        for row in rows:
+            chunk.append(row)
+            if len(chunk) == self.chunk_size:
+                connection.exec_driver_sql(statement, chunk)
+                total += len(chunk)
+                chunk = []
+        if chunk:
+            connection.exec_driver_sql(statement, chunk)
+            total += len(chunk)
+        return total
+
+    def _stamp(self, value):
+        """A datetime in the stored form; SQLite keeps SQLAlchemy's text format, so
+        comparisons with ORM-bound values stay consistent. Memoized, as generated
+        timestamps repeat heavily."""
+        stamp = self._stamps.get(value)
+        if stamp is None:
+            stamp = self._stamps[value] = value.strftime('%Y-%m-%d %H:%M:%S.%f') if self._text_datetimes else value
+        return stamp
+
+    def _name(self):
+        return self.rng.choice(FIRST_NAMES), self.rng.choice(LAST_NAMES)
+
+    def build_users(self, password_hash):
+        rows = []
+        for role, count in ((UserRole.INSTRUCTOR, self.instructors), (UserRole.STUDENT, self.students)):
+            for number in range(count):
+                first_name, last_name = self._name()
+                username = self.username(self.prefix, role, number, count)
+                created = self._stamp(self.now - timedelta(days=self.rng.randrange(30, 1500)))
+                rows.append((
+                    self._id(), username, f'{username}@example.edu', password_hash, first_name, last_name,
+                    role, self.rng.random() > 0.02, created, created
+                ))
+        return rows
+
+    def build_labs(self, admin_id):
+        created = self._stamp(self.now - timedelta(days=2000))
+        return [
+            (
+                self._id(), f'{self.prefix.upper()} Lab {number + 1:03d}',
+                f'Building {chr(65 + number % 6)}, Room {100 + number}',
+                self.rng.choice((20, 25, 30, 35, 40, 50)), ', '.join(self.rng.sample(EQUIPMENT, 3)),
+                'Generated laboratory', True, admin_id, created, created
+            )
+            for number in range(self.labs)
+        ]
+
+    def build_terms(self):
+        terms = []
+        start = self.first_term_start
+        for number in range(self.terms):
+            end = start + timedelta(weeks=self.weeks_per_term) - timedelta(days=1)
+            terms.append((self._id(), f'{self.prefix.upper()} Term {start.year}-{number + 1}', start, end))
+            start = end + timedelta(days=1) + timedelta(weeks=2)  # two-week break
+        return terms
+
+    def build_reservations(self, terms, lab_ids, instructor_ids):
+        """Weekly sections per lab and term, repeated every week of the term.
+
+        Each term every lab gets a fixed timetable: sections of one or two
+        hours fill a share of its weekly slots sized to reach the requested
+        total. Sections never overlap inside a lab, like a real,
+        conflict-checked timetable. Yields rows in RESERVATION_COLUMNS order.
+        """
+        slots_per_week = len(SLOT_DAYS) * len(SLOT_HOURS)
+        capacity = self.labs * len(terms) * self.weeks_per_term * slots_per_week / AVERAGE_SECTION_HOURS
+        occupancy = min(1.0, self.reservations / capacity) if capacity else 0
+
+        for _, _, start_date, _ in terms:
+            term_start = datetime.combine(start_date, datetime.min.time())
+            past = term_start + timedelta(weeks=self.weeks_per_term) < self.now
+            weights = PAST_STATUS_WEIGHTS if past else FUTURE_STATUS_WEIGHTS
+            statuses, status_weights = list(weights), list(weights.values())
+
+            for lab_id in lab_ids:
+                sections = []
+                for day in SLOT_DAYS:
+                    hour_index = 0
+                    while hour_index < len(SLOT_HOURS):
+                        length = min(self.rng.choice(SECTION_HOURS), len(SLOT_HOURS) - hour_index)
+                        if self.rng.random() < occupancy:
+                            course_code, course_name = self.rng.choice(COURSES)
+                            sections.append((
+                                day, SLOT_HOURS[hour_index], length, course_code, course_name,
+                                f'{chr(65 + self.rng.randrange(6))}{self.rng.randrange(1, 5)}',
+                                self.rng.choice(instructor_ids), self.rng.randrange(15, 45),
+                                self.rng.choices(statuses, status_weights)[0]
+                            ))
+                        hour_index += length
+
+                for week in range(self.weeks_per_term):
+                    week_start = term_start + timedelta(weeks=week)
+                    for day, hour, length, code, name, section, instructor_id, students, status in sections:
+                        start = week_start + timedelta(days=day, hours=hour)
+                        created = self._stamp(start - timedelta(days=self.rng.randrange(7, 60)))
+                        yield (
+                            self._id(), instructor_id, lab_id, code, name, section, students,
+                            self._stamp(start), self._stamp(start + timedelta(hours=length)), length * 60,
+                            status, f'{code} laboratory session', created, created
+                        )
+
+    def build_tasks(self, user_ids):
+        """Yields rows in TASK_COLUMNS order"""
+        statuses = (TaskStatus.PENDING, TaskStatus.IN_PROGRESS, TaskStatus.COMPLETED, TaskStatus.CANCELLED)
+        priorities = (TaskPriority.LOW, TaskPriority.MEDIUM, TaskPriority.HIGH, TaskPriority.URGENT)
+        for _ in range(self.tasks):
+            created = self.now - timedelta(hours=self.rng.randrange(0, 400 * 24))
+            status = self.rng.choices(statuses, (30, 20, 45, 5))[0]
+            completed = created + timedelta(days=self.rng.randrange(0, 20)) if status == TaskStatus.COMPLETED else None
+            yield (
+                self._id(), self.rng.choice(TASK_TITLES), 'Generated task', status,
+                self.rng.choices(priorities, (25, 45, 22, 8))[0],
+                self._stamp(created + timedelta(days=self.rng.randrange(1, 30))),
+                self._stamp(completed) if completed else None,
+                self.rng.choice(user_ids), self._stamp(created), self._stamp(created)
+            )
+
+    def run(self, admin_id=None, password='password123'):
+        """Generate and insert everything in one transaction; returns row counts"""
+        if User.query.filter(User.username.like(f'{self.prefix}\\_%', escape='\\')).first():
+            raise ValueError(f"Data with prefix '{self.prefix}' already exists")
+
+        # One hash shared by every generated account: hashing 32k passwords would dominate the run
+        users = self.build_users(hash_password(password))
+        instructor_ids = [row[0] for row in users if row[6] == UserRole.INSTRUCTOR]
+        labs = self.build_labs(admin_id)
+        terms = self.build_terms()
+        created = self._stamp(self.now)
+
+        counts = {}
+        connection = db.session.connection()
+        if self._text_datetimes:
+            # Random UUID keys touch index pages all over the file; the default
+            # 2 MB page cache would turn most inserts into page reloads
+            default_cache = connection.exec_driver_sql('PRAGMA cache_size').scalar()
+            connection.exec_driver_sql('PRAGMA cache_size = -262144')  # 256 MB
+        try:
+            with SearchService.bulk_load('labs', 'reservations', 'tasks'):
+                counts['users'] = self._insert(User, USER_COLUMNS, users)
+                counts['labs'] = self._insert(Lab, LAB_COLUMNS, labs)
+                counts['terms'] = self._insert(Term, TERM_COLUMNS, [
+                    (term_id, name, start.isoformat(), end.isoformat(), created) if self._text_datetimes
+                    else (term_id, name, start, end, created)
+                    for term_id, name, start, end in terms
+                ])
+                counts['reservations'] = self._insert(
+                    Reservation, RESERVATION_COLUMNS,
+                    self.build_reservations(terms, [row[0] for row in labs], instructor_ids)
+                )
+                counts['tasks'] = self._insert(Task, TASK_COLUMNS, self.build_tasks([row[0] for row in users]))
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        finally:
+            if self._text_datetimes:
+                db.session.connection().exec_driver_sql(f'PRAGMA cache_size = {default_cache}')
+        return counts
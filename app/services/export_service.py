@@ -0,0 +1,345 @@
+import csv
+import heapq
+import io
+import itertools
+from datetime import datetime
+from app import db
+from app.models.lab import Lab, Reservation, ReservationArchive, ReservationRecurrence, ReservationStatus
+from app.models.term import Term
+from app.models.user import User
+from app.services.archive_service import ArchiveService
+from app.services.reservation_service import ReservationService
+from sqlalchemy import select, union_all, null, func, case, cast, Integer, DateTime, Date, Boolean, Float, Numeric
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - Parquet export is optional
+    pa = None
+    pq = None
+
+EXPORT_KINDS = ('reservations', 'utilization')
+EXPORT_FORMATS = ('csv', 'parquet')
+RESERVATION_STATUSES = (
+    ReservationStatus.PENDING, ReservationStatus.APPROVED, ReservationStatus.REJECTED, ReservationStatus.CANCELLED
+)
+
+# Reservation columns shared by the hot table and the archive
+ROW_COLUMNS = (
+    'id', 'instructor_id', 'lab_id', 'course_code', 'course_name', 'section', 'student_count',
+    'start_time', 'end_time', 'duration_minutes', 'status', 'purpose', 'series_id',
+    'created_at', 'updated_at'
+)
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file object that hands written bytes back in chunks"""
+
+    def __init__(self):
+        super().__init__()
+        self.chunks = []
+        self.position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        self.position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self.position
+
+    def drain(self):
+        data = b''.join(self.chunks)
+        self.chunks = []
+        return data
+
+def _arrow_type(sql_type):
+    if isinstance(sql_type, Boolean):
+        return pa.bool_()
+    if isinstance(sql_type, Integer):
+        return pa.int64()
+    if isinstance(sql_type, (Float, Numeric)):
+        return pa.float64()
+    if isinstance(sql_type, DateTime):
+        return pa.timestamp('us')
+    if isinstance(sql_type, Date):
+        return pa.date32()
+    return pa.string()
+
+def _total(values):
+    """SUM() semantics: NULLs are skipped, and a sum of only NULLs is NULL"""
+    values = [value for value in values if value is not None]
+    return sum(values) if values else None
+
+def _reservation_key(row):
+    return row[1], row[0]  # start_time, reservation_id
+
+def _utilization_key(row):
+    return row[1], row[0], str(row[3])  # lab_name, lab_id, day
+
+def _combine_utilization(rows):
+    """Fold utilization rows of the same lab and day into one"""
+    if len(rows) == 1:
+        return rows[0]
+    peaks = [row[7] for row in rows if row[7] is not None]
+    return (
+        rows[0][0], rows[0][1], rows[0][2], rows[0][3],
+        sum(row[4] for row in rows),
+        _total(row[5] for row in rows),
+        _total(row[6] for row in rows),
+        max(peaks) if peaks else None
+    )
+
+class ExportService:
+    @staticmethod
+    def parquet_available():
+        return pq is not None
+
+    @staticmethod
+    def _window(term):
+        """The [start, end) of a term, or (None, None) for an unbounded export"""
+        if not term:
+            return None, None
+        term = Term.resolve(term)
+        return term.starts_at, term.ends_at
+
+    @staticmethod
+    def _rows(lab_id=None, term=None, status=None):
+        """The reservation rows to export, reaching into the archive only when needed.
+
+        Returns a subquery with the reservation columns plus the recurrence
+        rule; archived rows (which never carry a rule) are UNION ALLed in when
+        the term, or an unbounded export, reaches archived terms.
+        """
+        start, end = ExportService._window(term)
+
+        def select_from(model, with_rule):
+            columns = [getattr(model, name) for name in ROW_COLUMNS]
+            if with_rule:
+                columns += [
+                    ReservationRecurrence.weekdays.label('recurrence_weekdays'),
+                    ReservationRecurrence.until.label('recurrence_until')
+                ]
+            else:
+                columns += [
+                    null().label('recurrence_weekdays'),
+                    null().label('recurrence_until')
+                ]
+            query = select(*columns)
+            if with_rule:
+                query = query.select_from(model).outerjoin(
+                    ReservationRecurrence, ReservationRecurrence.reservation_id == model.id
+                )
+            if lab_id:
+                query = query.where(model.lab_id == lab_id)
+            if start is not None:
+                query = query.where(model.start_time >= start, model.start_time < end)
+            if status:
+                query = query.where(model.status == status)
+            return query
+
+        query = select_from(Reservation, True)
+        if ArchiveService.reaches(start):
+            query = union_all(query, select_from(ReservationArchive, False))
+        return query.subquery('rows')
+
+    @staticmethod
+    def reservations_statement(lab_id=None, term=None, status=None):
+        """One row per reservation with lab and instructor columns joined in the same query"""
+        rows = ExportService._rows(lab_id, term, status)
+        return select(
+            rows.c.id.label('reservation_id'),
+            rows.c.start_time,
+            rows.c.end_time,
+            rows.c.duration_minutes,
+            rows.c.status,
+            rows.c.course_code,
+            rows.c.course_name,
+            rows.c.section,
+            rows.c.student_count,
+            rows.c.purpose,
+            Lab.id.label('lab_id'),
+            Lab.name.label('lab_name'),
+            Lab.location.label('lab_location'),
+            Lab.capacity.label('lab_capacity'),
+            User.id.label('instructor_id'),
+            User.username.label('instructor_username'),
+            (User.first_name + ' ' + User.last_name).label('instructor_name'),
+            User.email.label('instructor_email'),
+            rows.c.series_id,
+            rows.c.recurrence_weekdays,
+            rows.c.recurrence_until,
+            rows.c.created_at,
+            rows.c.updated_at
+        ).select_from(rows).join(
+            Lab, Lab.id == rows.c.lab_id
+        ).join(
+            User, User.id == rows.c.instructor_id
+        ).order_by(rows.c.start_time, rows.c.id)
+
+    @staticmethod
+    def utilization_statement(lab_id=None, term=None, status=ReservationStatus.APPROVED):
+        """Booked sessions, minutes and seats per lab and day"""
+        rows = ExportService._rows(lab_id, term, status)
+        day = func.date(rows.c.start_time)
+        query = select(
+            Lab.id.label('lab_id'),
+            Lab.name.label('lab_name'),
+            Lab.capacity.label('lab_capacity'),
+            day.label('day'),
+            func.count(rows.c.id).label('sessions'),
+            func.sum(rows.c.duration_minutes).label('booked_minutes'),
+            func.sum(rows.c.student_count).label('students'),
+            cast(func.max(case((Lab.capacity > 0, rows.c.student_count * 100.0 / Lab.capacity), else_=None)), Float).label('peak_seat_percent')
+        ).select_from(rows).join(Lab, Lab.id == rows.c.lab_id)
+        return query.group_by(Lab.id, Lab.name, Lab.capacity, day).order_by(Lab.name, Lab.id, day)
+
+    @staticmethod
+    def occurrences(lab_id=None, term=None, status=None):
+        """Expanded occurrences of recurring series starting inside the export window.
+
+        A series is stored as its first reservation plus a rule, with only
+        materialized weeks as further rows; the stored rows come from the
+        statement, and expand() yields just the occurrences that have none.
+        """
+        start, end = ExportService._window(term)
+        series_list = ReservationService.series_in_window(
+            start or datetime.min, end, (status,) if status else RESERVATION_STATUSES, [lab_id] if lab_id else None
+        )
+        if not series_list:
+            return []
+        if start is None:
+            start = min(series.start_time for series in series_list)
+        return [
+            occurrence for occurrence in ReservationService.expand(series_list, start, end)
+            if occurrence.start_time >= start
+        ]
+
+    @staticmethod
+    def reservation_rows(occurrences):
+        """Occurrences as rows of reservations_statement, in its order"""
+        rows = []
+        for occurrence in occurrences:
+            lab, instructor, rule = occurrence.lab, occurrence.instructor, occurrence.recurrence
+            name = None
+            if instructor.first_name is not None and instructor.last_name is not None:
+                name = instructor.first_name + ' ' + instructor.last_name
+            rows.append((
+                occurrence.id, occurrence.start_time, occurrence.end_time, occurrence.duration_minutes,
+                occurrence.status, occurrence.course_code, occurrence.course_name, occurrence.section,
+                occurrence.student_count, occurrence.purpose,
+                lab.id, lab.name, lab.location, lab.capacity,
+                instructor.id, instructor.username, name, instructor.email,
+                occurrence.series_id, rule.weekdays, rule.until, occurrence.created_at, occurrence.updated_at
+            ))
+        return sorted(rows, key=_reservation_key)
+
+    @staticmethod
+    def utilization_rows(occurrences):
+        """Occurrences as one-session rows of utilization_statement, in its order"""
+        rows = []
+        for occurrence in occurrences:
+            lab, students = occurrence.lab, occurrence.student_count
+            peak = students * 100.0 / lab.capacity if students is not None and lab.capacity and lab.capacity > 0 else None
+            rows.append((
+                lab.id, lab.name, lab.capacity, occurrence.start_time.date().isoformat(),
+                1, occurrence.duration_minutes, students, peak
+            ))
+        return sorted(rows, key=_utilization_key)
+
+    @staticmethod
+    def statement(kind, lab_id=None, term=None, status=None):
+        if kind not in EXPORT_KINDS:
+            raise ValueError(f"kind must be one of: {', '.join(EXPORT_KINDS)}")
+        if kind == 'utilization':
+            return ExportService.utilization_statement(lab_id, term, status or ReservationStatus.APPROVED)
+        return ExportService.reservations_statement(lab_id, term, status)
+
+    @staticmethod
+    def _partitions(statement, batch_size, extra_rows=(), key=None, combine=None):
+        """Rows in batches from a server-side cursor, so memory stays flat.
+
+        extra_rows, sorted by key like the statement, are merged into the
+        stream; with combine, merged rows sharing a key are folded into one.
+        """
+        with db.engine.connect() as connection:
+            result = connection.execution_options(stream_results=True, yield_per=batch_size).execute(statement)
+            yield result.keys()
+            if not extra_rows:
+                for partition in result.partitions():
+                    yield partition
+                return
+
+            rows = heapq.merge(result, extra_rows, key=key)
+            if combine:
+                rows = (combine(list(group)) for _, group in itertools.groupby(rows, key=key))
+            while True:
+                partition = list(itertools.islice(rows, batch_size))
+                if not partition:
+                    return
+                yield partition
+
+    @staticmethod
+    def stream_csv(statement, batch_size=1000, **merge):
+        """Yield CSV text a batch of rows at a time"""
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        partitions = ExportService._partitions(statement, batch_size, **merge)
+
+        writer.writerow(list(next(partitions)))
+        for partition in partitions:
+            writer.writerows(partition)
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+        if buffer.tell():
+            yield buffer.getvalue()
+
+    @staticmethod
+    def stream_parquet(statement, batch_size=10000, **merge):
+        """Yield a Parquet file one row group at a time (requires pyarrow)"""
+        if pq is None:
+            raise ValueError('Parquet export requires pyarrow')
+
+        schema = pa.schema([
+            (column.name, _arrow_type(column.type)) for column in statement.selected_columns
+        ])
+        sink = _ChunkSink()
+        writer = pq.ParquetWriter(sink, schema, compression='snappy')
+        partitions = ExportService._partitions(statement, batch_size, **merge)
+        names = list(next(partitions))
+        try:
+            for partition in partitions:
+                columns = list(zip(*partition))
+                writer.write_batch(pa.RecordBatch.from_arrays(
+                    [pa.array(values, type=schema.field(name).type) for name, values in zip(names, columns)],
+                    schema=schema
+                ))
+                yield sink.drain()
+        finally:
+            writer.close()
+        yield sink.drain()
+
+    @staticmethod
+    def stream(kind='reservations', fmt='csv', lab_id=None, term=None, status=None):
+        """Validate the export request up front, then return its chunk generator"""
+        if fmt not in EXPORT_FORMATS:
+            raise ValueError(f"format must be one of: {', '.join(EXPORT_FORMATS)}")
+        if fmt == 'parquet' and not ExportService.parquet_available():
+            raise ValueError('Parquet export requires pyarrow')
+        statement = ExportService.statement(kind, lab_id, term, status)
+
+        # Recurring series only store their first session (and materialized
+        # weeks); the rest are expanded here and merged into the stored rows
+        if kind == 'utilization':
+            occurrences = ExportService.occurrences(lab_id, term, status or ReservationStatus.APPROVED)
+            merge = {'extra_rows': ExportService.utilization_rows(occurrences), 'key': _utilization_key, 'combine': _combine_utilization}
+        else:
+            occurrences = ExportService.occurrences(lab_id, term, status)
+            merge = {'extra_rows': ExportService.reservation_rows(occurrences), 'key': _reservation_key}
+
+        if fmt == 'parquet':
+            return ExportService.stream_parquet(statement, **merge)
+        return ExportService.stream_csv(statement, **merge)
@@ -0,0 +1,169 @@
+import os
+import resource
+import sys
+import threading
+import time
+from datetime import datetime
+from flask import current_app
+from sqlalchemy import text
+from app import db, scheduler, structured_log
+from app.services.job_queue import JobQueue
+from app.utils.cache import LRUCache, cache_stats
+
+# Import time of this module, i.e. when this worker created its app
+STARTED_AT = time.time()
+
+# The last readiness report; probes inside the TTL get it without touching anything
+readiness = LRUCache('health_readiness', maxsize=1, ttl=2)
+_readiness_lock = threading.Lock()
+
+def rss_bytes():
+    """Current resident set size, or the peak where /proc is not available"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == 'darwin' else peak * 1024  # kilobytes on Linux
+
+class HealthService:
+    @staticmethod
+    def live():
+        """The process is up and serving requests; checks no dependencies"""
+        return {
+            'status': 'alive',
+            'pid': os.getpid(),
+            'uptime_seconds': round(time.time() - STARTED_AT, 1)
+        }
+
+    @staticmethod
+    def ready():
+        """Cached readiness report: (report, is_ready).
+
+        Only one thread per worker builds a report; concurrent probes wait
+        for it and share it, so probe traffic costs at most one database
+        round trip and one queue query per HEALTH_CACHE_TTL.
+        """
+        cached, fresh = readiness.get('report'), False
+        if cached is None:
+            with _readiness_lock:
+                cached = readiness.get('report')
+                if cached is None:
+                    cached, fresh = (HealthService.check(), time.monotonic()), True
+                    readiness.set('report', cached, ttl=current_app.config['HEALTH_CACHE_TTL'])
+
+        report, built = cached
+        report = {**report, 'cached': not fresh, 'age_ms': round((time.monotonic() - built) * 1000, 1)}
+        return report, report['status'] != 'unavailable'
+
+    @staticmethod
+    def probe_database():
+        """One round trip that has to read the database.
+
+        On SQLite, SELECT 1 never opens the database file, so a locked or
+        unreadable file would still look healthy. Reading sqlite_master
+        takes a shared lock on the file; the connection's busy timeout is
+        lowered to HEALTH_DB_TIMEOUT_MS meanwhile so a lock fails the probe
+        quickly instead of waiting out the usual 5 seconds.
+        """
+        if db.engine.dialect.name != 'sqlite':
+            db.session.execute(text('SELECT 1')).scalar()
+            return
+
+        connection = db.session.connection()
+        busy_timeout = connection.exec_driver_sql('PRAGMA busy_timeout').scalar()
+        connection.exec_driver_sql(f"PRAGMA busy_timeout = {int(current_app.config['HEALTH_DB_TIMEOUT_MS'])}")
+        try:
+            connection.exec_driver_sql('SELECT count(*) FROM sqlite_master').scalar()
+        finally:
+            connection.exec_driver_sql(f'PRAGMA busy_timeout = {int(busy_timeout)}')
+
+    @staticmethod
+    def check_database():
+        """Time a round trip to the database; pool counters come from the engine's pool"""
+        config = current_app.config
+        began = time.perf_counter()
+        try:
+            HealthService.probe_database()
+            latency_ms = (time.perf_counter() - began) * 1000
+            status = 'slow' if latency_ms > config['HEALTH_DB_SLOW_MS'] else 'ok'
+            error = None
+        except Exception as e:
+            db.session.rollback()
+            latency_ms = (time.perf_counter() - began) * 1000
+            status = 'fail'
+            error = str(e).splitlines()[0][:200]
+        finally:
+            db.session.remove()
+
+        pool = db.engine.pool
+        result = {
+            'status': status,
+            'latency_ms': round(latency_ms, 2),
+            'pool': {
+                'class': type(pool).__name__,
+                # QueuePool counters; other pool classes report what they have
+                **{name: getattr(pool, name)() for name in ('size', 'checkedin', 'checkedout', 'overflow') if hasattr(pool, name)}
+            }
+        }
+        if error:
+            result['error'] = error
+        return result
+
+    @staticmethod
+    def check_jobs():
+        try:
+            metrics = JobQueue.metrics()
+        except Exception as e:
+            db.session.rollback()
+            return {'status': 'fail', 'error': str(e).splitlines()[0][:200]}
+        finally:
+            db.session.remove()
+        lagging = metrics['lag_seconds'] > current_app.config['HEALTH_JOB_LAG_WARN']
+        return {
+            'status': 'lagging' if lagging else 'ok',
+            'lag_seconds': metrics['lag_seconds'],
+            'queued': metrics['depth']['queued'],
+            'running': metrics['depth']['running'],
+            'dead': metrics['depth']['dead'],
+            'expired_leases': metrics['expired_leases']
+        }
+
+    @staticmethod
+    def check():
+        """Build a fresh readiness report.
+
+        Only the database decides readiness: without it no request can be
+        served. A slow database, a lagging job queue or a failed queue
+        query make the worker "degraded", which still takes traffic.
+        """
+        database = HealthService.check_database()
+        jobs = HealthService.check_jobs() if database['status'] != 'fail' else {'status': 'skipped'}
+
+        if database['status'] == 'fail':
+            status = 'unavailable'
+        elif database['status'] != 'ok' or jobs['status'] != 'ok':
+            status = 'degraded'
+        else:
+            status = 'ready'
+
+        return {
+            'status': status,
+            'checked_at': datetime.utcnow().isoformat() + 'Z',
+            'checks': {
+                'database': database,
+                'jobs': jobs,
+                'caches': {
+                    name: {'hit_ratio': stats['hit_ratio'], 'size': stats['size'], 'maxsize': stats['maxsize']}
+                    for name, stats in cache_stats().items() if name != readiness.name
+                },
+                'scheduler': {key: value for key, value in scheduler.status().items() if key != 'pid'},
+                'logging': structured_log.stats()
+            },
+            'process': {
+                'pid': os.getpid(),
+                'uptime_seconds': round(time.time() - STARTED_AT, 1),
+                'rss_bytes': rss_bytes(),
+                'threads': threading.active_count()
+            }
+        }
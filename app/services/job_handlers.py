@@ -0,0 +1,32 @@
+from app import db
+from app.models.lab import Reservation, ReservationStatus
+from app.models.notification import NotificationKind
+from app.services.job_queue import job_handler
+from app.services.notification_service import NotificationService
+
+@job_handler('reservation.decided')
+def notify_reservation_decided(payload):
+    """Tell the instructor their reservation was approved or rejected"""
+    reservation = db.session.get(Reservation, payload['reservation_id'])
+    if reservation is None:
+        return
+
+    approved = payload['status'] == ReservationStatus.APPROVED
+    if approved:
+        kind = NotificationKind.RESERVATION_APPROVED
+        title = f'{reservation.course_code} reservation approved'
+        message = f'Your reservation for {reservation.course_code} on {reservation.start_time.isoformat()} was approved.'
+    else:
+        kind = NotificationKind.RESERVATION_REJECTED
+        title = f'{reservation.course_code} reservation rejected'
+        message = f'Your reservation for {reservation.course_code} on {reservation.start_time.isoformat()} was rejected.'
+        if reservation.rejection_reason:
+            message += f' Reason: {reservation.rejection_reason}'
+
+    NotificationService.insert_new(kind, [{
+        'user_id': reservation.instructor_id,
+        'title': title,
+        'message': message,
+        'ref_type': 'reservation',
+        'ref_id': reservation.id
+    }])
@@ -0,0 +1,253 @@
+import json
+import logging
+import os
+import random
+import socket
+import threading
+import traceback
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from flask import current_app
+from app import db
+from app.models.job import Job, JobStatus
+from sqlalchemy import func, or_, and_, update, select
+from datetime import datetime, timedelta
+
+logger = logging.getLogger(__name__)
+
+# Job name -> callable(payload dict); filled by @job_handler
+HANDLERS = {}
+
+def job_handler(name):
+    """Register a function as the handler for jobs called name.
+
+    Handlers may run more than once for the same job (retries, expired
+    leases), so they must be idempotent.
+    """
+    def decorator(func):
+        HANDLERS[name] = func
+        return func
+    return decorator
+
+class JobQueue:
+    @staticmethod
+    def enqueue(name, payload=None, delay=0, max_attempts=None):
+        """Add a job to the current session without committing.
+
+        The job commits (or rolls back) together with the caller's own
+        changes, so side effects are recorded if and only if the change that
+        caused them was (transactional outbox).
+        """
+        job = Job(
+            name=name,
+            payload=json.dumps(payload or {}),
+            status=JobStatus.QUEUED,
+            max_attempts=max_attempts or current_app.config['JOB_MAX_ATTEMPTS'],
+            run_at=datetime.utcnow() + timedelta(seconds=delay)
+        )
+        db.session.add(job)
+        return job
+
+    @staticmethod
+    def claim(worker_id, limit, now=None):
+        """Lease up to limit runnable jobs to worker_id; returns (job id, lease) pairs.
+
+        Runnable means queued and due, or running with an expired lease (its
+        worker died or hung past JOB_VISIBILITY_TIMEOUT). The single UPDATE
+        is atomic, so two workers never lease the same job. The lease token
+        is unique to this claim; execute() only records an outcome while the
+        job still carries it.
+        """
+        now = now or datetime.utcnow()
+        token = f'{worker_id}:{uuid.uuid4().hex[:8]}'
+        lease = now + timedelta(seconds=current_app.config['JOB_VISIBILITY_TIMEOUT'])
+
+        runnable = select(Job.id).where(or_(
+            and_(Job.status == JobStatus.QUEUED, Job.run_at <= now),
+            and_(Job.status == JobStatus.RUNNING, Job.locked_until < now)
+        )).order_by(Job.run_at, Job.id).limit(limit)
+
+        db.session.execute(
+            update(Job).where(Job.id.in_(runnable.scalar_subquery())).values(
+                status=JobStatus.RUNNING,
+                locked_by=token,
+                locked_until=lease,
+                attempts=Job.attempts + 1,
+                started_at=now
+            ).execution_options(synchronize_session=False)
+        )
+        db.session.commit()
+
+        return [(row[0], token) for row in db.session.query(Job.id).filter(
+            Job.locked_by == token, Job.status == JobStatus.RUNNING
+        )]
+
+    @staticmethod
+    def backoff(attempts):
+        """Exponential backoff with jitter: base * 2^(attempts-1), capped"""
+        config = current_app.config
+        delay = min(config['JOB_BACKOFF_BASE'] * (2 ** max(attempts - 1, 0)), config['JOB_BACKOFF_MAX'])
+        return delay * random.uniform(0.8, 1.2)
+
+    @staticmethod
+    def _record(job_id, lease, **values):
+        """Update a job only while it still holds lease; returns whether it did"""
+        result = db.session.execute(
+            update(Job).where(
+                Job.id == job_id, Job.locked_by == lease, Job.status == JobStatus.RUNNING
+            ).values(locked_by=None, locked_until=None, **values).execution_options(synchronize_session=False)
+        )
+        return result.rowcount == 1
+
+    @staticmethod
+    def execute(job_id, lease):
+        """Run one leased job and record the outcome.
+
+        If the lease expired and another worker re-claimed the job meanwhile,
+        this run records nothing: a successful run's writes are rolled back
+        and a failure leaves the job to the worker that holds it now.
+        """
+        job = db.session.get(Job, job_id)
+        if job is None or job.status != JobStatus.RUNNING or job.locked_by != lease:
+            return
+
+        handler = HANDLERS.get(job.name)
+        try:
+            if handler is None:
+                raise LookupError(f'No handler registered for job {job.name!r}')
+            handler(json.loads(job.payload or '{}'))
+        except Exception:
+            error = traceback.format_exc(limit=5)[-2000:]
+            db.session.rollback()
+            job = db.session.get(Job, job_id)
+            name, attempts = job.name, job.attempts
+            if attempts >= job.max_attempts or handler is None:
+                recorded = JobQueue._record(job_id, lease, status=JobStatus.DEAD, finished_at=datetime.utcnow(), last_error=error)
+                db.session.commit()
+                if recorded:
+                    logger.error('Job %s (%s) is dead after %s attempt(s)', job_id, name, attempts)
+            else:
+                run_at = datetime.utcnow() + timedelta(seconds=JobQueue.backoff(attempts))
+                recorded = JobQueue._record(job_id, lease, status=JobStatus.QUEUED, run_at=run_at, last_error=error)
+                db.session.commit()
+                if recorded:
+                    logger.warning('Job %s (%s) failed, retry %s at %s', job_id, name, attempts, run_at)
+            if not recorded:
+                logger.warning('Job %s (%s) failed after its lease was lost; outcome not recorded', job_id, name)
+            return
+
+        # The handler's writes and the completion commit together, or not at all
+        name = job.name
+        if JobQueue._record(job_id, lease, status=JobStatus.DONE, finished_at=datetime.utcnow(), last_error=None):
+            db.session.commit()
+        else:
+            db.session.rollback()
+            logger.warning('Job %s (%s) lost its lease while running; its writes were rolled back', job_id, name)
+
+    @staticmethod
+    def retry_dead(job_ids=None):
+        """Requeue dead jobs (all of them, or the given ids) with a fresh attempt budget"""
+        query = Job.query.filter(Job.status == JobStatus.DEAD)
+        if job_ids:
+            query = query.filter(Job.id.in_(job_ids))
+        count = query.update({
+            'status': JobStatus.QUEUED,
+            'attempts': 0,
+            'run_at': datetime.utcnow(),
+            'finished_at': None
+        }, synchronize_session=False)
+        db.session.commit()
+        return count
+
+    @staticmethod
+    def prune(older_than_days=None):
+        """Delete finished jobs older than JOB_RETENTION_DAYS"""
+        days = older_than_days or current_app.config['JOB_RETENTION_DAYS']
+        cutoff = datetime.utcnow() - timedelta(days=days)
+        count = Job.query.filter(
+            Job.status == JobStatus.DONE,
+            Job.finished_at < cutoff
+        ).delete(synchronize_session=False)
+        db.session.commit()
+        return count
+
+    @staticmethod
+    def metrics(now=None):
+        """Queue depth per status, lag of the oldest runnable job, and recent throughput"""
+        now = now or datetime.utcnow()
+        depth = dict(db.session.query(Job.status, func.count(Job.id)).group_by(Job.status).all())
+
+        oldest_ready = db.session.query(func.min(Job.run_at)).filter(
+            Job.status == JobStatus.QUEUED, Job.run_at <= now
+        ).scalar()
+        expired_leases = db.session.query(func.count(Job.id)).filter(
+            Job.status == JobStatus.RUNNING, Job.locked_until < now
+        ).scalar()
+        finished_last_hour = db.session.query(func.count(Job.id)).filter(
+            Job.status == JobStatus.DONE, Job.finished_at >= now - timedelta(hours=1)
+        ).scalar()
+
+        return {
+            'depth': {status: depth.get(status, 0) for status in (JobStatus.QUEUED, JobStatus.RUNNING, JobStatus.DONE, JobStatus.DEAD)},
+            'lag_seconds': round((now - oldest_ready).total_seconds(), 3) if oldest_ready else 0.0,
+            'expired_leases': expired_leases,
+            'done_last_hour': finished_last_hour,
+            'handlers': sorted(HANDLERS)
+        }
+
+class Worker:
+    """Polls the queue and runs jobs on a thread pool until stopped"""
+
+    def __init__(self, app, threads=None, poll_interval=None):
+        self.app = app
+        self.threads = threads or app.config['JOB_WORKER_THREADS']
+        self.poll_interval = poll_interval or app.config['JOB_POLL_INTERVAL']
+        self.worker_id = f'{socket.gethostname()}:{os.getpid()}'
+        self.stopping = threading.Event()
+        self.in_flight = 0
+        self._lock = threading.Lock()
+
+    def _run_job(self, job_id, lease):
+        try:
+            with self.app.app_context():
+                try:
+                    JobQueue.execute(job_id, lease)
+                finally:
+                    db.session.remove()
+        except Exception:
+            logger.exception('Worker failed while running job %s', job_id)
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+    def run(self, once=False):
+        """Process jobs until stop() (or, with once=True, until the queue is drained)"""
+        with ThreadPoolExecutor(max_workers=self.threads, thread_name_prefix='job') as pool:
+            while not self.stopping.is_set():
+                with self._lock:
+                    free = self.threads - self.in_flight
+
+                job_ids = []
+                if free > 0:
+                    with self.app.app_context():
+                        try:
+                            job_ids = JobQueue.claim(self.worker_id, free)
+                        finally:
+                            db.session.remove()
+
+                for job_id, lease in job_ids:
+                    with self._lock:
+                        self.in_flight += 1
+                    pool.submit(self._run_job, job_id, lease)
+
+                if once and not job_ids:
+                    with self._lock:
+                        idle = self.in_flight == 0
+                    if idle:
+                        break
+
+                if not job_ids:
+                    self.stopping.wait(self.poll_interval)
+
+    def stop(self):
+        self.stopping.set()
@@ -0,0 +1,177 @@
+from flask import current_app
+from app import db
+from app.models.lab import Reservation, ReservationStatus
+from app.models.notification import Notification, NotificationKind, SchedulerState
+from app.models.task import Task, TaskStatus
+from app.utils.pagination import encode_cursor, decode_cursor
+from sqlalchemy import and_, or_, func, insert
+from sqlalchemy.orm import joinedload
+from datetime import datetime, timedelta
+import uuid
+
+class NotificationService:
+    @staticmethod
+    def _watermark(name, default):
+        state = db.session.get(SchedulerState, name)
+        return state.watermark if state else default
+
+    @staticmethod
+    def _set_watermark(name, value):
+        state = db.session.get(SchedulerState, name)
+        if state:
+            state.watermark = value
+        else:
+            db.session.add(SchedulerState(name=name, watermark=value))
+
+    @staticmethod
+    def insert_new(kind, rows):
+        """Bulk insert notifications, skipping events that were already notified.
+
+        Does not commit, so callers can make it part of a larger transaction.
+        """
+        if not rows:
+            return 0
+        existing = {
+            (user_id, ref_id) for user_id, ref_id in db.session.query(Notification.user_id, Notification.ref_id).filter(
+                Notification.kind == kind,
+                Notification.ref_id.in_([row['ref_id'] for row in rows])
+            )
+        }
+        now = datetime.utcnow()
+        fresh = [
+            {'id': str(uuid.uuid4()), 'kind': kind, 'created_at': now, **row}
+            for row in rows if (row['user_id'], row['ref_id']) not in existing
+        ]
+        if fresh:
+            db.session.execute(insert(Notification), fresh)
+        return len(fresh)
+
+    @staticmethod
+    def scan_overdue_tasks(now=None):
+        """Notify owners of tasks that are overdue and were not notified yet.
+
+        Reads the tasks that fell due since the last scan, plus the overdue
+        tasks written since then: created or edited with a past due_date, or
+        reopened after they fell due. Both slices come from an index, so the
+        cost follows the number of such tasks, not the table size; tasks that
+        were already notified are skipped.
+        """
+        now = now or datetime.utcnow()
+        interval = timedelta(seconds=current_app.config['SCHEDULER_SCAN_INTERVAL'])
+        since = NotificationService._watermark(NotificationKind.TASK_OVERDUE, now - interval)
+
+        def overdue(*window):
+            return db.session.query(Task.id, Task.user_id, Task.title, Task.due_date).filter(
+                Task.due_date <= now,
+                Task.status.notin_([TaskStatus.COMPLETED, TaskStatus.CANCELLED]),
+                *window
+            )
+
+        # Two slices instead of an OR, so each one is read from its own index.
+        # updated_at is stamped before its transaction commits, so the write
+        # slice reaches back one interval to catch rows committed late
+        tasks = overdue(Task.due_date > since).union(
+            overdue(Task.updated_at > since - interval, Task.updated_at <= now)
+        ).all()
+
+        created = NotificationService.insert_new(NotificationKind.TASK_OVERDUE, [
+            {
+                'user_id': task.user_id,
+                'title': f'Task overdue: {task.title}',
+                'message': f'"{task.title}" was due {task.due_date.isoformat()}.',
+                'ref_type': 'task',
+                'ref_id': task.id
+            }
+            for task in tasks
+        ])
+
+        # Watermark and notifications commit together, so a scan is never lost or repeated
+        NotificationService._set_watermark(NotificationKind.TASK_OVERDUE, now)
+        db.session.commit()
+        return created
+
+    @staticmethod
+    def scan_upcoming_sessions(now=None):
+        """Remind instructors of approved sessions starting within the lead time.
+
+        Scans (now, now + lead] on the (status, start_time) index every run
+        instead of using a watermark, so sessions approved after their window
+        opened are still picked up; already-notified sessions are skipped.
+        """
+        now = now or datetime.utcnow()
+        lead = timedelta(minutes=current_app.config['SESSION_REMINDER_LEAD_MINUTES'])
+
+        sessions = Reservation.query.options(
+            joinedload(Reservation.lab)
+        ).filter(
+            Reservation.status == ReservationStatus.APPROVED,
+            Reservation.start_time > now,
+            Reservation.start_time <= now + lead
+        ).all()
+
+        created = NotificationService.insert_new(NotificationKind.SESSION_STARTING, [
+            {
+                'user_id': session.instructor_id,
+                'title': f'{session.course_code} starts soon',
+                'message': (
+                    f'{session.course_code} - {session.course_name} (Section {session.section}) '
+                    f'starts at {session.start_time.isoformat()} in {session.lab.name if session.lab else "the lab"}.'
+                ),
+                'ref_type': 'reservation',
+                'ref_id': session.id
+            }
+            for session in sessions
+        ])
+        db.session.commit()
+        return created
+
+    @staticmethod
+    def run_scans():
+        """Scheduler entry point"""
+        return {
+            'task_overdue': NotificationService.scan_overdue_tasks(),
+            'session_starting': NotificationService.scan_upcoming_sessions()
+        }
+
+    @staticmethod
+    def get_page(user_id, unread_only=False, limit=20, cursor=None):
+        """Newest-first keyset page of a user's notifications"""
+        query = Notification.query.filter(Notification.user_id == user_id)
+        if unread_only:
+            query = query.filter(Notification.read_at.is_(None))
+
+        if cursor:
+            created_at, notification_id = decode_cursor(cursor)
+            query = query.filter(or_(
+                Notification.created_at < created_at,
+                and_(Notification.created_at == created_at, Notification.id < notification_id)
+            ))
+
+        rows = query.order_by(Notification.created_at.desc(), Notification.id.desc()).limit(limit + 1).all()
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(rows[-1].created_at, rows[-1].id)
+
+        return rows, next_cursor
+
+    @staticmethod
+    def unread_count(user_id):
+        return db.session.query(func.count(Notification.id)).filter(
+            Notification.user_id == user_id,
+            Notification.read_at.is_(None)
+        ).scalar()
+
+    @staticmethod
+    def mark_read(user_id, ids=None):
+        """Mark the given (or all) unread notifications read; returns the count"""
+        query = Notification.query.filter(
+            Notification.user_id == user_id,
+            Notification.read_at.is_(None)
+        )
+        if ids is not None:
+            query = query.filter(Notification.id.in_(ids))
+        updated = query.update({'read_at': datetime.utcnow()}, synchronize_session=False)
+        db.session.commit()
+        return updated
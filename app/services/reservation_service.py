@@ -0,0 +1,517 @@
+from flask import current_app
+from app import db
+from app.models.lab import Reservation, ReservationRecurrence, ReservationStatus
+from app.services.job_queue import JobQueue
+from app.utils.intervals import overlapping_pairs, cross_overlapping_pairs, conflict_components
+from app.utils.recurrence import weekly_starts, parse_weekdays, parse_dates, nth_start
+from sqlalchemy import or_, and_, insert, update
+from sqlalchemy.orm import load_only, joinedload, contains_eager
+from collections import defaultdict
+from datetime import datetime, timedelta
+import uuid
+
+DECISIONS = {
+    'approve': ReservationStatus.APPROVED,
+    'reject': ReservationStatus.REJECTED
+}
+
+# Statuses that hold a lab slot for conflict checks
+ACTIVE_STATUSES = (ReservationStatus.PENDING, ReservationStatus.APPROVED)
+
+class Occurrence:
+    """One occurrence of a recurring series, expanded from its rule.
+
+    Reads like the series' first reservation except for its times and id, so
+    it serializes through the Reservation encoders unchanged.
+    """
+    def __init__(self, series, start_time):
+        self.series = series
+        self.start_time = start_time
+        self.end_time = start_time + timedelta(minutes=series.duration_minutes)
+        self.id = f'{series.id}:{start_time:%Y%m%dT%H%M}'
+        self.series_id = series.id
+
+    def __getattr__(self, name):
+        return getattr(self.series, name)
+
+class ReservationService:
+    @staticmethod
+    def series_starts(reservation, window_start=None, window_end=None):
+        """Start times of a reservation's occurrences (just its own for one-off bookings)"""
+        rule = reservation.recurrence
+        if rule is None:
+            return [reservation.start_time]
+        return list(weekly_starts(
+            reservation.start_time,
+            parse_weekdays(rule.weekdays),
+            rule.interval,
+            until=rule.until,
+            exdates=parse_dates(rule.exdates),
+            window_start=window_start,
+            window_end=window_end,
+            duration=timedelta(minutes=reservation.duration_minutes)
+        ))
+
+    @staticmethod
+    def series_in_window(window_start, window_end, statuses, lab_ids=None):
+        """Recurring series with at least one possible occurrence in the window"""
+        query = Reservation.query.join(Reservation.recurrence).options(
+            contains_eager(Reservation.recurrence),
+            joinedload(Reservation.lab),
+            joinedload(Reservation.instructor)
+        ).filter(
+            Reservation.status.in_(statuses),
+            ReservationRecurrence.series_end > window_start
+        )
+        if window_end is not None:
+            query = query.filter(Reservation.start_time < window_end)
+        if lab_ids is not None:
+            query = query.filter(Reservation.lab_id.in_(lab_ids))
+        return query.all()
+
+    @staticmethod
+    def expand(series_list, window_start, window_end):
+        """Lazily expanded occurrences of the given series inside the window.
+
+        The series' first reservation and any materialized occurrences are
+        real rows, so they are skipped here to avoid counting them twice.
+        """
+        if not series_list:
+            return []
+
+        materialized = set(db.session.query(Reservation.series_id, Reservation.start_time).filter(
+            Reservation.series_id.in_([series.id for series in series_list]),
+            Reservation.end_time > window_start,
+            *([Reservation.start_time < window_end] if window_end is not None else [])
+        ))
+
+        occurrences = []
+        for series in series_list:
+            for start in ReservationService.series_starts(series, window_start, window_end):
+                if start != series.start_time and (series.id, start) not in materialized:
+                    occurrences.append(Occurrence(series, start))
+        return occurrences
+
+    @staticmethod
+    def occurrences_in_window(window_start, window_end, statuses=(ReservationStatus.APPROVED,), lab_id=None):
+        series_list = ReservationService.series_in_window(
+            window_start, window_end, statuses, [lab_id] if lab_id else None
+        )
+        return ReservationService.expand(series_list, window_start, window_end)
+
+    @staticmethod
+    def max_duration():
+        return timedelta(hours=current_app.config['RESERVATION_MAX_DURATION_HOURS'])
+
+    @staticmethod
+    def check_times(start_time, end_time):
+        """Raise ValueError unless the booking ends after it starts and within the maximum duration"""
+        if end_time <= start_time:
+            raise ValueError('end_time must be after start_time')
+        if end_time - start_time > ReservationService.max_duration():
+            raise ValueError(f"A reservation may last at most {current_app.config['RESERVATION_MAX_DURATION_HOURS']} hours")
+
+    @staticmethod
+    def booked(windows, statuses=(ReservationStatus.APPROVED,)):
+        """Bookings overlapping any of the per-lab (start, end) windows.
+
+        windows maps lab_id -> (earliest start, latest end). Stored rows come
+        from one query. Because no booking lasts longer than max_duration(),
+        an overlapping row starts within (earliest start - max duration,
+        latest end), so each lab reads one bounded range of the (lab_id,
+        start_time) index instead of its whole history. Recurring series in
+        those labs are expanded inside the same windows. Returns Reservation
+        rows and Occurrence objects.
+        """
+        if not windows:
+            return []
+        max_duration = ReservationService.max_duration()
+        rows = Reservation.query.options(
+            load_only(Reservation.id, Reservation.lab_id, Reservation.start_time, Reservation.end_time,
+                      Reservation.course_code, Reservation.section, Reservation.series_id)
+        ).filter(
+            Reservation.status.in_(statuses),
+            or_(*[
+                and_(
+                    Reservation.lab_id == lab_id,
+                    Reservation.start_time > earliest_start - max_duration,
+                    Reservation.start_time < latest_end,
+                    Reservation.end_time > earliest_start
+                )
+                for lab_id, (earliest_start, latest_end) in windows.items()
+            ])
+        ).all()
+
+        earliest = min(window[0] for window in windows.values())
+        latest = max(window[1] for window in windows.values())
+        for occurrence in ReservationService.expand(
+            ReservationService.series_in_window(earliest, latest, statuses, list(windows)), earliest, latest
+        ):
+            earliest_start, latest_end = windows[occurrence.lab_id]
+            if occurrence.start_time < latest_end and occurrence.end_time > earliest_start:
+                rows.append(occurrence)
+        return rows
+
+    @staticmethod
+    def approved_overlapping(windows):
+        """Approved bookings overlapping any of the per-lab windows"""
+        return ReservationService.booked(windows, (ReservationStatus.APPROVED,))
+
+    @staticmethod
+    def find_conflicts(lab_id, intervals, statuses=ACTIVE_STATUSES, exclude_id=None):
+        """Existing bookings that overlap any of the candidate (start, end) intervals.
+
+        All candidates are checked in one sort-and-sweep against the bookings
+        of their combined span, so a whole series costs one pass instead of
+        one query per occurrence. Returns {candidate start: [bookings]}.
+        """
+        if not intervals:
+            return {}
+        window = (min(start for start, _ in intervals), max(end for _, end in intervals))
+        bookings = {
+            booking.id: booking for booking in ReservationService.booked({lab_id: window}, statuses)
+            if exclude_id is None or exclude_id not in (booking.id, booking.series_id)
+        }
+
+        sweep = [(start, end, ('new', start)) for start, end in intervals]
+        sweep += [(booking.start_time, booking.end_time, ('booked', booking.id)) for booking in bookings.values()]
+
+        conflicts = defaultdict(list)
+        for (kind_a, key_a), (kind_b, key_b) in overlapping_pairs(sweep):
+            if kind_a != kind_b:
+                new_start, booking_id = (key_a, key_b) if kind_a == 'new' else (key_b, key_a)
+                conflicts[new_start].append(bookings[booking_id])
+        return conflicts
+
+    @staticmethod
+    def build_recurrence(start_time, end_time, rule):
+        """Validate a recurrence payload and return (ReservationRecurrence, occurrence intervals).
+
+        rule is {"weekdays": ["MO", "WE"] or [0, 2], "interval": 1, "until":
+        ISO datetime or "count": n, "exdates": [ISO dates]}. COUNT is turned
+        into UNTIL here so every stored series is bounded.
+        """
+        if not isinstance(rule, dict):
+            raise ValueError('recurrence must be an object')
+
+        weekdays = parse_weekdays(rule.get('weekdays') or [start_time.weekday()])
+        interval = rule.get('interval', 1)
+        if not isinstance(interval, int) or isinstance(interval, bool) or not 1 <= interval <= 52:
+            raise ValueError('recurrence interval must be an integer between 1 and 52')
+        exdates = parse_dates(rule.get('exdates'))
+
+        max_occurrences = current_app.config['RECURRENCE_MAX_OCCURRENCES']
+        if rule.get('until'):
+            until = datetime.fromisoformat(str(rule['until']).replace('Z', '+00:00'))
+            if until.tzinfo is not None:
+                until = until.replace(tzinfo=None)
+            if len(str(rule['until'])) <= 10:
+                until = until.replace(hour=23, minute=59, second=59)
+        elif rule.get('count'):
+            count = rule['count']
+            if not isinstance(count, int) or isinstance(count, bool) or not 1 <= count <= max_occurrences:
+                raise ValueError(f'recurrence count must be between 1 and {max_occurrences}')
+            until = nth_start(start_time, weekdays, interval, count)
+        else:
+            raise ValueError('recurrence needs until or count')
+
+        if until < start_time:
+            raise ValueError('recurrence until must not be before start_time')
+
+        duration = end_time - start_time
+        starts = []
+        for start in weekly_starts(start_time, weekdays, interval, until=until, exdates=exdates):
+            starts.append(start)
+            if len(starts) > max_occurrences:
+                raise ValueError(f'A series may have at most {max_occurrences} occurrences')
+        if start_time not in starts:
+            raise ValueError("start_time must fall on one of the recurrence weekdays and not on an exception date")
+
+        recurrence = ReservationRecurrence(
+            weekdays=','.join(str(day) for day in weekdays),
+            interval=interval,
+            until=until,
+            exdates=','.join(sorted(day.isoformat() for day in exdates)),
+            series_end=starts[-1] + duration
+        )
+        return recurrence, [(start, start + duration) for start in starts]
+
+    @staticmethod
+    def materialize(window_start, window_end):
+        """Store the approved series occurrences of a window as real reservation rows.
+
+        Materialized rows point back at their series through series_id, so
+        expansion skips them and row-based features (reminders, stats) see
+        them. Safe to repeat: already materialized occurrences are skipped.
+        Returns the number of rows inserted.
+        """
+        now = datetime.utcnow()
+        rows = [
+            {
+                'id': str(uuid.uuid4()),
+                'series_id': occurrence.series_id,
+                'instructor_id': occurrence.instructor_id,
+                'lab_id': occurrence.lab_id,
+                'course_code': occurrence.course_code,
+                'course_name': occurrence.course_name,
+                'section': occurrence.section,
+                'student_count': occurrence.student_count,
+                'start_time': occurrence.start_time,
+                'end_time': occurrence.end_time,
+                'duration_minutes': occurrence.duration_minutes,
+                'status': ReservationStatus.APPROVED,
+                'purpose': occurrence.purpose,
+                'admin_notes': occurrence.admin_notes,
+                'created_at': now,
+                'updated_at': now
+            }
+            for occurrence in ReservationService.occurrences_in_window(window_start, window_end)
+        ]
+        if rows:
+            db.session.execute(insert(Reservation), rows)
+        db.session.commit()
+        return len(rows)
+
+    @staticmethod
+    def sync_series_status(series_ids, status):
+        """Give the materialized occurrences of these series their new status.
+
+        Materialized rows copy the series' status when they are created; once
+        the series is decided again they must follow it, or they would keep
+        blocking conflict checks and counting in stats. Runs in the caller's
+        transaction. Returns the number of rows changed.
+        """
+        if not series_ids:
+            return 0
+        return Reservation.query.filter(
+            Reservation.series_id.in_(list(series_ids)),
+            Reservation.status != status
+        ).update({'status': status, 'updated_at': datetime.utcnow()}, synchronize_session=False)
+
+    @staticmethod
+    def materialize_current_week():
+        """Scheduler entry point: materialize this week's (Monday to Monday) occurrences"""
+        today = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+        monday = today - timedelta(days=today.weekday())
+        return ReservationService.materialize(monday, monday + timedelta(days=7))
+
+    @staticmethod
+    def pending_clusters(lab_id=None, since=None, until=None, include_singletons=False):
+        """Group pending reservations into per-lab conflict clusters.
+
+        A cluster is a connected component of the overlap graph: every member
+        overlaps at least one other, directly or through a chain, so approving
+        any one constrains the rest. Each cluster also lists the approved
+        bookings it collides with. Members that conflict with nothing are left
+        out unless include_singletons is set.
+        """
+        query = Reservation.query.options(
+            joinedload(Reservation.lab), joinedload(Reservation.instructor), joinedload(Reservation.recurrence)
+        ).filter(Reservation.status == ReservationStatus.PENDING)
+        if lab_id:
+            query = query.filter(Reservation.lab_id == lab_id)
+        if since:
+            query = query.filter(Reservation.end_time > since)
+        if until:
+            query = query.filter(Reservation.start_time < until)
+        pending = query.all()
+
+        # Pending series take part through their occurrences in the range;
+        # every occurrence is keyed by the series' first reservation
+        series_list = ReservationService.series_in_window(
+            since or datetime.min, until, (ReservationStatus.PENDING,), [lab_id] if lab_id else None
+        )
+        occurrences = ReservationService.expand(series_list, since or datetime.min, until)
+
+        reservations = {r.id: r for r in pending}
+        reservations.update({series.id: series for series in series_list})
+        by_lab = defaultdict(list)
+        for item in pending + occurrences:
+            key = item.series_id if isinstance(item, Occurrence) else item.id
+            by_lab[item.lab_id].append((item.start_time, item.end_time, key))
+
+        windows = {
+            lab: (min(start for start, _, _ in members), max(end for _, end, _ in members))
+            for lab, members in by_lab.items()
+        }
+        approved_by_lab = defaultdict(list)
+        for booking in ReservationService.approved_overlapping(windows):
+            approved_by_lab[booking.lab_id].append(booking)
+
+        clusters = []
+        for lab, members in by_lab.items():
+            approved = {b.id: b for b in approved_by_lab[lab]}
+
+            # Only pending-vs-approved pairs: a dense pending cluster must not cost O(n^2)
+            collisions = defaultdict(set)
+            bookings = [(b.start_time, b.end_time, b.id) for b in approved.values()]
+            for pending_id, booking_id in cross_overlapping_pairs(members, bookings):
+                collisions[pending_id].add(booking_id)
+
+            for start, end, ids in ReservationService._merge_shared(conflict_components(members)):
+                collides_with = sorted(set().union(*(collisions[i] for i in ids)), key=lambda i: approved[i].start_time)
+                if len(ids) == 1 and not collides_with and not include_singletons:
+                    continue
+                first = reservations[ids[0]]
+                clusters.append({
+                    'lab_id': lab,
+                    'lab_name': first.lab.name if first.lab else 'Unknown',
+                    'start_time': start.isoformat(),
+                    'end_time': end.isoformat(),
+                    'members': Reservation.serialize_many([reservations[i] for i in ids]),
+                    'approved_conflicts': Reservation.serialize_many(
+                        [approved[i] for i in collides_with],
+                        ['id', 'course_code', 'section', 'start_time', 'end_time', 'series_id']
+                    )
+                })
+
+        clusters.sort(key=lambda cluster: (cluster['start_time'], cluster['lab_name']))
+        return clusters
+
+    @staticmethod
+    def _merge_shared(components):
+        """Merge components that share a key (a series clashing in several weeks)"""
+        parent = list(range(len(components)))
+
+        def find(i):
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        owner = {}
+        for index, (_, _, keys) in enumerate(components):
+            for key in keys:
+                if key in owner:
+                    parent[find(index)] = find(owner[key])
+                else:
+                    owner[key] = index
+
+        merged = {}
+        for index, (start, end, keys) in enumerate(components):
+            root = find(index)
+            if root in merged:
+                first, last, seen = merged[root]
+                merged[root] = (min(first, start), max(last, end), seen + [key for key in keys if key not in seen])
+            else:
+                unique = []
+                for key in keys:
+                    if key not in unique:
+                        unique.append(key)
+                merged[root] = (start, end, unique)
+        return list(merged.values())
+
+    @staticmethod
+    def bulk_decide(decisions):
+        """Approve/reject many pending reservations in one transaction.
+
+        Approvals are checked against existing approved bookings and against
+        each other in one sort-and-sweep per lab; an approval that overlaps
+        either fails (both sides, for clashes inside the batch) so the admin
+        decides explicitly. Returns one result per decision, in order. The
+        caller commits.
+        """
+        results = [None] * len(decisions)
+
+        def fail(index, item_id, decision, message, conflicts=None):
+            results[index] = {'index': index, 'id': item_id, 'decision': decision, 'success': False, 'message': message}
+            if conflicts:
+                results[index]['conflicts'] = sorted(conflicts)
+
+        ids = [item['id'] for item in decisions if isinstance(item, dict) and isinstance(item.get('id'), str)]
+        reservations = {
+            reservation.id: reservation
+            for reservation in Reservation.query.options(
+                load_only(Reservation.id, Reservation.lab_id, Reservation.start_time,
+                          Reservation.end_time, Reservation.duration_minutes, Reservation.status),
+                joinedload(Reservation.recurrence)
+            ).filter(Reservation.id.in_(ids))
+        } if ids else {}
+
+        accepted = []
+        seen = set()
+        for index, item in enumerate(decisions):
+            item = item if isinstance(item, dict) else {}
+            item_id, decision = item.get('id'), item.get('decision')
+
+            if decision not in DECISIONS:
+                fail(index, item_id, decision, 'decision must be approve or reject')
+                continue
+            if not isinstance(item_id, str) or item_id not in reservations:
+                fail(index, item_id, decision, 'Reservation not found')
+                continue
+            note_field = 'admin_notes' if decision == 'approve' else 'rejection_reason'
+            if not isinstance(item.get(note_field), (str, type(None))):
+                fail(index, item_id, decision, f'{note_field} must be a string')
+                continue
+            if item_id in seen:
+                fail(index, item_id, decision, 'Reservation appears more than once in this batch')
+                continue
+            seen.add(item_id)
+
+            reservation = reservations[item_id]
+            if reservation.status != ReservationStatus.PENDING:
+                fail(index, item_id, decision, f'Reservation is already {reservation.status}')
+                continue
+            accepted.append((index, item))
+
+        # Conflict sweep for approvals, per lab, over the batch plus approved
+        # bookings; a series takes part with every one of its occurrences
+        by_lab = defaultdict(list)
+        for index, item in accepted:
+            if item['decision'] != 'approve':
+                continue
+            reservation = reservations[item['id']]
+            duration = reservation.end_time - reservation.start_time
+            for start in ReservationService.series_starts(reservation):
+                by_lab[reservation.lab_id].append((start, start + duration, ('batch', reservation.id)))
+
+        windows = {
+            lab: (min(start for start, _, _ in intervals), max(end for _, end, _ in intervals))
+            for lab, intervals in by_lab.items()
+        }
+        for booking in ReservationService.approved_overlapping(windows):
+            by_lab[booking.lab_id].append((booking.start_time, booking.end_time, ('approved', booking.id)))
+
+        conflicts = defaultdict(set)
+        for intervals in by_lab.values():
+            for (kind_a, id_a), (kind_b, id_b) in overlapping_pairs(intervals):
+                if (kind_a, id_a) == (kind_b, id_b):
+                    continue
+                if kind_a == 'batch':
+                    conflicts[id_a].add(id_b)
+                if kind_b == 'batch':
+                    conflicts[id_b].add(id_a)
+
+        groups = defaultdict(list)
+        for index, item in accepted:
+            item_id, decision = item['id'], item['decision']
+            if decision == 'approve' and conflicts.get(item_id):
+                fail(index, item_id, decision, 'Time slot conflict', conflicts[item_id])
+                continue
+
+            note = item.get('admin_notes', '') if decision == 'approve' else item.get('rejection_reason', '')
+            groups[(decision, note or '')].append((index, item_id))
+
+        # One UPDATE per distinct (decision, note). The status guard keeps it safe
+        # against a concurrent single decision on the same reservation; RETURNING
+        # tells which rows it actually changed, and only those succeed
+        now = datetime.utcnow()
+        for (decision, note), items in groups.items():
+            values = {'status': DECISIONS[decision], 'updated_at': now}
+            values['admin_notes' if decision == 'approve' else 'rejection_reason'] = note
+            updated = set(db.session.scalars(
+                update(Reservation).where(
+                    Reservation.id.in_([item_id for _, item_id in items]),
+                    Reservation.status == ReservationStatus.PENDING
+                ).values(values).returning(Reservation.id).execution_options(synchronize_session=False)
+            ))
+            for index, item_id in items:
+                if item_id not in updated:
+                    fail(index, item_id, decision, 'Reservation is no longer pending')
+                    continue
+                results[index] = {'index': index, 'id': item_id, 'decision': decision, 'success': True}
+                JobQueue.enqueue('reservation.decided', {'reservation_id': item_id, 'status': DECISIONS[decision]})
+            ReservationService.sync_series_status(updated, DECISIONS[decision])
+
+        return results
@@ -0,0 +1,245 @@
+import re
+from contextlib import contextmanager
+from flask import current_app
+from app import db
+from app.models.lab import Lab, Reservation, ReservationStatus
+from app.models.task import Task
+from sqlalchemy import or_, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import joinedload
+
+# One external-content FTS5 table per searchable model. The index stores only
+# the tokens; rows are read back from the base table by rowid. Weights are the
+# bm25 column weights, in column order. Filter columns are indexed too (with
+# weight 0) so role filters become part of the MATCH and are resolved inside
+# the index instead of ranking every text match and discarding most of them.
+FTS_INDEXES = {
+    'labs': {
+        'table': 'labs_fts',
+        'columns': ('name', 'location', 'equipment', 'description'),
+        'weights': (10.0, 4.0, 2.0, 1.0),
+        'filters': ()
+    },
+    'reservations': {
+        'table': 'reservations_fts',
+        'columns': ('course_code', 'course_name', 'section', 'purpose'),
+        'weights': (10.0, 5.0, 2.0, 1.0),
+        'filters': ('instructor_id', 'status')
+    },
+    'tasks': {
+        'table': 'tasks_fts',
+        'columns': ('title', 'description'),
+        'weights': (5.0, 1.0),
+        'filters': ('user_id',)
+    }
+}
+
+MAX_QUERY_TOKENS = 8
+_TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+def _trigger_statements(source, table, columns):
+    cols = ', '.join(columns)
+    new_values = ', '.join(f'new.{c}' for c in columns)
+    old_values = ', '.join(f'old.{c}' for c in columns)
+    return [
+        f"CREATE TRIGGER {table}_ai AFTER INSERT ON {source} BEGIN "
+        f"INSERT INTO {table}(rowid, {cols}) VALUES (new.rowid, {new_values}); END",
+        f"CREATE TRIGGER {table}_ad AFTER DELETE ON {source} BEGIN "
+        f"INSERT INTO {table}({table}, rowid, {cols}) VALUES('delete', old.rowid, {old_values}); END",
+        f"CREATE TRIGGER {table}_au AFTER UPDATE OF {cols} ON {source} BEGIN "
+        f"INSERT INTO {table}({table}, rowid, {cols}) VALUES('delete', old.rowid, {old_values}); "
+        f"INSERT INTO {table}(rowid, {cols}) VALUES (new.rowid, {new_values}); END"
+    ]
+
+def _install_statements(source, table, columns, weights):
+    cols = ', '.join(columns)
+    return [
+        f"CREATE VIRTUAL TABLE {table} USING fts5("
+        f"{cols}, content='{source}', content_rowid='rowid', "
+        f"tokenize='unicode61 remove_diacritics 2', prefix='2 3')",
+        f"INSERT INTO {table}({table}, rank) VALUES('rank', 'bm25({', '.join(map(str, weights))})')",
+        *_trigger_statements(source, table, columns),
+        f"INSERT INTO {table}({table}) VALUES('rebuild')"
+    ]
+
+def _phrase(value):
+    return '"' + str(value).replace('"', '""') + '"'
+
+class SearchService:
+    TYPES = ('labs', 'reservations', 'tasks')
+    MODELS = {'labs': Lab, 'reservations': Reservation, 'tasks': Task}
+
+    @staticmethod
+    def install():
+        """Create missing FTS5 tables and sync triggers (SQLite only).
+
+        Returns True when full-text search is available; otherwise searches
+        fall back to LIKE filters. Newly created indexes are filled from the
+        existing rows.
+        """
+        if db.engine.dialect.name != 'sqlite':
+            current_app.extensions['search_fts5'] = False
+            return False
+
+        existing = {
+            row[0] for row in db.session.execute(
+                text("SELECT name FROM sqlite_master WHERE type = 'table' AND name LIKE '%_fts'")
+            )
+        }
+        try:
+            for source, index in FTS_INDEXES.items():
+                if index['table'] in existing:
+                    continue
+                columns = index['columns'] + index['filters']
+                weights = index['weights'] + (0.0,) * len(index['filters'])
+                for statement in _install_statements(source, index['table'], columns, weights):
+                    db.session.execute(text(statement))
+            db.session.commit()
+        except OperationalError:
+            # SQLite built without FTS5
+            db.session.rollback()
+            current_app.extensions['search_fts5'] = False
+            return False
+
+        current_app.extensions['search_fts5'] = True
+        return True
+
+    @staticmethod
+    def rebuild():
+        """Rebuild every index from its base table.
+
+        Needed after VACUUM, which may renumber the implicit rowids the
+        indexes point at, or after bulk loads that bypassed the triggers.
+        """
+        for index in FTS_INDEXES.values():
+            table = index['table']
+            db.session.execute(text(f"INSERT INTO {table}({table}) VALUES('rebuild')"))
+            db.session.execute(text(f"INSERT INTO {table}({table}) VALUES('optimize')"))
+        db.session.commit()
+
+    @staticmethod
+    @contextmanager
+    def bulk_load(*sources):
+        """Suspend index maintenance on the given base tables during a bulk insert.
+
+        The sync triggers are dropped inside the caller's transaction and
+        recreated afterwards, followed by one rebuild per index, which is far
+        cheaper than a trigger firing for every inserted row. Does nothing
+        when full-text search is unavailable.
+        """
+        if not current_app.extensions.get('search_fts5'):
+            yield
+            return
+
+        for source in sources:
+            table = FTS_INDEXES[source]['table']
+            for suffix in ('ai', 'ad', 'au'):
+                db.session.execute(text(f"DROP TRIGGER IF EXISTS {table}_{suffix}"))
+        try:
+            yield
+        finally:
+            for source in sources:
+                index = FTS_INDEXES[source]
+                table = index['table']
+                for statement in _trigger_statements(source, table, index['columns'] + index['filters']):
+                    db.session.execute(text(statement))
+                db.session.execute(text(f"INSERT INTO {table}({table}) VALUES('rebuild')"))
+
+    @staticmethod
+    def build_match(raw):
+        """Turn free text into an FTS5 query: every word must match as a prefix"""
+        tokens = _TOKEN_RE.findall(raw or '')[:MAX_QUERY_TOKENS]
+        return ' '.join(f'"{token}"*' for token in tokens)
+
+    @staticmethod
+    def _ranked_ids(kind, match, limit, filters=None, sql_filter=''):
+        index = FTS_INDEXES[kind]
+        table = index['table']
+
+        # Text tokens only match the text columns; filters match their own column exactly
+        expression = '{%s} : (%s)' % (' '.join(index['columns']), match)
+        for column, value in (filters or {}).items():
+            expression = f'{column} : {_phrase(value)} AND {expression}'
+
+        sql = (
+            f"SELECT base.id, {table}.rank FROM {table} "
+            f"JOIN {kind} AS base ON base.rowid = {table}.rowid "
+            f"WHERE {table} MATCH :match {sql_filter} "
+            f"ORDER BY {table}.rank LIMIT :limit"
+        )
+        rows = db.session.execute(text(sql), {'match': expression, 'limit': limit}).all()
+        return [(row[0], -row[1]) for row in rows]
+
+    @staticmethod
+    def _like_ids(model, columns, tokens, query, limit):
+        # Fallback without FTS5: every token must appear in one of the columns
+        for token in tokens:
+            pattern = f'%{token}%'
+            query = query.filter(or_(*[getattr(model, column).ilike(pattern) for column in columns]))
+        return [(row.id, None) for row in query.with_entities(model.id).limit(limit)]
+
+    @staticmethod
+    def _search_kind(kind, user, match, tokens, limit):
+        filters, sql_filter = {}, ''
+
+        if kind == 'labs':
+            query = Lab.query
+            if not user.is_admin():
+                sql_filter = 'AND base.is_active = 1'
+                query = query.filter(Lab.is_active == True)
+        elif kind == 'reservations':
+            query = Reservation.query
+            if user.is_instructor():
+                filters = {'instructor_id': user.id}
+                query = query.filter(Reservation.instructor_id == user.id)
+            elif not user.is_admin():
+                # Students can see all approved reservations
+                filters = {'status': ReservationStatus.APPROVED}
+                query = query.filter(Reservation.status == ReservationStatus.APPROVED)
+        else:
+            # Tasks are private to their owner, admins included
+            filters = {'user_id': user.id}
+            query = Task.query.filter(Task.user_id == user.id)
+
+        if current_app.extensions.get('search_fts5', False):
+            return SearchService._ranked_ids(kind, match, limit, filters, sql_filter)
+        model = SearchService.MODELS[kind]
+        return SearchService._like_ids(model, FTS_INDEXES[kind]['columns'], tokens, query, limit)
+
+    @staticmethod
+    def search(user, raw_query, types=None, limit=10):
+        """Ranked matches per type, limited to what the user may see.
+
+        Returns {type: [serialized row with a 'score', ...]}; higher scores
+        are better matches (score is None on the LIKE fallback).
+        """
+        match = SearchService.build_match(raw_query)
+        if not match:
+            raise ValueError('Search query must contain at least one word')
+
+        tokens = _TOKEN_RE.findall(raw_query)[:MAX_QUERY_TOKENS]
+        loaders = {
+            'labs': lambda ids: Lab.query.filter(Lab.id.in_(ids)),
+            'reservations': lambda ids: Reservation.query.options(
+                joinedload(Reservation.instructor), joinedload(Reservation.lab)
+            ).filter(Reservation.id.in_(ids)),
+            'tasks': lambda ids: Task.query.filter(Task.id.in_(ids))
+        }
+
+        results = {}
+        for kind in types or SearchService.TYPES:
+            ranked = SearchService._search_kind(kind, user, match, tokens, limit)
+            if not ranked:
+                results[kind] = []
+                continue
+
+            rows = {row.id: row for row in loaders[kind]([row_id for row_id, _ in ranked])}
+            items = []
+            for row_id, score in ranked:
+                if row_id in rows:
+                    item = rows[row_id].to_dict()
+                    item['score'] = round(score, 6) if score is not None else None
+                    items.append(item)
+            results[kind] = items
+
+        return results
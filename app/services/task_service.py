@@ -0,0 +1,244 @@
+from app import db
+from app.models.task import Task, TaskStatus, TaskPriority
+from app.services.dashboard_service import DashboardService
+from app.utils.cache import LRUCache
+from app.utils.pagination import encode_cursor, decode_cursor
+from app.utils.serializers import apply_fields
+from sqlalchemy import and_, or_, func, case, insert
+from sqlalchemy.orm import load_only
+from datetime import datetime
+import uuid
+
+# Per-user totals keyed by (user_id, status, priority) plus (user_id, 'stats').
+# Writes through TaskService drop the user's entries; the TTL bounds staleness
+# for other workers and for time-dependent numbers such as "overdue".
+task_counts = LRUCache('task_counts', maxsize=2048, ttl=300)
+
+BULK_CREATABLE_FIELDS = ('title', 'description', 'priority', 'due_date')
+BULK_UPDATABLE_FIELDS = ('title', 'description', 'status', 'priority', 'due_date')
+TASK_STATUSES = (TaskStatus.PENDING, TaskStatus.IN_PROGRESS, TaskStatus.COMPLETED, TaskStatus.CANCELLED)
+TASK_PRIORITIES = (TaskPriority.LOW, TaskPriority.MEDIUM, TaskPriority.HIGH, TaskPriority.URGENT)
+
+def _parse_due_date(value):
+    return datetime.fromisoformat(value.replace('Z', '+00:00')) if value else None
+
+def _field_error(values):
+    """Why a bulk item's field values cannot be stored, or None"""
+    if any(not isinstance(value, (str, type(None))) for value in values.values()):
+        return 'Field values must be strings or null'
+    if 'title' in values and not values['title']:
+        return 'Task title is required'
+    if 'status' in values and values['status'] not in TASK_STATUSES:
+        return f"status must be one of: {', '.join(TASK_STATUSES)}"
+    if 'priority' in values and values['priority'] not in TASK_PRIORITIES:
+        return f"priority must be one of: {', '.join(TASK_PRIORITIES)}"
+    return None
+
+class TaskService:
+    @staticmethod
+    def filtered_query(user_id, status=None, priority=None, fields=None):
+        """A user's tasks, filtered the way the composite indexes expect"""
+        query = apply_fields(Task.query.filter(Task.user_id == user_id), Task, fields)
+        if status:
+            query = query.filter(Task.status == status)
+        if priority:
+            query = query.filter(Task.priority == priority)
+        return query
+
+    @staticmethod
+    def get_page(user_id, status=None, priority=None, fields=None, limit=10, cursor=None):
+        """One keyset page on (created_at, id), newest first.
+
+        Returns (tasks, next_cursor); next_cursor is None on the last page.
+        """
+        query = TaskService.filtered_query(user_id, status, priority, fields)
+
+        if cursor:
+            created_at, task_id = decode_cursor(cursor)
+            query = query.filter(or_(
+                Task.created_at < created_at,
+                and_(Task.created_at == created_at, Task.id < task_id)
+            ))
+
+        # created_at and id drive the cursor, so they must be loaded even for sparse fieldsets
+        if fields:
+            query = query.options(load_only(Task.created_at))
+
+        rows = query.order_by(Task.created_at.desc(), Task.id.desc()).limit(limit + 1).all()
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(rows[-1].created_at, rows[-1].id)
+
+        return rows, next_cursor
+
+    @staticmethod
+    def count(user_id, status=None, priority=None):
+        """Cached number of tasks matching the filters"""
+        key = (user_id, status, priority)
+        total = task_counts.get(key)
+        if total is None:
+            total = TaskService.filtered_query(user_id, status, priority).order_by(None).count()
+            task_counts.set(key, total)
+        return total
+
+    @staticmethod
+    def get_stats(user_id):
+        """Status, priority and overdue counters in one aggregate query, cached per user"""
+        key = (user_id, 'stats')
+        stats = task_counts.get(key)
+        if stats is not None:
+            return stats
+
+        count_if = DashboardService._count_if
+        priorities = TASK_PRIORITIES
+        row = db.session.query(
+            func.count(Task.id),
+            count_if(Task.status == TaskStatus.COMPLETED),
+            count_if(Task.status == TaskStatus.PENDING),
+            count_if(Task.status == TaskStatus.IN_PROGRESS),
+            count_if((Task.status != TaskStatus.COMPLETED) & (Task.due_date < datetime.utcnow())),
+            *[count_if(Task.priority == priority) for priority in priorities]
+        ).filter(Task.user_id == user_id).one()
+
+        stats = {
+            'total': row[0],
+            'completed': row[1],
+            'pending': row[2],
+            'in_progress': row[3],
+            'overdue': row[4],
+            'priority_distribution': dict(zip(priorities, row[5:]))
+        }
+        task_counts.set(key, stats)
+        return stats
+
+    @staticmethod
+    def invalidate_counts(user_id):
+        """Drop cached totals after the user's tasks changed"""
+        task_counts.delete_where(lambda key: key[0] == user_id)
+
+    @staticmethod
+    def apply_bulk(user_id, operations):
+        """Apply create/update/delete operations for one user in a single transaction.
+
+        Updates with identical changes share one UPDATE ... WHERE id IN (...)
+        and all deletes share one DELETE; creates are one executemany INSERT.
+        Invalid items are reported and skipped without affecting the others.
+        Returns one result dict per operation, in request order. The caller
+        commits.
+        """
+        results = [None] * len(operations)
+        creates = []
+        update_groups = {}
+        deletes = []
+        seen_ids = set()
+
+        def fail(index, op, message, task_id=None):
+            results[index] = {'index': index, 'op': op, 'id': task_id, 'success': False, 'message': message}
+
+        for index, operation in enumerate(operations):
+            op = operation.get('op') if isinstance(operation, dict) else None
+            if op not in ('create', 'update', 'delete'):
+                fail(index, op, "op must be one of: create, update, delete")
+                continue
+
+            if op == 'create':
+                values = {field: operation[field] for field in BULK_CREATABLE_FIELDS if field in operation}
+                error = 'Task title is required' if not values.get('title') else _field_error(values)
+                if error:
+                    fail(index, op, error)
+                    continue
+                try:
+                    due_date = _parse_due_date(values.get('due_date'))
+                except (TypeError, ValueError):
+                    fail(index, op, 'Invalid due_date')
+                    continue
+                task_id = str(uuid.uuid4())
+                creates.append({
+                    'id': task_id,
+                    'user_id': user_id,
+                    'title': values['title'],
+                    'description': values.get('description', ''),
+                    'status': TaskStatus.PENDING,
+                    'priority': values.get('priority', TaskPriority.MEDIUM),
+                    'due_date': due_date
+                })
+                results[index] = {'index': index, 'op': op, 'id': task_id, 'success': True}
+                continue
+
+            task_id = operation.get('id')
+            if not task_id or not isinstance(task_id, str):
+                fail(index, op, 'Task id is required')
+                continue
+            # Set-based statements lose ordering, so each task may appear once
+            if task_id in seen_ids:
+                fail(index, op, 'Task appears more than once in this batch', task_id)
+                continue
+            seen_ids.add(task_id)
+
+            if op == 'delete':
+                deletes.append((index, task_id))
+                continue
+
+            changes = {field: operation[field] for field in BULK_UPDATABLE_FIELDS if field in operation}
+            if not changes:
+                fail(index, op, 'No fields to update', task_id)
+                continue
+            error = _field_error(changes)
+            if error:
+                fail(index, op, error, task_id)
+                continue
+            if 'due_date' in changes:
+                try:
+                    changes['due_date'] = _parse_due_date(changes['due_date'])
+                except (TypeError, ValueError):
+                    fail(index, op, 'Invalid due_date', task_id)
+                    continue
+            update_groups.setdefault(tuple(sorted(changes.items())), []).append((index, task_id))
+
+        # One lookup decides which of the referenced tasks exist and belong to the user
+        referenced = list(seen_ids)
+        owned = set()
+        if referenced:
+            owned = {
+                row.id for row in db.session.query(Task.id).filter(
+                    Task.user_id == user_id, Task.id.in_(referenced)
+                )
+            }
+
+        def owned_items(items, op):
+            kept = []
+            for index, task_id in items:
+                if task_id in owned:
+                    kept.append(task_id)
+                    results[index] = {'index': index, 'op': op, 'id': task_id, 'success': True}
+                else:
+                    fail(index, op, 'Task not found', task_id)
+            return kept
+
+        if creates:
+            db.session.execute(insert(Task), creates)
+
+        now = datetime.utcnow()
+        for key, items in update_groups.items():
+            ids = owned_items(items, 'update')
+            if not ids:
+                continue
+            values = dict(key)
+            if 'status' in values:
+                # Same completed_at rules as update_task
+                if values['status'] == TaskStatus.COMPLETED:
+                    values['completed_at'] = case((Task.completed_at.is_(None), now), else_=Task.completed_at)
+                else:
+                    values['completed_at'] = None
+            values['updated_at'] = now
+            Task.query.filter(Task.user_id == user_id, Task.id.in_(ids)).update(
+                values, synchronize_session=False
+            )
+
+        ids = owned_items(deletes, 'delete')
+        if ids:
+            Task.query.filter(Task.user_id == user_id, Task.id.in_(ids)).delete(synchronize_session=False)
+
+        return results
@@ -0,0 +1,210 @@
+import csv
+from flask import current_app
+from app import db
+from app.models.lab import Lab, Reservation, ReservationRecurrence, ReservationStatus
+from app.models.user import User, UserRole
+from app.services.reservation_service import ReservationService, ACTIVE_STATUSES
+from app.utils.intervals import overlapping_pairs
+from collections import defaultdict
+from datetime import datetime
+import uuid
+
+REQUIRED_COLUMNS = ('lab', 'instructor', 'course_code', 'course_name', 'section', 'start_time', 'end_time')
+OPTIONAL_COLUMNS = ('student_count', 'purpose', 'weekdays', 'until', 'exdates')
+
+def _parse_datetime(value):
+    parsed = datetime.fromisoformat(value.strip().replace('Z', '+00:00'))
+    return parsed.replace(tzinfo=None) if parsed.tzinfo else parsed
+
+class TimetableService:
+    @staticmethod
+    def lookup_maps():
+        """Lab name -> id and instructor email/username -> id, loaded once per import"""
+        labs = {name.strip().lower(): lab_id for lab_id, name in db.session.query(Lab.id, Lab.name)}
+        instructors = {}
+        for user_id, email, username in db.session.query(User.id, User.email, User.username).filter(
+            User.role == UserRole.INSTRUCTOR, User.is_active.is_(True)
+        ):
+            instructors[email.lower()] = user_id
+            instructors[username.lower()] = user_id
+        return labs, instructors
+
+    @staticmethod
+    def parse(stream, labs, instructors):
+        """Validate CSV rows from a text stream one at a time.
+
+        Yields (line, row dict or None, errors). Rows are read lazily from
+        the stream, so the file itself is never held in memory.
+        """
+        reader = csv.DictReader(stream)
+        headers = {(name or '').strip().lower() for name in reader.fieldnames or []}
+        missing = [column for column in REQUIRED_COLUMNS if column not in headers]
+        if missing:
+            raise ValueError(f"Missing column(s): {', '.join(missing)}")
+
+        for record in reader:
+            line = reader.line_num
+            record = {(key or '').strip().lower(): (value or '').strip() for key, value in record.items() if key}
+            errors = []
+
+            for column in REQUIRED_COLUMNS:
+                if not record.get(column):
+                    errors.append(f'{column} is required')
+
+            lab_id = labs.get(record.get('lab', '').lower())
+            if record.get('lab') and not lab_id:
+                errors.append(f"Unknown lab '{record['lab']}'")
+            instructor_id = instructors.get(record.get('instructor', '').lower())
+            if record.get('instructor') and not instructor_id:
+                errors.append(f"Unknown instructor '{record['instructor']}'")
+
+            for column, limit in (('course_code', 20), ('course_name', 100), ('section', 10)):
+                if len(record.get(column, '')) > limit:
+                    errors.append(f'{column} is longer than {limit} characters')
+
+            start_time = end_time = None
+            try:
+                if record.get('start_time') and record.get('end_time'):
+                    start_time = _parse_datetime(record['start_time'])
+                    end_time = _parse_datetime(record['end_time'])
+            except ValueError:
+                errors.append('start_time and end_time must be ISO 8601 datetimes')
+            if start_time and end_time:
+                try:
+                    ReservationService.check_times(start_time, end_time)
+                except ValueError as e:
+                    errors.append(str(e))
+
+            student_count = 0
+            if record.get('student_count'):
+                try:
+                    student_count = int(record['student_count'])
+                    if student_count < 0:
+                        raise ValueError
+                except ValueError:
+                    errors.append('student_count must be a non-negative integer')
+
+            recurrence = None
+            intervals = [(start_time, end_time)]
+            if record.get('weekdays') and not errors:
+                try:
+                    recurrence, intervals = ReservationService.build_recurrence(start_time, end_time, {
+                        'weekdays': record['weekdays'].replace(' ', '').split(';' if ';' in record['weekdays'] else ','),
+                        'until': record.get('until'),
+                        'exdates': record.get('exdates', '').replace(';', ',')
+                    })
+                except ValueError as e:
+                    errors.append(str(e))
+
+            if errors:
+                yield line, None, errors
+                continue
+
+            yield line, {
+                'id': str(uuid.uuid4()),
+                'lab_id': lab_id,
+                'instructor_id': instructor_id,
+                'course_code': record['course_code'],
+                'course_name': record['course_name'],
+                'section': record['section'],
+                'student_count': student_count,
+                'start_time': start_time,
+                'end_time': end_time,
+                'duration_minutes': int((end_time - start_time).total_seconds() / 60),
+                'purpose': record.get('purpose', ''),
+                'recurrence': recurrence,
+                'intervals': intervals
+            }, []
+
+    @staticmethod
+    def import_csv(stream, dry_run=False, status=ReservationStatus.APPROVED, chunk_size=None):
+        """Import a registrar timetable CSV in one transaction.
+
+        Rows are validated as they stream in, then the whole batch (every
+        occurrence of recurring rows included) is conflict-checked against
+        itself and against existing pending/approved bookings in one
+        sort-and-sweep per lab. Rows with errors are skipped and reported by
+        line; the rest are inserted with executemany in chunks unless
+        dry_run is set. Returns the report; the caller commits.
+        """
+        config = current_app.config
+        chunk_size = chunk_size or config['TIMETABLE_IMPORT_CHUNK_SIZE']
+        labs, instructors = TimetableService.lookup_maps()
+
+        rows = {}
+        errors = defaultdict(list)
+        total = 0
+        for line, row, row_errors in TimetableService.parse(stream, labs, instructors):
+            total += 1
+            if row_errors:
+                errors[line].extend(row_errors)
+            else:
+                rows[line] = row
+
+        # One sweep per lab over the batch and the bookings it could touch
+        by_lab = defaultdict(list)
+        for line, row in rows.items():
+            for start, end in row['intervals']:
+                by_lab[row['lab_id']].append((start, end, ('row', line)))
+        windows = {
+            lab_id: (min(start for start, _, _ in intervals), max(end for _, end, _ in intervals))
+            for lab_id, intervals in by_lab.items()
+        }
+        for booking in ReservationService.booked(windows, ACTIVE_STATUSES):
+            by_lab[booking.lab_id].append((booking.start_time, booking.end_time, ('booked', booking)))
+
+        conflicts = defaultdict(set)
+        for intervals in by_lab.values():
+            for (kind_a, key_a), (kind_b, key_b) in overlapping_pairs(intervals):
+                if kind_a == 'row' and kind_b == 'row':
+                    if key_a != key_b:
+                        conflicts[key_a].add(f'overlaps line {key_b}')
+                        conflicts[key_b].add(f'overlaps line {key_a}')
+                elif kind_a == 'row' or kind_b == 'row':
+                    line, booking = (key_a, key_b) if kind_a == 'row' else (key_b, key_a)
+                    conflicts[line].add(
+                        f'conflicts with {booking.course_code} {booking.section} at {booking.start_time.isoformat()}'
+                    )
+        for line, messages in conflicts.items():
+            errors[line].extend(sorted(messages))
+            rows.pop(line, None)
+
+        imported = 0
+        if not dry_run and rows:
+            now = datetime.utcnow()
+            reservations = []
+            recurrences = []
+            for row in rows.values():
+                recurrence = row.pop('recurrence')
+                row.pop('intervals')
+                reservations.append({**row, 'status': status, 'created_at': now, 'updated_at': now})
+                if recurrence is not None:
+                    recurrences.append({
+                        'id': str(uuid.uuid4()),
+                        'reservation_id': row['id'],
+                        'weekdays': recurrence.weekdays,
+                        'interval': recurrence.interval,
+                        'until': recurrence.until,
+                        'exdates': recurrence.exdates,
+                        'series_end': recurrence.series_end,
+                        'created_at': now
+                    })
+
+            # Core table inserts skip the ORM bulk-persistence layer entirely
+            for offset in range(0, len(reservations), chunk_size):
+                db.session.execute(Reservation.__table__.insert(), reservations[offset:offset + chunk_size])
+            for offset in range(0, len(recurrences), chunk_size):
+                db.session.execute(ReservationRecurrence.__table__.insert(), recurrences[offset:offset + chunk_size])
+            imported = len(reservations)
+
+        max_errors = config['TIMETABLE_IMPORT_MAX_ERRORS']
+        error_lines = sorted(errors)
+        return {
+            'dry_run': dry_run,
+            'rows': total,
+            'valid': len(rows),
+            'imported': imported,
+            'error_count': len(error_lines),
+            'errors': [{'line': line, 'errors': errors[line]} for line in error_lines[:max_errors]],
+            'errors_truncated': len(error_lines) > max_errors
+        }
@@ -0,0 +1,344 @@
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+import re
+import shutil
+import subprocess
+import tempfile
+from flask import current_app, request, send_from_directory, url_for
+
+# Bundle name -> source files (relative to the static folder), in load order
+ASSET_BUNDLES = {
+    'app.css': [
+        'css/style.css'
+    ],
+    'app.js': [
+        'js/utils/helpers.js',
+        'js/utils/api.js',
+        'js/components/notification.js',
+        'js/components/modal.js',
+        'js/components/virtual-table.js',
+        'js/components/debug.js',
+        'js/app.js'
+    ]
+}
+
+DIST_FOLDER = 'dist'
+MANIFEST_NAME = 'manifest.json'
+
+# Top-level lexical declarations; classic scripts share one global scope for these
+_TOP_LEVEL_DECLARATION = re.compile(r'^(?:const|let|class)\s+([A-Za-z_$][\w$]*)', re.MULTILINE)
+
+# Tokens after which a "/" starts a regular expression rather than a division
+_REGEX_PRECEDERS = set('(,=:[!&|?{};+-*%<>~^')
+_REGEX_KEYWORDS = {'return', 'typeof', 'case', 'in', 'of', 'delete', 'void', 'throw', 'new', 'else', 'do', 'instanceof'}
+
+def _skip_string(source, i):
+    """Index just past the quoted string starting at source[i]"""
+    quote = source[i]
+    i += 1
+    while i < len(source):
+        if source[i] == '\\':
+            i += 2
+            continue
+        if source[i] == quote:
+            return i + 1
+        i += 1
+    return i
+
+def _skip_regex(source, i):
+    """Index just past the regex literal (including flags) starting at source[i]"""
+    i += 1
+    in_class = False
+    while i < len(source):
+        char = source[i]
+        if char == '\\':
+            i += 2
+            continue
+        if char == '[':
+            in_class = True
+        elif char == ']':
+            in_class = False
+        elif char == '/' and not in_class:
+            i += 1
+            while i < len(source) and (source[i].isalnum() or source[i] == '_'):
+                i += 1
+            return i
+        elif char == '\n':
+            return i
+        i += 1
+    return i
+
+def _skip_template(source, i):
+    """Scan template literal text from source[i]; returns (index, ended)"""
+    while i < len(source):
+        char = source[i]
+        if char == '\\':
+            i += 2
+            continue
+        if char == '`':
+            return i + 1, True
+        if char == '$' and source.startswith('${', i):
+            return i + 2, False
+        i += 1
+    return i, True
+
+def minify_js(source):
+    """Conservative JavaScript minifier.
+
+    Strips comments and collapses whitespace outside of strings, template
+    literals and regex literals. Line breaks are kept (one per run) so
+    automatic semicolon insertion behaves exactly as in the source.
+    """
+    out = []
+    i = 0
+    length = len(source)
+    last_char = ''
+    word = ''
+    pending = ''
+    # Brace depth inside each open "${ ... }" template expression
+    template_stack = []
+    brace_depth = 0
+
+    while i < length:
+        char = source[i]
+
+        if char in ' \t\r\f\v':
+            pending = pending or ' '
+            i += 1
+            continue
+        if char == '\n':
+            pending = '\n'
+            i += 1
+            continue
+        if source.startswith('//', i):
+            end = source.find('\n', i)
+            i = length if end == -1 else end
+            continue
+        if source.startswith('/*', i):
+            end = source.find('*/', i + 2)
+            end = length if end == -1 else end + 2
+            pending = '\n' if '\n' in source[i:end] or pending == '\n' else (pending or ' ')
+            i = end
+            continue
+
+        if pending and out:
+            out.append(pending)
+        pending = ''
+
+        if char in '"\'':
+            end = _skip_string(source, i)
+            out.append(source[i:end])
+            i, last_char, word = end, char, ''
+            continue
+
+        if char == '`':
+            end, ended = _skip_template(source, i + 1)
+            out.append(source[i:end])
+            i, last_char, word = end, '`', ''
+            if not ended:
+                template_stack.append(brace_depth)
+                brace_depth = 0
+                last_char = '{'
+            continue
+
+        if char == '/' and (not last_char or last_char in _REGEX_PRECEDERS or word in _REGEX_KEYWORDS):
+            end = _skip_regex(source, i)
+            out.append(source[i:end])
+            i, last_char, word = end, '/', ''
+            continue
+
+        if char == '{':
+            brace_depth += 1
+        elif char == '}':
+            if brace_depth == 0 and template_stack:
+                # Closing a "${ ... }" expression: continue the template text
+                end, ended = _skip_template(source, i + 1)
+                out.append(source[i:end])
+                i, last_char, word = end, '`', ''
+                brace_depth = template_stack.pop()
+                if not ended:
+                    template_stack.append(brace_depth)
+                    brace_depth = 0
+                    last_char = '{'
+                continue
+            brace_depth = max(brace_depth - 1, 0)
+
+        if char.isalnum() or char in '_$':
+            previous = out[-1][-1] if out else ''
+            word = word + char if previous.isalnum() or previous in '_$' else char
+        else:
+            word = ''
+        out.append(char)
+        last_char = char
+        i += 1
+
+    return ''.join(out).strip() + '\n'
+
+def minify_css(source):
+    """Strip comments and redundant whitespace from a stylesheet"""
+    out = []
+    i = 0
+    length = len(source)
+    while i < length:
+        char = source[i]
+        if char in '"\'':
+            end = _skip_string(source, i)
+            out.append(source[i:end])
+            i = end
+            continue
+        if source.startswith('/*', i):
+            end = source.find('*/', i + 2)
+            i = length if end == -1 else end + 2
+            out.append(' ')
+            continue
+        out.append(char)
+        i += 1
+
+    css = ''.join(out)
+    # Split around strings again so whitespace rules never touch quoted text
+    parts = re.split(r'("(?:\\.|[^"\\])*"|\'(?:\\.|[^\'\\])*\')', css)
+    for index in range(0, len(parts), 2):
+        text = re.sub(r'\s+', ' ', parts[index])
+        text = re.sub(r'\s*([{};,])\s*', r'\1', text)
+        text = text.replace(';}', '}')
+        parts[index] = text
+    return ''.join(parts).strip() + '\n'
+
+def check_js_bundle(name, sources, contents, body):
+    """Raise ValueError when a JS bundle would fail to parse.
+
+    A const, let or class declared at the top level of two source files is
+    a SyntaxError once they are concatenated, and a syntax error loses the
+    whole bundle rather than one file. When node is on the PATH, the
+    minified output is also run through `node --check`.
+    """
+    declared = {}
+    for source, content in zip(sources, contents):
+        for identifier in _TOP_LEVEL_DECLARATION.findall(content):
+            if identifier in declared:
+                raise ValueError(f"{name}: '{identifier}' is declared in both {declared[identifier]} and {source}")
+            declared[identifier] = source
+
+    node = shutil.which('node')
+    if node is None:
+        return
+    with tempfile.NamedTemporaryFile('w', suffix='.js', encoding='utf-8', delete=False) as f:
+        f.write(body)
+    try:
+        result = subprocess.run([node, '--check', f.name], capture_output=True, text=True, timeout=60)
+    finally:
+        os.remove(f.name)
+    if result.returncode != 0:
+        detail = '\n'.join(result.stderr.strip().splitlines()[-5:])
+        raise ValueError(f"{name}: minified bundle does not parse\n{detail}")
+
+def build_assets(static_folder, bundles=None):
+    """Concatenate, minify and fingerprint each bundle.
+
+    Writes <name>.<hash>.<ext> (plus a precompressed .gz copy) and a
+    manifest.json mapping bundle names to fingerprinted files into
+    static/dist, removing files from previous builds. Returns the manifest.
+    Raises ValueError, before anything is written, when a JS bundle does
+    not parse (see check_js_bundle).
+    """
+    bundles = bundles or ASSET_BUNDLES
+    dist = os.path.join(static_folder, DIST_FOLDER)
+    os.makedirs(dist, exist_ok=True)
+
+    built = {}
+    for name, sources in bundles.items():
+        contents = []
+        for source in sources:
+            with open(os.path.join(static_folder, source), encoding='utf-8') as f:
+                contents.append(f.read())
+
+        stem, ext = os.path.splitext(name)
+        if ext == '.js':
+            # Each file ends with a newline so a missing trailing semicolon never joins two files
+            body = ''.join(minify_js(content) for content in contents)
+            check_js_bundle(name, sources, contents, body)
+        else:
+            body = ''.join(minify_css(content) for content in contents)
+        built[name] = body
+
+    manifest = {}
+    for name, body in built.items():
+        stem, ext = os.path.splitext(name)
+        data = body.encode('utf-8')
+        digest = hashlib.sha256(data).hexdigest()[:12]
+        filename = f'{stem}.{digest}{ext}'
+
+        with open(os.path.join(dist, filename), 'wb') as f:
+            f.write(data)
+        with open(os.path.join(dist, filename + '.gz'), 'wb') as f:
+            f.write(gzip.compress(data, compresslevel=9))
+
+        manifest[name] = filename
+
+    with open(os.path.join(dist, MANIFEST_NAME), 'w') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+
+    keep = set(manifest.values()) | {value + '.gz' for value in manifest.values()} | {MANIFEST_NAME}
+    for existing in os.listdir(dist):
+        if existing not in keep:
+            os.remove(os.path.join(dist, existing))
+
+    return manifest
+
+class Assets:
+    """Serves built bundles and exposes the asset_urls() template helper.
+
+    Without a build (no static/dist/manifest.json) templates fall back to
+    the individual source files, so development needs no build step.
+    """
+
+    def __init__(self, app=None):
+        self._manifest = None
+        self._manifest_mtime = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('ASSETS_MAX_AGE', 365 * 24 * 60 * 60)
+        app.add_url_rule('/assets/<path:filename>', 'assets', self.serve)
+        app.add_template_global(self.asset_urls, 'asset_urls')
+
+    def manifest(self):
+        path = os.path.join(current_app.static_folder, DIST_FOLDER, MANIFEST_NAME)
+        try:
+            mtime = os.path.getmtime(path)
+        except OSError:
+            return {}
+
+        if mtime != self._manifest_mtime:
+            with open(path) as f:
+                self._manifest = json.load(f)
+            self._manifest_mtime = mtime
+        return self._manifest
+
+    def asset_urls(self, bundle):
+        """URLs to load for a bundle: the fingerprinted build, or its sources"""
+        built = self.manifest().get(bundle)
+        if built:
+            return [url_for('assets', filename=built)]
+        return [url_for('static', filename=source) for source in ASSET_BUNDLES[bundle]]
+
+    def serve(self, filename):
+        dist = os.path.join(current_app.static_folder, DIST_FOLDER)
+        max_age = current_app.config['ASSETS_MAX_AGE']
+
+        if 'gzip' in request.accept_encodings and os.path.exists(os.path.join(dist, filename + '.gz')):
+            response = send_from_directory(dist, filename + '.gz', max_age=max_age)
+            response.headers['Content-Encoding'] = 'gzip'
+            response.mimetype = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+        else:
+            response = send_from_directory(dist, filename, max_age=max_age)
+
+        # Fingerprinted names never change content, so browsers need not revalidate
+        response.cache_control.public = True
+        response.cache_control.immutable = True
+        response.vary.add('Accept-Encoding')
+        return response
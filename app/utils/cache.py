@@ -0,0 +1,74 @@
+import threading
+import time
+from collections import OrderedDict
+
+# Every cache registers itself here so hit ratios can be reported in one place
+_registry = {}
+
+class LRUCache:
+    """Thread-safe, size-bounded LRU cache with an optional TTL.
+
+    Entries live in process memory, so each gunicorn worker has its own
+    copy; use it for values that are cheap to rebuild and safe to serve
+    slightly stale (up to ``ttl`` seconds) from another worker's point of view.
+    """
+
+    def __init__(self, name, maxsize=256, ttl=None):
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        _registry[name] = self
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                value, expires = entry
+                if expires is None or expires > time.monotonic():
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._data[key]
+            self.misses += 1
+            return default
+
+    def set(self, key, value, ttl=None):
+        ttl = self.ttl if ttl is None else ttl
+        expires = time.monotonic() + ttl if ttl else None
+        with self._lock:
+            self._data[key] = (value, expires)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def delete_where(self, predicate):
+        """Drop every entry whose key matches predicate(key)"""
+        with self._lock:
+            for key in [key for key in self._data if predicate(key)]:
+                del self._data[key]
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'size': len(self._data),
+            'maxsize': self.maxsize,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_ratio': round(self.hits / lookups, 4) if lookups else None
+        }
+
+def cache_stats():
+    """Hit/miss statistics for every cache in this process"""
+    return {name: cache.stats() for name, cache in _registry.items()}
@@ -0,0 +1,98 @@
+import gzip
+from flask import current_app, request
+from app.utils.cache import LRUCache
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+class Compressor:
+    """gzip/brotli response compression for large, compressible responses.
+
+    Responses are only compressed when the client accepts it, the mimetype
+    is listed in COMPRESS_MIMETYPES and the body is at least
+    COMPRESS_MIN_SIZE bytes. Streamed responses, file responses and
+    server-sent events are passed through untouched.
+
+    GET responses from endpoints in COMPRESS_CACHE_ENDPOINTS get a weak
+    ETag (a hash of the uncompressed body) and their compressed bodies are
+    cached by (ETag, encoding), so repeated identical listings skip both
+    compression and, with If-None-Match, the body entirely.
+    """
+
+    def __init__(self, app=None):
+        self.cache = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('COMPRESS_ENABLED', True)
+        app.config.setdefault('COMPRESS_MIN_SIZE', 1024)
+        app.config.setdefault('COMPRESS_LEVEL', 6)
+        app.config.setdefault('COMPRESS_BROTLI_QUALITY', 4)
+        app.config.setdefault('COMPRESS_MIMETYPES', [
+            'application/json', 'text/html', 'text/css', 'text/plain',
+            'text/csv', 'application/javascript', 'text/javascript'
+        ])
+        app.config.setdefault('COMPRESS_CACHE_ENDPOINTS', [])
+        app.config.setdefault('COMPRESS_CACHE_SIZE', 256)
+
+        self.cache = LRUCache('compressed_responses', maxsize=app.config['COMPRESS_CACHE_SIZE'])
+        app.after_request(self.after_request)
+
+    def choose_encoding(self):
+        offered = ['br', 'gzip'] if brotli is not None else ['gzip']
+        return request.accept_encodings.best_match(offered)
+
+    def compress(self, body, encoding, config):
+        if encoding == 'br':
+            return brotli.compress(body, quality=config['COMPRESS_BROTLI_QUALITY'])
+        return gzip.compress(body, compresslevel=config['COMPRESS_LEVEL'])
+
+    def after_request(self, response):
+        config = current_app.config
+
+        if not config['COMPRESS_ENABLED']:
+            return response
+        if response.direct_passthrough or response.is_streamed:
+            return response
+        if response.mimetype == 'text/event-stream' or response.mimetype not in config['COMPRESS_MIMETYPES']:
+            return response
+        if response.status_code < 200 or response.status_code in (204, 206, 304):
+            return response
+        if 'Content-Encoding' in response.headers:
+            return response
+
+        response.vary.add('Accept-Encoding')
+
+        cacheable = request.method == 'GET' and request.endpoint in config['COMPRESS_CACHE_ENDPOINTS']
+        if cacheable and response.status_code == 200:
+            if not response.get_etag()[0]:
+                response.add_etag(weak=True)
+            response.make_conditional(request)
+            if response.status_code == 304:
+                return response
+
+        encoding = self.choose_encoding()
+        if not encoding:
+            return response
+
+        body = response.get_data()
+        if len(body) < config['COMPRESS_MIN_SIZE']:
+            return response
+
+        compressed = None
+        cache_key = None
+        if cacheable and response.status_code == 200:
+            cache_key = (response.get_etag()[0], encoding)
+            compressed = self.cache.get(cache_key)
+
+        if compressed is None:
+            compressed = self.compress(body, encoding, config)
+            if cache_key is not None:
+                self.cache.set(cache_key, compressed)
+
+        response.set_data(compressed)
+        response.headers['Content-Encoding'] = encoding
+        return response
@@ -0,0 +1,62 @@
+import heapq
+
+def overlapping_pairs(intervals):
+    """All pairs of overlapping half-open intervals, by sort-and-sweep.
+
+    intervals is an iterable of (start, end, key). Intervals that merely
+    touch (one ends when the next starts) do not overlap. Runs in
+    O(n log n + k) for k overlapping pairs. Returns a list of (key, key)
+    tuples, the earlier-starting interval first.
+    """
+    pairs = []
+    active = []  # heap of (end, sequence, key) for intervals still open
+    ordered = sorted(intervals, key=lambda interval: (interval[0], interval[1]))
+    for sequence, (start, end, key) in enumerate(ordered):
+        while active and active[0][0] <= start:
+            heapq.heappop(active)
+        for _, _, other in active:
+            pairs.append((other, key))
+        heapq.heappush(active, (end, sequence, key))
+    return pairs
+
+def cross_overlapping_pairs(left, right):
+    """Overlapping pairs with one interval from each of two sets, by one sweep.
+
+    Each side keeps its own heap of open intervals, and a new interval is
+    only compared with the other side's, so overlaps within a set are
+    never enumerated. Runs in O(n log n + k) for k cross pairs. left and
+    right are iterables of (start, end, key); returns (left key, right key)
+    tuples.
+    """
+    pairs = []
+    active = ([], [])  # per side: heap of (end, sequence, key)
+    ordered = sorted(
+        [(start, end, 0, key) for start, end, key in left] + [(start, end, 1, key) for start, end, key in right],
+        key=lambda interval: (interval[0], interval[1])
+    )
+    for sequence, (start, end, side, key) in enumerate(ordered):
+        for heap in active:
+            while heap and heap[0][0] <= start:
+                heapq.heappop(heap)
+        for _, _, other in active[1 - side]:
+            pairs.append((key, other) if side == 0 else (other, key))
+        heapq.heappush(active[side], (end, sequence, key))
+    return pairs
+
+def conflict_components(intervals):
+    """Group half-open intervals into connected components of the overlap graph.
+
+    After sorting by start, a component ends exactly where the next start is
+    at or past the furthest end seen so far, so one sweep finds them all in
+    O(n log n). intervals is an iterable of (start, end, key); returns a list
+    of (start, end, [keys]) in start order, where start/end span the component.
+    """
+    components = []
+    for start, end, key in sorted(intervals, key=lambda interval: (interval[0], interval[1])):
+        if components and start < components[-1][1]:
+            component = components[-1]
+            component[1] = max(component[1], end)
+            component[2].append(key)
+        else:
+            components.append([start, end, [key]])
+    return [tuple(component) for component in components]
@@ -0,0 +1,59 @@
+import json
+import uuid
+from datetime import date, datetime
+from decimal import Decimal
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+def _default(obj):
+    """Encode the types our models and queries hand to jsonify()"""
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    if isinstance(obj, uuid.UUID):
+        return str(obj)
+    if isinstance(obj, Decimal):
+        return float(obj)
+    # SQLAlchemy Row objects from column queries
+    if hasattr(obj, '_asdict'):
+        return obj._asdict()
+    if hasattr(obj, '__html__'):
+        return str(obj.__html__())
+    raise TypeError(f'Object of type {type(obj).__name__} is not JSON serializable')
+
+class FastJSONProvider(DefaultJSONProvider):
+    """JSON provider backed by orjson when installed, stdlib json otherwise.
+
+    Unlike Flask's default provider, datetimes are emitted as ISO 8601
+    (matching what to_dict() used to produce) so models can hand raw
+    datetime values straight to the encoder. Keys are not sorted.
+    """
+
+    default = staticmethod(_default)
+    ensure_ascii = False
+    sort_keys = False
+
+    def dumps(self, obj, **kwargs):
+        # orjson output is always compact; anything fancier goes to stdlib json
+        if orjson is not None and set(kwargs) <= {'separators'}:
+            return orjson.dumps(obj, default=self.default, option=orjson.OPT_NON_STR_KEYS).decode('utf-8')
+        return super().dumps(obj, **kwargs)
+
+    def loads(self, s, **kwargs):
+        if orjson is not None and not kwargs:
+            return orjson.loads(s)
+        return json.loads(s, **kwargs)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        pretty = (self.compact is None and self._app.debug) or self.compact is False
+
+        if orjson is not None and not pretty:
+            # Skip the bytes -> str -> bytes round trip of dumps()
+            body = orjson.dumps(obj, default=self.default, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_APPEND_NEWLINE)
+            return self._app.response_class(body, mimetype=self.mimetype)
+
+        return super().response(*args, **kwargs)
@@ -0,0 +1,211 @@
+import atexit
+import json
+import logging
+import os
+import queue
+import random
+import re
+import sys
+import time
+import uuid
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from flask import current_app, g, has_app_context, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from app.utils.json_provider import _default
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+# Attributes every LogRecord has; anything else was passed through extra=
+_RECORD_ATTRIBUTES = set(vars(logging.makeLogRecord({}))) | {'message', 'asctime', 'request_id'}
+
+# Incoming correlation ids are echoed back, so only accept plain tokens
+_REQUEST_ID = re.compile(r'^[A-Za-z0-9._:-]{1,64}$')
+
+class JSONFormatter(logging.Formatter):
+    """One JSON object per line: ts, level, logger, message, request_id and any extra fields"""
+
+    def format(self, record):
+        entry = {
+            'ts': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage()
+        }
+        if getattr(record, 'request_id', None):
+            entry['request_id'] = record.request_id
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES and not key.startswith('_'):
+                entry[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry['exc'] = record.exc_text
+
+        if orjson is not None:
+            return orjson.dumps(entry, default=_default).decode()
+        return json.dumps(entry, default=_default, ensure_ascii=False)
+
+class _ContextQueueHandler(QueueHandler):
+    """Hands records to the listener thread without ever blocking the caller.
+
+    The request id is captured here, on the request's own thread; messages
+    and tracebacks are rendered before the record crosses threads. When
+    the queue is full the record is dropped and counted instead.
+    """
+
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record):
+        record.request_id = g.get('request_id') if has_request_context() else None
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+class StructuredLogging:
+    """JSON logging through a QueueHandler/QueueListener, plus request logs.
+
+    Everything logged under the app's logger (app.logger and the app.*
+    module loggers) is queued and written by one background thread, so
+    request threads never wait on disk. Every request gets a correlation
+    id (the incoming X-Request-ID when it is a plain token, else a new
+    one). The id is echoed in the response and attached to each record
+    logged while the request runs.
+
+    One "request" record is logged per request, with method, path, status,
+    duration and database time. Errors and slow requests are always
+    logged; successful ones are sampled at LOG_SUCCESS_SAMPLE_RATE.
+    """
+
+    def __init__(self, app=None):
+        self.handler = None
+        self.listener = None
+        self._listening = False
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('LOG_LEVEL', 'INFO')
+        app.config.setdefault('LOG_FILE', 'logs/app.log')
+        app.config.setdefault('LOG_MAX_BYTES', 10 * 1024 * 1024)
+        app.config.setdefault('LOG_BACKUP_COUNT', 10)
+        app.config.setdefault('LOG_QUEUE_SIZE', 10000)
+        app.config.setdefault('LOG_SUCCESS_SAMPLE_RATE', 1.0)
+        app.config.setdefault('LOG_SLOW_REQUEST_MS', 1000)
+        app.config.setdefault('LOG_REQUEST_ID_HEADER', 'X-Request-ID')
+
+        formatter = JSONFormatter()
+        handlers = []
+        # Debug servers keep logging to the console only, as before
+        if app.config['LOG_FILE'] and not app.debug:
+            os.makedirs(os.path.dirname(app.config['LOG_FILE']) or '.', exist_ok=True)
+            handlers.append(RotatingFileHandler(
+                app.config['LOG_FILE'], maxBytes=app.config['LOG_MAX_BYTES'],
+                backupCount=app.config['LOG_BACKUP_COUNT'], encoding='utf-8'
+            ))
+        else:
+            handlers.append(logging.StreamHandler(sys.stderr))
+        for handler in handlers:
+            handler.setFormatter(formatter)
+
+        # Another app in the same process (tests, benchmarks) replaces the previous setup
+        logger = logging.getLogger(app.name)
+        if self.listener is not None:
+            self.listener.stop()
+            logger.removeHandler(self.handler)
+
+        self.handler = _ContextQueueHandler(queue.Queue(maxsize=app.config['LOG_QUEUE_SIZE']))
+        self.listener = QueueListener(self.handler.queue, *handlers, respect_handler_level=True)
+        self.listener.start()
+        atexit.register(self.listener.stop)
+
+        # Added before app.logger is first used, so Flask skips its default stderr handler
+        logger.addHandler(self.handler)
+        logger.setLevel(app.config['LOG_LEVEL'])
+        logger.propagate = False
+
+        app.before_request(self.before_request)
+        app.after_request(self.after_request)
+        if not self._listening:
+            event.listen(Engine, 'before_cursor_execute', self._before_cursor_execute)
+            event.listen(Engine, 'after_cursor_execute', self._after_cursor_execute)
+            self._listening = True
+
+    def stats(self):
+        return {
+            'queued': self.handler.queue.qsize() if self.handler else 0,
+            'dropped': self.handler.dropped if self.handler else 0
+        }
+
+    def before_request(self):
+        incoming = request.headers.get(current_app.config['LOG_REQUEST_ID_HEADER'], '')
+        g.request_id = incoming if _REQUEST_ID.match(incoming) else uuid.uuid4().hex
+        g.request_started = time.perf_counter()
+        g.db_time = 0.0
+        g.db_queries = 0
+
+    def after_request(self, response):
+        if 'request_id' not in g:
+            return response
+        config = current_app.config
+        response.headers[config['LOG_REQUEST_ID_HEADER']] = g.request_id
+
+        duration_ms = (time.perf_counter() - g.request_started) * 1000
+        status = response.status_code
+        if status >= 500:
+            level = logging.ERROR
+        elif status >= 400:
+            level = logging.WARNING
+        elif duration_ms >= config['LOG_SLOW_REQUEST_MS'] or random.random() < config['LOG_SUCCESS_SAMPLE_RATE']:
+            level = logging.INFO
+        else:
+            return response
+
+        current_app.logger.log(level, '%s %s %s', request.method, request.path, status, extra={
+            'event': 'request',
+            'method': request.method,
+            'path': request.path,
+            'endpoint': request.endpoint,
+            'status': status,
+            'duration_ms': round(duration_ms, 2),
+            'db_ms': round(g.db_time * 1000, 2),
+            'db_queries': g.db_queries,
+            'user_id': self._user_id(),
+            'remote_addr': request.remote_addr,
+            'response_bytes': None if response.is_streamed else response.content_length
+        })
+        return response
+
+    @staticmethod
+    def _user_id():
+        from flask_jwt_extended import get_jwt_identity
+        try:
+            return get_jwt_identity()
+        except RuntimeError:  # no token was verified for this request
+            return None
+
+    @staticmethod
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if has_app_context() and 'db_time' in g:
+            conn.info.setdefault('log_query_started', []).append(time.perf_counter())
+
+    @staticmethod
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if has_app_context() and 'db_time' in g and conn.info.get('log_query_started'):
+            g.db_time += time.perf_counter() - conn.info['log_query_started'].pop()
+            g.db_queries += 1
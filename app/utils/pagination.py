@@ -0,0 +1,17 @@
+import base64
+from datetime import datetime
+
+def encode_cursor(timestamp, row_id):
+    """Encode a (timestamp, id) keyset position as an opaque token"""
+    raw = f"{timestamp.isoformat()}|{row_id}"
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii').rstrip('=')
+
+def decode_cursor(token):
+    """Decode a token produced by encode_cursor into (timestamp, id)"""
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        raw = base64.urlsafe_b64decode(padded.encode('ascii')).decode('utf-8')
+        timestamp, row_id = raw.split('|', 1)
+        return datetime.fromisoformat(timestamp), row_id
+    except Exception:
+        raise ValueError('Invalid cursor')
@@ -0,0 +1,287 @@
+import cProfile
+import glob
+import json
+import os
+import pstats
+import random
+import time
+import uuid
+from collections import defaultdict
+from datetime import datetime
+from flask import current_app, g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+MAX_STACK_DEPTH = 128
+
+class Profiler:
+    """Opt-in cProfile of single requests, with SQL time measured separately.
+
+    With PROFILER_ENABLED set, a request is profiled when an admin sends the
+    PROFILER_HEADER header or when it falls within PROFILER_SAMPLE_RATE.
+    The profile covers before_request to after_request (the view, JSON
+    encoding and compression, but not the body of streamed responses).
+    Each profiled request writes three files to PROFILER_DIR/<endpoint>/:
+
+        <id>.pstats     cProfile data for pstats, snakeviz and the like
+        <id>.collapsed  folded stacks in microseconds (flamegraph.pl, speedscope)
+        <id>.json       status, wall time, and SQL time per statement
+
+    The response carries the id in X-Profile-Id; `flask profile-report`
+    aggregates the files per endpoint. When disabled, nothing is registered.
+    """
+
+    def __init__(self, app=None):
+        self._listening = False
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('PROFILER_ENABLED', False)
+        app.config.setdefault('PROFILER_SAMPLE_RATE', 0.0)
+        app.config.setdefault('PROFILER_HEADER', 'X-Profile')
+        if not app.config.get('PROFILER_DIR'):
+            app.config['PROFILER_DIR'] = os.path.join(app.instance_path, 'profiles')
+
+        if not app.config['PROFILER_ENABLED']:
+            return
+
+        app.before_request(self.before_request)
+        app.after_request(self.after_request)
+        app.teardown_request(self.teardown_request)
+        if not self._listening:
+            event.listen(Engine, 'before_cursor_execute', self._before_cursor_execute)
+            event.listen(Engine, 'after_cursor_execute', self._after_cursor_execute)
+            self._listening = True
+
+    @staticmethod
+    def _requested_by_admin():
+        from flask_jwt_extended import get_jwt_identity, verify_jwt_in_request
+        from app import db
+        from app.models.user import User
+
+        try:
+            verify_jwt_in_request(optional=True)
+        except Exception:
+            return False
+        identity = get_jwt_identity()
+        user = db.session.get(User, identity) if identity else None
+        return bool(user and user.is_admin())
+
+    def trigger(self):
+        """'header', 'sample' or None when this request is not profiled"""
+        config = current_app.config
+        if request.headers.get(config['PROFILER_HEADER']):
+            return 'header' if self._requested_by_admin() else None
+        rate = config['PROFILER_SAMPLE_RATE']
+        return 'sample' if rate > 0 and random.random() < rate else None
+
+    def before_request(self):
+        trigger = self.trigger()
+        if trigger is None:
+            return
+
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:  # another profiler (or debugger) is active on this thread
+            return
+        g.profile = {
+            'profiler': profiler,
+            'trigger': trigger,
+            'started': time.perf_counter(),
+            'sql': defaultdict(lambda: [0, 0.0])  # statement -> [executions, seconds]
+        }
+
+    def after_request(self, response):
+        state = g.pop('profile', None)
+        if state is None:
+            return response
+
+        state['profiler'].disable()
+        wall = time.perf_counter() - state['started']
+        try:
+            response.headers['X-Profile-Id'] = self.write(state, response.status_code, wall)
+        except OSError:
+            current_app.logger.exception('Could not write the request profile')
+        return response
+
+    def teardown_request(self, exc=None):
+        # after_request is skipped for unhandled errors; never leave a profiler running
+        state = g.pop('profile', None)
+        if state is not None:
+            state['profiler'].disable()
+
+    @staticmethod
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if has_request_context() and 'profile' in g:
+            conn.info.setdefault('profile_started', []).append(time.perf_counter())
+
+    @staticmethod
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if has_request_context() and 'profile' in g and conn.info.get('profile_started'):
+            entry = g.profile['sql'][statement]
+            entry[0] += 1
+            entry[1] += time.perf_counter() - conn.info['profile_started'].pop()
+
+    def write(self, state, status, wall):
+        endpoint = request.endpoint or 'unmatched'
+        directory = os.path.join(current_app.config['PROFILER_DIR'], endpoint)
+        os.makedirs(directory, exist_ok=True)
+        profile_id = f'{datetime.utcnow():%Y%m%dT%H%M%S%f}-{uuid.uuid4().hex[:6]}'
+        base = os.path.join(directory, profile_id)
+
+        profiler = state['profiler']
+        profiler.dump_stats(base + '.pstats')
+        write_collapsed(base + '.collapsed', collapsed_stacks(pstats.Stats(profiler)))
+
+        statements = sorted(state['sql'].items(), key=lambda item: item[1][1], reverse=True)
+        sql_time = sum(seconds for _, seconds in state['sql'].values())
+        with open(base + '.json', 'w') as f:
+            json.dump({
+                'id': profile_id,
+                'endpoint': endpoint,
+                'method': request.method,
+                'path': request.full_path.rstrip('?'),
+                'status': status,
+                'trigger': state['trigger'],
+                'created_at': datetime.utcnow().isoformat(),
+                'wall_ms': round(wall * 1000, 3),
+                'sql_ms': round(sql_time * 1000, 3),
+                'sql_count': sum(count for count, _ in state['sql'].values()),
+                'statements': [
+                    {'statement': statement, 'count': count, 'time_ms': round(seconds * 1000, 3)}
+                    for statement, (count, seconds) in statements[:20]
+                ]
+            }, f, indent=2)
+        return profile_id
+
+def frame_label(func):
+    filename, lineno, name = func
+    if filename == '~':  # built-ins
+        label = name
+    else:
+        parts = filename.replace('\\', '/').split('/')
+        label = f"{name} ({'/'.join(parts[-2:])}:{lineno})"
+    return label.replace(';', ',')
+
+def collapsed_stacks(stats):
+    """Folded stacks {"root;...;leaf": microseconds} reconstructed from cProfile.
+
+    cProfile keeps caller -> callee edges, not whole stacks, so each
+    function's time is split over its callers in proportion to the time
+    spent on each edge, as flameprof and gprof2dot do. Recursive edges are
+    cut, leaving their time with the outer frame.
+    """
+    children = defaultdict(dict)
+    for func, (_, _, _, _, callers) in stats.stats.items():
+        for caller, edge in callers.items():
+            children[caller][func] = edge[3]
+
+    folded = defaultdict(float)
+    on_path = set()
+
+    def walk(func, path, seconds):
+        _, _, own, total, _ = stats.stats[func]
+        share = seconds / total if total else 0.0
+        path = path + (frame_label(func),)
+        folded[';'.join(path)] += own * share
+        if len(path) >= MAX_STACK_DEPTH:
+            return
+        on_path.add(func)
+        for callee, edge_seconds in children[func].items():
+            if callee not in on_path and edge_seconds * share >= 1e-6:
+                walk(callee, path, edge_seconds * share)
+        on_path.discard(func)
+
+    for func, (_, _, _, total, callers) in stats.stats.items():
+        if not callers:
+            walk(func, (), total)
+
+    return {stack: round(seconds * 1e6) for stack, seconds in folded.items() if seconds >= 5e-7}
+
+def write_collapsed(path, stacks):
+    with open(path, 'w') as f:
+        for stack, micros in sorted(stacks.items()):
+            f.write(f'{stack} {micros}\n')
+
+def read_collapsed(path):
+    stacks = {}
+    with open(path) as f:
+        for line in f:
+            stack, _, micros = line.rstrip('\n').rpartition(' ')
+            if stack:
+                stacks[stack] = stacks.get(stack, 0) + int(micros)
+    return stacks
+
+def percentile(ordered, pct):
+    return ordered[min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered) + 0.5) - 1))]
+
+def summarize(directory, endpoint=None, top=20, sort='cumulative'):
+    """Aggregate the profiles of each endpoint found in directory.
+
+    Also writes <directory>/<endpoint>.collapsed, the folded stacks of all
+    of the endpoint's requests summed, ready for a flame graph.
+    """
+    endpoints = sorted(
+        name for name in os.listdir(directory)
+        if os.path.isdir(os.path.join(directory, name)) and (endpoint is None or name == endpoint)
+    ) if os.path.isdir(directory) else []
+
+    summaries = []
+    for name in endpoints:
+        folder = os.path.join(directory, name)
+        metas = []
+        for path in sorted(glob.glob(os.path.join(folder, '*.json'))):
+            with open(path) as f:
+                metas.append(json.load(f))
+        if not metas:
+            continue
+
+        walls = sorted(meta['wall_ms'] for meta in metas)
+        sql_ms = sum(meta['sql_ms'] for meta in metas)
+        statements = defaultdict(lambda: [0, 0.0])
+        for meta in metas:
+            for item in meta['statements']:
+                statements[item['statement']][0] += item['count']
+                statements[item['statement']][1] += item['time_ms']
+
+        stats = pstats.Stats(*sorted(glob.glob(os.path.join(folder, '*.pstats'))))
+        key = {'cumulative': 3, 'tottime': 2, 'ncalls': 1}[sort]
+        functions = sorted(stats.stats.items(), key=lambda item: item[1][key], reverse=True)[:top]
+
+        stacks = defaultdict(int)
+        for path in glob.glob(os.path.join(folder, '*.collapsed')):
+            for stack, micros in read_collapsed(path).items():
+                stacks[stack] += micros
+        merged = os.path.join(directory, f'{name}.collapsed')
+        write_collapsed(merged, stacks)
+
+        summaries.append({
+            'endpoint': name,
+            'requests': len(metas),
+            'wall_ms': {
+                'mean': round(sum(walls) / len(walls), 3),
+                'p50': percentile(walls, 50),
+                'p95': percentile(walls, 95),
+                'max': walls[-1]
+            },
+            'sql_ms_mean': round(sql_ms / len(metas), 3),
+            'sql_share': round(sql_ms / sum(walls), 4) if sum(walls) else 0.0,
+            'sql_count_mean': round(sum(meta['sql_count'] for meta in metas) / len(metas), 1),
+            'statements': [
+                {'statement': statement, 'count': count, 'time_ms': round(time_ms, 3)}
+                for statement, (count, time_ms) in sorted(statements.items(), key=lambda item: item[1][1], reverse=True)[:top]
+            ],
+            'functions': [
+                {
+                    'function': frame_label(func),
+                    'ncalls': ncalls,
+                    'tottime_ms': round(own * 1000 / len(metas), 3),
+                    'cumtime_ms': round(total * 1000 / len(metas), 3)
+                }
+                for func, (_, ncalls, own, total, _) in functions
+            ],
+            'collapsed': merged
+        })
+    return summaries
@@ -0,0 +1,71 @@
+from datetime import datetime, date, timedelta
+
+WEEKDAY_CODES = ('MO', 'TU', 'WE', 'TH', 'FR', 'SA', 'SU')
+
+def parse_weekdays(value):
+    """Weekdays as a sorted tuple of ints (Monday=0) from ints, digit strings or BYDAY codes"""
+    if isinstance(value, str):
+        value = value.split(',')
+    if not isinstance(value, (list, tuple)) or not value:
+        raise ValueError('weekdays must be a non-empty list')
+
+    weekdays = set()
+    for day in value:
+        if isinstance(day, str) and day.strip().isdigit():
+            day = int(day)
+        if isinstance(day, str) and day.strip().upper() in WEEKDAY_CODES:
+            weekdays.add(WEEKDAY_CODES.index(day.strip().upper()))
+        elif isinstance(day, int) and not isinstance(day, bool) and 0 <= day <= 6:
+            weekdays.add(day)
+        else:
+            raise ValueError(f'Invalid weekday: {day!r}')
+    return tuple(sorted(weekdays))
+
+def parse_dates(value):
+    """A list of ISO dates (or datetimes) as a set of date objects"""
+    if not value:
+        return set()
+    if isinstance(value, str):
+        value = value.split(',')
+    return {date.fromisoformat(str(item).strip()[:10]) for item in value if str(item).strip()}
+
+def weekly_starts(dtstart, weekdays, interval=1, until=None, exdates=(), window_start=None, window_end=None, duration=timedelta(0)):
+    """Start times of an RRULE-style FREQ=WEEKLY series, in order.
+
+    Occurrences repeat at dtstart's time of day on the given weekdays of
+    every interval-th week (weeks start on Monday, counted from dtstart's
+    week), never before dtstart and never after until. Only occurrences
+    overlapping [window_start, window_end) are produced, and the sweep jumps
+    straight to the window's first week, so the cost follows the window
+    rather than the age of the series. Needs until or window_end to stop.
+    """
+    if until is None and window_end is None:
+        raise ValueError('An unbounded series needs a window end')
+
+    anchor = datetime.combine(dtstart.date() - timedelta(days=dtstart.weekday()), dtstart.time())
+    week = 0
+    if window_start is not None and window_start - duration > anchor:
+        week = (window_start - duration - anchor).days // 7
+        week -= week % interval
+
+    exdates = set(exdates)
+    while True:
+        week_start = anchor + timedelta(weeks=week)
+        if (until is not None and week_start > until) or (window_end is not None and week_start >= window_end):
+            return
+        for weekday in weekdays:
+            start = week_start + timedelta(days=weekday)
+            if start < dtstart or start.date() in exdates:
+                continue
+            if (until is not None and start > until) or (window_end is not None and start >= window_end):
+                return
+            if window_start is not None and start + duration <= window_start:
+                continue
+            yield start
+        week += interval
+
+def nth_start(dtstart, weekdays, interval, count):
+    """Start of the count-th occurrence (exceptions included), to turn COUNT into UNTIL"""
+    for number, start in enumerate(weekly_starts(dtstart, weekdays, interval, window_end=datetime.max), 1):
+        if number == count:
+            return start
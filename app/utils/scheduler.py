@@ -0,0 +1,140 @@
+import os
+import threading
+import time
+from flask import current_app
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows has no fcntl
+    fcntl = None
+
+class Scheduler:
+    """Runs periodic jobs on one background thread per deployment.
+
+    Every worker process starts a thread lazily on its first request, but
+    only the one holding an exclusive lock on SCHEDULER_LOCK_FILE runs jobs;
+    the others keep retrying the lock, so a new leader takes over within one
+    tick when the current one exits. Without fcntl (Windows) every process
+    considers itself the leader, which is fine for a single dev server.
+    """
+
+    def __init__(self, app=None):
+        self.app = None
+        self.jobs = {}
+        self.is_leader = False
+        self._thread = None
+        self._lock_file = None
+        self._stop = threading.Event()
+        self._start_lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('SCHEDULER_ENABLED', False)
+        app.config.setdefault('SCHEDULER_TICK', 5)
+        if not app.config.get('SCHEDULER_LOCK_FILE'):
+            app.config['SCHEDULER_LOCK_FILE'] = os.path.join(app.instance_path, 'scheduler.lock')
+
+        self.app = app
+        if app.config['SCHEDULER_ENABLED'] and not app.testing:
+            app.before_request(self.ensure_started)
+
+    def add_job(self, name, func, interval):
+        """Run func() inside an app context every interval seconds"""
+        self.jobs[name] = {
+            'func': func,
+            'interval': interval,
+            'last_run': None,
+            'last_duration': None,
+            'last_error': None,
+            'runs': 0
+        }
+
+    def ensure_started(self):
+        if self._thread is not None:
+            return
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='scheduler', daemon=True)
+                self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+        self._release_leadership()
+
+    def _acquire_leadership(self):
+        if fcntl is None:
+            return True
+
+        path = self.app.config['SCHEDULER_LOCK_FILE']
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        lock_file = open(path, 'a+')
+        try:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
+            return False
+
+        lock_file.seek(0)
+        lock_file.truncate()
+        lock_file.write(str(os.getpid()))
+        lock_file.flush()
+        self._lock_file = lock_file
+        return True
+
+    def _release_leadership(self):
+        if self._lock_file is not None:
+            self._lock_file.close()  # closing the descriptor releases the flock
+            self._lock_file = None
+        self.is_leader = False
+
+    def run_pending(self, now=None):
+        """Run every job whose interval has elapsed"""
+        now = time.monotonic() if now is None else now
+        for name, job in self.jobs.items():
+            if job['last_run'] is not None and now - job['last_run'] < job['interval']:
+                continue
+
+            began = time.perf_counter()
+            with self.app.app_context():
+                from app import db
+                try:
+                    job['func']()
+                    job['last_error'] = None
+                except Exception as e:
+                    db.session.rollback()
+                    job['last_error'] = str(e)
+                    current_app.logger.exception('Scheduled job %s failed', name)
+                finally:
+                    db.session.remove()
+
+            job['last_run'] = now
+            job['last_duration'] = time.perf_counter() - began
+            job['runs'] += 1
+
+    def _run(self):
+        tick = self.app.config['SCHEDULER_TICK']
+        while not self._stop.is_set():
+            if not self.is_leader:
+                self.is_leader = self._acquire_leadership()
+            if self.is_leader:
+                self.run_pending()
+            self._stop.wait(tick)
+
+    def status(self):
+        return {
+            'running': self._thread is not None and self._thread.is_alive(),
+            'leader': self.is_leader,
+            'pid': os.getpid(),
+            'jobs': {
+                name: {
+                    'interval': job['interval'],
+                    'runs': job['runs'],
+                    'last_duration_ms': round(job['last_duration'] * 1000, 2) if job['last_duration'] is not None else None,
+                    'last_error': job['last_error']
+                }
+                for name, job in self.jobs.items()
+            }
+        }
@@ -1,8 +1,11 @@
 import bcrypt
 import jwt
+import logging
 from datetime import datetime, timedelta
 from flask import current_app
 
+logger = logging.getLogger(__name__)
+
 def hash_password(password):
     """Hash a password using bcrypt"""
     try:
@@ -12,7 +15,7 @@ def hash_password(password):
         hashed = bcrypt.hashpw(password, salt)
         return hashed.decode('utf-8')
     except Exception as e:
-        print(f"Password hashing error: {e}")
+        logger.exception('Password hashing error')
         raise e
 
 def verify_password(password, hashed_password):
@@ -24,7 +27,8 @@ def verify_password(password, hashed_password):
             hashed_password = hashed_password.encode('utf-8')
         return bcrypt.checkpw(password, hashed_password)
     except Exception as e:
-        print(f"Password verification error: {e}")
+        # A malformed stored hash; the login simply fails
+        logger.warning('Password verification error: %s', e)
         return False
 
 def generate_jwt_token(user_id, token_type='access'):
@@ -38,6 +42,7 @@ def generate_jwt_token(user_id, token_type='access'):
         expires = datetime.utcnow() + expires_delta
         
         payload = {
+            'sub': user_id,  # identity claim read by flask_jwt_extended
             'user_id': user_id,
             'type': token_type,
             'exp': expires,
@@ -52,7 +57,7 @@ def generate_jwt_token(user_id, token_type='access'):
             algorithm='HS256'
         )
     except Exception as e:
-        print(f"JWT generation error: {e}")
+        logger.exception('JWT generation error')
         raise e
 
 def verify_jwt_token(token):
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Compare the JSON encoding path for a large schedule response.
+
+legacy: the old Reservation.to_dict() (isoformat() per datetime) encoded
+        by Flask's default stdlib provider with sorted keys
+current: the compiled Reservation encoder encoded by FastJSONProvider
+        (orjson when installed)
+
+Usage: python benchmarks/json_encoding.py [rows] [repeats]
+"""
+
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+from app.models.user import User
+from app.models.lab import Lab, Reservation
+from app.utils import json_provider
+from app.utils.json_provider import FastJSONProvider
+
+def legacy_to_dict(reservation):
+    """Reservation.to_dict() as it was before the compiled encoders"""
+    return {
+        'id': reservation.id,
+        'instructor_id': reservation.instructor_id,
+        'lab_id': reservation.lab_id,
+        'course_code': reservation.course_code,
+        'course_name': reservation.course_name,
+        'section': reservation.section,
+        'student_count': reservation.student_count,
+        'start_time': reservation.start_time.isoformat(),
+        'end_time': reservation.end_time.isoformat(),
+        'duration_minutes': reservation.duration_minutes,
+        'status': reservation.status,
+        'purpose': reservation.purpose,
+        'admin_notes': reservation.admin_notes,
+        'rejection_reason': reservation.rejection_reason,
+        'created_at': reservation.created_at.isoformat(),
+        'updated_at': reservation.updated_at.isoformat(),
+        'instructor_name': reservation.instructor.full_name if reservation.instructor else 'Unknown',
+        'lab_name': reservation.lab.name if reservation.lab else 'Unknown'
+    }
+
+def build_rows(count):
+    instructor = User(id='u-1', username='jsmith', first_name='Jane', last_name='Smith')
+    labs = [Lab(id=f'lab-{i}', name=f'Computer Lab {i}') for i in range(10)]
+    start = datetime(2025, 1, 6, 8, 0)
+    rows = []
+    for i in range(count):
+        begins = start + timedelta(hours=i)
+        rows.append(Reservation(
+            id=f'res-{i:06d}',
+            instructor_id=instructor.id,
+            lab_id=labs[i % 10].id,
+            course_code=f'CS{100 + i % 50}',
+            course_name='Introduction to Programming',
+            section='A',
+            student_count=30,
+            start_time=begins,
+            end_time=begins + timedelta(minutes=90),
+            duration_minutes=90,
+            status='approved',
+            purpose='Weekly lab session',
+            admin_notes='',
+            rejection_reason=None,
+            created_at=start,
+            updated_at=start,
+            instructor=instructor,
+            lab=labs[i % 10]
+        ))
+    return rows
+
+def best_of(repeats, func):
+    timings = []
+    for _ in range(repeats):
+        began = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - began)
+    return min(timings)
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    rows = build_rows(count)
+
+    legacy_app = Flask('legacy')
+    legacy_app.json = DefaultJSONProvider(legacy_app)
+    current_app = Flask('current')
+    current_app.json = FastJSONProvider(current_app)
+
+    def legacy():
+        with legacy_app.app_context():
+            legacy_app.json.response({'success': True, 'schedule': [legacy_to_dict(r) for r in rows]})
+
+    def current():
+        with current_app.app_context():
+            current_app.json.response({'success': True, 'schedule': Reservation.serialize_many(rows)})
+
+    legacy_time = best_of(repeats, legacy)
+    current_time = best_of(repeats, current)
+
+    backend = 'orjson' if json_provider.orjson is not None else 'stdlib json'
+    print(f'Encoding {count} reservations (best of {repeats}), provider backend: {backend}')
+    print(f'  legacy:  {legacy_time * 1000:8.1f} ms')
+    print(f'  current: {current_time * 1000:8.1f} ms')
+    print(f'  speedup: {legacy_time / current_time:8.2f}x')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,567 @@
+#!/usr/bin/env python3
+"""
+HTTP load test with scenario profiles.
+
+Virtual users (threads) log in with the accounts created by
+`flask generate-data` and repeat a profile's journey until the duration or
+iteration budget is spent. Requests go either through app.test_client()
+in this process or over HTTP to a running server (--target URL), optionally
+a gunicorn this script starts and stops itself (--gunicorn).
+
+Profiles:
+  login-storm       everyone logs in at once (bcrypt bound)
+  booking-burst     registration week: instructors read a lab's week and book slots
+  dashboard-browse  dashboard, tasks, notifications, schedule and search reads
+  admin-triage      admins review pending conflict clusters and bulk-decide them
+
+Writing profiles (booking-burst, admin-triage) change the database, so point
+them at a copy. The rate limiter is switched off for in-process runs and for
+--gunicorn; a server started by hand needs RATELIMIT_ENABLED=false.
+
+The JSON report holds p50/p95/p99 latency, throughput and error rate per
+endpoint; --compare prints the change against an earlier report.
+
+Usage:
+  python benchmarks/loadtest.py dashboard-browse --database sqlite:////tmp/gen.db --concurrency 20 --duration 30
+  python benchmarks/loadtest.py booking-burst --gunicorn --workers 4 --compare benchmarks/results/last.json
+"""
+
+import argparse
+import http.client
+import json
+import math
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from urllib.parse import urlencode, urlsplit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+SEARCH_TERMS = ('Networking', 'Programming', 'Database', 'Security', 'Lab', 'Capstone', 'Web')
+
+# Profile name -> Profile; filled by @profile
+PROFILES = {}
+
+class Profile:
+    def __init__(self, name, role, description, step, expected):
+        self.name = name
+        self.role = role
+        self.description = description
+        self.step = step
+        self.expected = expected
+
+def profile(name, role, description, expected=(200,)):
+    """Register a function(user) running one iteration of a user journey"""
+    def decorator(func):
+        PROFILES[name] = Profile(name, role, description, func, expected)
+        return func
+    return decorator
+
+# Transports
+
+class InProcessTransport:
+    """Drives the app through one test client per thread"""
+
+    def __init__(self, app):
+        self.app = app
+        self._local = threading.local()
+
+    def request(self, method, path, body=None, headers=None):
+        client = getattr(self._local, 'client', None)
+        if client is None:
+            client = self._local.client = self.app.test_client()
+        response = client.open(path, method=method, json=body, headers=headers)
+        return response.status_code, response.get_data()
+
+class HttpTransport:
+    """Keep-alive HTTP/1.1 connection per thread; reconnects when the server closes it"""
+
+    def __init__(self, base_url, timeout=30):
+        parts = urlsplit(base_url)
+        self.host = parts.hostname
+        self.port = parts.port or (443 if parts.scheme == 'https' else 80)
+        self.connection_class = http.client.HTTPSConnection if parts.scheme == 'https' else http.client.HTTPConnection
+        self.prefix = parts.path.rstrip('/')
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def request(self, method, path, body=None, headers=None):
+        headers = dict(headers or {})
+        payload = None
+        if body is not None:
+            payload = json.dumps(body).encode()
+            headers['Content-Type'] = 'application/json'
+
+        for attempt in (1, 2):
+            connection = getattr(self._local, 'connection', None)
+            if connection is None:
+                connection = self._local.connection = self.connection_class(self.host, self.port, timeout=self.timeout)
+            try:
+                connection.request(method, self.prefix + path, body=payload, headers=headers)
+                response = connection.getresponse()
+                return response.status, response.read()
+            except (http.client.HTTPException, OSError):
+                connection.close()
+                self._local.connection = None
+                if attempt == 2:
+                    return 0, b''  # status 0: the request never got an answer
+
+def start_gunicorn(workers, port, env):
+    """Start gunicorn on run:app and wait until /health answers"""
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', '--workers', str(workers), '--bind', f'127.0.0.1:{port}', 'run:app'],
+        cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    transport = HttpTransport(f'http://127.0.0.1:{port}', timeout=2)
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f'gunicorn exited with code {process.returncode}')
+        if transport.request('GET', '/health')[0] == 200:
+            return process
+        time.sleep(0.25)
+    process.terminate()
+    raise RuntimeError('gunicorn did not become ready within 60s')
+
+# Statistics
+
+def percentile(ordered, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    if not ordered:
+        return None
+    return ordered[min(len(ordered) - 1, max(0, math.ceil(pct / 100 * len(ordered)) - 1))]
+
+class Stats:
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.statuses = defaultdict(lambda: defaultdict(int))
+        self.errors = defaultdict(int)
+        self.iterations = 0
+        self.iteration_errors = 0
+        self._lock = threading.Lock()
+
+    def record(self, name, seconds, status, ok):
+        with self._lock:
+            self.latencies[name].append(seconds * 1000)
+            self.statuses[name][status] += 1
+            if not ok:
+                self.errors[name] += 1
+
+    def finish_iteration(self, failed=False):
+        with self._lock:
+            self.iterations += 1
+            if failed:
+                self.iteration_errors += 1
+
+    def report(self, elapsed):
+        endpoints = {}
+        for name in sorted(self.latencies):
+            ordered = sorted(self.latencies[name])
+            count = len(ordered)
+            endpoints[name] = {
+                'count': count,
+                'errors': self.errors[name],
+                'error_rate': round(self.errors[name] / count, 4),
+                'throughput_rps': round(count / elapsed, 2),
+                'status_counts': {str(status): n for status, n in sorted(self.statuses[name].items())},
+                'latency_ms': {
+                    'min': round(ordered[0], 2),
+                    'mean': round(sum(ordered) / count, 2),
+                    'p50': round(percentile(ordered, 50), 2),
+                    'p95': round(percentile(ordered, 95), 2),
+                    'p99': round(percentile(ordered, 99), 2),
+                    'max': round(ordered[-1], 2)
+                }
+            }
+
+        everything = sorted(latency for latencies in self.latencies.values() for latency in latencies)
+        requests = len(everything)
+        errors = sum(self.errors.values())
+        return {
+            'requests': requests,
+            'errors': errors,
+            'error_rate': round(errors / requests, 4) if requests else 0.0,
+            'throughput_rps': round(requests / elapsed, 2),
+            'iterations': self.iterations,
+            'iteration_errors': self.iteration_errors,
+            'latency_ms': {
+                'p50': round(percentile(everything, 50), 2) if requests else None,
+                'p95': round(percentile(everything, 95), 2) if requests else None,
+                'p99': round(percentile(everything, 99), 2) if requests else None
+            },
+            'endpoints': endpoints
+        }
+
+class Pacer:
+    """Spaces iteration starts across all threads to a total rate (per second)"""
+
+    def __init__(self, rate):
+        self.interval = 1 / rate
+        self.next_slot = time.monotonic()
+        self._lock = threading.Lock()
+
+    def wait(self):
+        with self._lock:
+            slot = max(self.next_slot, time.monotonic())
+            self.next_slot = slot + self.interval
+        delay = slot - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+# Virtual users
+
+class VirtualUser:
+    def __init__(self, harness, number, login, password, token=None):
+        self.harness = harness
+        self.number = number
+        self.login = login
+        self.password = password
+        self.token = token
+        self.rng = random.Random(harness.seed * 100003 + number)
+        self.context = harness.context
+
+    def request(self, method, path, name=None, params=None, body=None, expect=None, record=True):
+        """Send one request and record its latency under name (default "METHOD path").
+
+        Returns (status, decoded JSON body or None).
+        """
+        headers = {'Authorization': f'Bearer {self.token}'} if self.token else {}
+        url = f'{path}?{urlencode(params)}' if params else path
+        began = time.perf_counter()
+        status, raw = self.harness.transport.request(method, url, body, headers)
+        elapsed = time.perf_counter() - began
+        if record:
+            ok = status in (expect or self.harness.profile.expected)
+            self.harness.stats.record(name or f'{method} {path}', elapsed, status, ok)
+        try:
+            return status, json.loads(raw) if raw else None
+        except ValueError:
+            return status, None
+
+    def authenticate(self):
+        status, body = self.request('POST', '/auth/login', body={'login': self.login, 'password': self.password}, record=False)
+        if status != 200:
+            raise RuntimeError(f'Login as {self.login} failed with status {status}')
+        self.token = body['data']['access_token']
+
+@profile('login-storm', 'student', 'Everyone logs in at once')
+def login_storm(user):
+    user.request('POST', '/auth/login', body={'login': user.login, 'password': user.password})
+
+@profile('booking-burst', 'instructor', 'Registration week: read a lab week, then book a slot', expected=(200, 201, 400))
+def booking_burst(user):
+    # 400 is the expected answer when the slot is already taken
+    week_start = user.context['week_start']
+    lab_id = user.rng.choice(user.context['lab_ids'])
+    user.request('GET', '/api/schedule', params={
+        'lab_id': lab_id,
+        'from': week_start.isoformat(),
+        'to': (week_start + timedelta(days=7)).isoformat()
+    }, expect=(200,))
+
+    start = week_start + timedelta(days=user.rng.randrange(7), hours=user.rng.randrange(7, 21))
+    user.request('POST', '/api/reservations', body={
+        'lab_id': lab_id,
+        'course_code': 'LT101',
+        'course_name': 'Load test section',
+        'section': f'L{user.number % 100}',
+        'student_count': 30,
+        'start_time': start.isoformat(),
+        'end_time': (start + timedelta(hours=user.rng.choice((1, 2)))).isoformat(),
+        'purpose': 'Load test'
+    })
+
+@profile('dashboard-browse', 'student', 'Dashboard, tasks, notifications, schedule and search reads')
+def dashboard_browse(user):
+    # The full bundle, as the SPA loads it; its reservations are one keyset page
+    user.request('GET', '/api/dashboard')
+    user.request('GET', '/api/tasks', params={'limit': 20})
+    user.request('GET', '/api/tasks/stats')
+    user.request('GET', '/api/notifications', params={'limit': 20})
+    user.request('GET', '/api/schedule', params={
+        'lab_id': user.rng.choice(user.context['lab_ids']),
+        'date': date.today().isoformat()
+    })
+    if user.rng.random() < 0.2:
+        user.request('GET', '/api/search', params={'q': user.rng.choice(SEARCH_TERMS)})
+
+@profile('admin-triage', 'admin', 'Review pending conflict clusters and bulk-decide one')
+def admin_triage(user):
+    _, body = user.request('GET', '/api/reservations/pending/clusters', params={
+        'include_singletons': 'true',
+        'to': (datetime.utcnow() + timedelta(days=14)).isoformat()
+    })
+    clusters = (body or {}).get('clusters') or []
+    if clusters:
+        # Approve one member of a cluster and reject the rest; recurring
+        # occurrences ("series:start" ids) are decided through their series
+        members = [m['id'] for m in user.rng.choice(clusters)['members'] if ':' not in m['id']]
+        if members:
+            user.request('POST', '/api/reservations/bulk-decision', body={'decisions': [
+                {'id': member_id, 'decision': 'approve' if index == 0 else 'reject', 'note': 'Load test triage'}
+                for index, member_id in enumerate(members)
+            ]})
+    user.request('GET', '/api/stats')
+
+# Harness
+
+class Harness:
+    def __init__(self, args, profile, transport, app=None):
+        self.args = args
+        self.profile = profile
+        self.transport = transport
+        self.app = app
+        self.seed = args.seed
+        self.stats = Stats()
+        self.context = {}
+        self.stopping = threading.Event()
+        self.pacer = Pacer(args.rate) if args.rate else None
+        self._budget = args.iterations
+        self._budget_lock = threading.Lock()
+
+    def credentials(self, number):
+        from app.services.data_generator import DataGenerator
+        role = self.args.role or self.profile.role
+        if role == 'admin':
+            return self.args.admin_login, self.args.admin_password
+        count = self.args.instructors if role == 'instructor' else self.args.students
+        return DataGenerator.username(self.args.prefix, role, number % count, count), self.args.password
+
+    def admin_token(self):
+        """Without admin credentials an in-process run signs a token for the first admin"""
+        if self.args.admin_login or self.app is None:
+            return None
+        from flask_jwt_extended import create_access_token
+        from app.models.user import User, UserRole
+        with self.app.app_context():
+            admin = User.query.filter_by(role=UserRole.ADMIN).first()
+            if admin is None:
+                raise RuntimeError('No admin account in the database; pass --admin-login/--admin-password')
+            return create_access_token(identity=admin.id)
+
+    def build_users(self):
+        token = None
+        if (self.args.role or self.profile.role) == 'admin':
+            token = self.admin_token()
+            if token is None and not self.args.admin_login:
+                raise RuntimeError('Admin journeys against a server need --admin-login and --admin-password')
+        users = [VirtualUser(self, number, *self.credentials(number), token=token) for number in range(self.args.concurrency)]
+        if self.profile.name == 'login-storm' or token:
+            return users
+
+        # Setup logins run concurrently and are not part of the measurement.
+        # generate-data deactivates a few accounts, so a refused login moves
+        # the user on to another account of the same role
+        errors = []
+        def login(user):
+            for attempt in range(1, 6):
+                try:
+                    user.authenticate()
+                    return
+                except RuntimeError as e:
+                    error = str(e)
+                    user.login = self.credentials(user.number + attempt * len(users))[0]
+            errors.append(error)
+        threads = [threading.Thread(target=login, args=(user,)) for user in users]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        if errors:
+            raise RuntimeError(f'{len(errors)} setup login(s) failed, e.g. {errors[0]}')
+        return users
+
+    def prepare(self, users):
+        """Shared data the journeys pick from"""
+        if self.profile.name == 'login-storm':
+            return
+        status, body = users[0].request('GET', '/api/labs', params={'fields': 'id'}, record=False)
+        if status != 200 or not body.get('labs'):
+            raise RuntimeError('No labs found; run flask generate-data first')
+        self.context['lab_ids'] = [lab['id'] for lab in body['labs']]
+        week = self.args.week or date.today() + timedelta(days=7 - date.today().weekday())
+        self.context['week_start'] = datetime.combine(week, datetime.min.time())
+
+    def take_iteration(self):
+        if self._budget is None:
+            return True
+        with self._budget_lock:
+            if self._budget <= 0:
+                return False
+            self._budget -= 1
+            return True
+
+    def run_user(self, user, delay, deadline):
+        if self.stopping.wait(delay):
+            return
+        while not self.stopping.is_set() and time.monotonic() < deadline and self.take_iteration():
+            if self.pacer:
+                self.pacer.wait()
+            failed = False
+            try:
+                self.profile.step(user)
+            except Exception:
+                failed = True  # e.g. an unexpected response shape; the requests themselves are recorded
+            self.stats.finish_iteration(failed)
+            if self.args.think:
+                time.sleep(user.rng.uniform(0.5, 1.5) * self.args.think / 1000)
+
+    def run(self):
+        users = self.build_users()
+        self.prepare(users)
+
+        concurrency = len(users)
+        ramp_step = self.args.ramp_up / concurrency if self.args.ramp_up else 0
+        began = time.monotonic()
+        deadline = began + self.args.ramp_up + self.args.duration if self.args.duration else math.inf
+        threads = [
+            threading.Thread(target=self.run_user, args=(user, index * ramp_step, deadline), daemon=True)
+            for index, user in enumerate(users)
+        ]
+        for thread in threads:
+            thread.start()
+        try:
+            for thread in threads:
+                thread.join()
+        except KeyboardInterrupt:
+            self.stopping.set()
+            for thread in threads:
+                thread.join()
+        return self.stats.report(time.monotonic() - began), time.monotonic() - began
+
+# Output
+
+def print_report(report):
+    columns = f"{'endpoint':<44}{'count':>8}{'err%':>7}{'rps':>9}{'p50':>9}{'p95':>9}{'p99':>9}"
+    print(columns)
+    print('-' * len(columns))
+    for name, endpoint in report['endpoints'].items():
+        latency = endpoint['latency_ms']
+        print(f"{name:<44}{endpoint['count']:>8}{endpoint['error_rate'] * 100:>7.1f}{endpoint['throughput_rps']:>9.1f}"
+              f"{latency['p50']:>9.1f}{latency['p95']:>9.1f}{latency['p99']:>9.1f}")
+    print('-' * len(columns))
+    latency = report['latency_ms']
+    print(f"{'all':<44}{report['requests']:>8}{report['error_rate'] * 100:>7.1f}{report['throughput_rps']:>9.1f}"
+          f"{latency['p50'] or 0:>9.1f}{latency['p95'] or 0:>9.1f}{latency['p99'] or 0:>9.1f}")
+    print(f"{report['iterations']} iterations ({report['iteration_errors']} failed) in {report['elapsed_s']}s; latencies in ms")
+
+def print_comparison(report, baseline):
+    def change(new, old):
+        return f'{(new - old) / old * 100:+.1f}%' if old else 'n/a'
+
+    print(f"\nAgainst {baseline['profile']} run of {baseline['started_at']}:")
+    print(f"{'endpoint':<44}{'p95':>10}{'p99':>10}{'rps':>10}{'err%':>10}")
+    for name, endpoint in report['endpoints'].items():
+        old = baseline['endpoints'].get(name)
+        if old is None:
+            print(f'{name:<44}{"new":>10}')
+            continue
+        print(f"{name:<44}{change(endpoint['latency_ms']['p95'], old['latency_ms']['p95']):>10}"
+              f"{change(endpoint['latency_ms']['p99'], old['latency_ms']['p99']):>10}"
+              f"{change(endpoint['throughput_rps'], old['throughput_rps']):>10}"
+              f"{(endpoint['error_rate'] - old['error_rate']) * 100:>+9.1f}p")
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Load test the scheduler with scenario profiles')
+    parser.add_argument('profile', choices=sorted(PROFILES))
+    parser.add_argument('--target', default='inprocess', help='inprocess (app.test_client) or a base URL such as http://127.0.0.1:5000')
+    parser.add_argument('--gunicorn', action='store_true', help='start a local gunicorn on --port and target it')
+    parser.add_argument('--workers', type=int, default=4, help='gunicorn workers')
+    parser.add_argument('--port', type=int, default=8050)
+    parser.add_argument('--database', help='DATABASE_URL for in-process and --gunicorn runs')
+    parser.add_argument('--concurrency', type=int, default=20, help='virtual users (threads)')
+    parser.add_argument('--duration', type=float, default=30, help='seconds after ramp-up; 0 runs until --iterations are done')
+    parser.add_argument('--iterations', type=int, help='stop after this many journeys in total')
+    parser.add_argument('--rate', type=float, help='cap on journeys started per second, across all users')
+    parser.add_argument('--ramp-up', type=float, default=0, help='seconds over which users are started')
+    parser.add_argument('--think', type=float, default=0, help='mean pause between journeys in ms')
+    parser.add_argument('--role', choices=('student', 'instructor', 'admin'), help="override the profile's role")
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--prefix', default='gen', help='generate-data prefix of the accounts')
+    parser.add_argument('--instructors', type=int, default=2000, help='as passed to generate-data')
+    parser.add_argument('--students', type=int, default=30000, help='as passed to generate-data')
+    parser.add_argument('--password', default='password123', help='password of the generated accounts')
+    parser.add_argument('--admin-login', default=os.getenv('LOADTEST_ADMIN_LOGIN'))
+    parser.add_argument('--admin-password', default=os.getenv('LOADTEST_ADMIN_PASSWORD'))
+    parser.add_argument('--week', type=date.fromisoformat, help='Monday of the week booking-burst books into (default next week)')
+    parser.add_argument('--output', help='report path (default benchmarks/results/<profile>-<timestamp>.json)')
+    parser.add_argument('--compare', help='earlier report to compare against')
+    args = parser.parse_args(argv)
+    if not args.duration and not args.iterations:
+        parser.error('--duration 0 needs --iterations')
+    return args
+
+def main(argv=None):
+    args = parse_args(argv)
+    profile = PROFILES[args.profile]
+
+    env = dict(os.environ, RATELIMIT_ENABLED='false', SCHEDULER_ENABLED='false')
+    if args.database:
+        env['DATABASE_URL'] = args.database
+
+    app = None
+    server = None
+    if args.gunicorn:
+        server = start_gunicorn(args.workers, args.port, env)
+        target = f'http://127.0.0.1:{args.port}'
+        transport = HttpTransport(target)
+    elif args.target == 'inprocess':
+        os.environ.update(env)
+        from app import create_app
+        app = create_app()
+        target = 'inprocess'
+        transport = InProcessTransport(app)
+    else:
+        target = args.target
+        transport = HttpTransport(target)
+
+    started_at = datetime.utcnow()
+    try:
+        harness = Harness(args, profile, transport, app)
+        stats, elapsed = harness.run()
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait(timeout=30)
+
+    report = {
+        'profile': profile.name,
+        'description': profile.description,
+        'target': target,
+        'started_at': started_at.isoformat(timespec='seconds'),
+        'elapsed_s': round(elapsed, 2),
+        'options': {
+            'concurrency': args.concurrency,
+            'duration': args.duration,
+            'iterations': args.iterations,
+            'rate': args.rate,
+            'ramp_up': args.ramp_up,
+            'think_ms': args.think,
+            'role': args.role or profile.role,
+            'workers': args.workers if args.gunicorn else None,
+            'seed': args.seed
+        },
+        **stats
+    }
+
+    output = args.output or os.path.join(ROOT, 'benchmarks', 'results', f"{profile.name}-{started_at:%Y%m%dT%H%M%S}.json")
+    os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(report, f, indent=2)
+
+    print(f"{profile.name} against {target}: {args.concurrency} users")
+    print_report(report)
+    print(f'Report written to {output}')
+
+    if args.compare:
+        with open(args.compare) as f:
+            print_comparison(report, json.load(f))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,325 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmarks for model, service and serialization hot paths.
+
+Each benchmark is timed pyperf style: the loop count is calibrated so one
+sample takes at least --min-time, then --repeat samples are taken after a
+warmup and the per-call median, mean, min and stdev are reported.
+
+Database-backed benchmarks run against generate-data fixtures, one SQLite
+file per --sizes entry (cached in benchmarks/.fixtures; --rebuild makes
+them again). Sized benchmarks such as the conflict check run once per size,
+each size in its own process because the app binds DATABASE_URL at import.
+
+Compare mode fails (exit status 1) when a benchmark's median is more than
+--threshold slower than in the baseline report:
+
+Usage:
+  python benchmarks/micro.py --output benchmarks/results/baseline.json
+  python benchmarks/micro.py --compare benchmarks/results/baseline.json --threshold 0.10
+  python benchmarks/micro.py --filter conflict --sizes 10000,100000
+"""
+
+import argparse
+import json
+import math
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIXTURES = os.path.join(ROOT, 'benchmarks', '.fixtures')
+sys.path.insert(0, ROOT)
+
+# Benchmark name -> (setup(fixture) returning the callable to time, sized)
+BENCHMARKS = {}
+
+def benchmark(name, sized=False):
+    """Register setup(fixture) -> func; func() is what gets timed.
+
+    Unsized benchmarks run once, against the smallest fixture; sized ones
+    run against every fixture and are reported as name[size].
+    """
+    def decorator(setup):
+        BENCHMARKS[name] = (setup, sized)
+        return setup
+    return decorator
+
+# Timing
+
+def timed(func, loops):
+    began = time.perf_counter()
+    for _ in range(loops):
+        func()
+    return time.perf_counter() - began
+
+def measure(func, min_time, repeat):
+    """Per-call seconds over repeat samples of a calibrated number of loops"""
+    timed(func, 1)  # warmup: caches, lazy imports, SQLite pages
+    loops = 1
+    elapsed = timed(func, loops)
+    while elapsed < min_time:
+        loops = max(loops * 2, int(loops * min_time / max(elapsed, 1e-9)))
+        elapsed = timed(func, loops)
+
+    samples = [timed(func, loops) / loops for _ in range(repeat)]
+    return {
+        'median': statistics.median(samples),
+        'mean': statistics.fmean(samples),
+        'min': min(samples),
+        'stdev': statistics.stdev(samples) if len(samples) > 1 else 0.0,
+        'loops': loops,
+        'repeat': repeat
+    }
+
+def format_time(seconds):
+    for unit, scale in (('s', 1), ('ms', 1e-3), ('us', 1e-6)):
+        if seconds >= scale:
+            return f'{seconds / scale:.2f} {unit}'
+    return f'{seconds / 1e-9:.0f} ns'
+
+# Fixtures
+
+class Fixture:
+    """App bound to one generated database plus handy rows from it"""
+
+    def __init__(self, app, size):
+        from app.models.lab import Reservation
+        from app.models.user import User, UserRole
+        self.app = app
+        self.size = size
+        self.instructor = User.query.filter_by(role=UserRole.INSTRUCTOR, is_active=True).first()
+        self.student = User.query.filter_by(role=UserRole.STUDENT, is_active=True).first()
+        self.admin = User(id='benchmark-admin', role=UserRole.ADMIN)
+
+        # A busy lab and an instant in the middle of its bookings
+        middle = Reservation.query.order_by(Reservation.start_time).offset(
+            Reservation.query.count() // 2
+        ).first()
+        self.lab_id = middle.lab_id
+        self.probe = middle.start_time
+
+def fixture_path(size, seed):
+    return os.path.join(FIXTURES, f'micro-{size}-seed{seed}.db')
+
+def build_fixture(size, seed):
+    """Deterministic generate-data database with about size reservations"""
+    from app.services.data_generator import DataGenerator
+    # About 2,500 bookable sections per lab over two 16-week terms
+    generator = DataGenerator(
+        seed=seed, labs=max(2, math.ceil(size / 2000)), instructors=max(10, size // 200),
+        students=max(10, size // 100), terms=2, weeks_per_term=16, reservations=size,
+        tasks=max(100, size // 10), prefix='bench'
+    )
+    return generator.run()
+
+# Benchmarks
+
+@benchmark('serialize.to_dict[1000 rows]')
+def serialize_to_dict(fixture):
+    rows = serialization_rows()
+    return lambda: [row.to_dict() for row in rows]
+
+@benchmark('serialize.serialize_many[1000 rows]')
+def serialize_many(fixture):
+    from app.models.lab import Reservation
+    rows = serialization_rows()
+    return lambda: Reservation.serialize_many(rows)
+
+def serialization_rows():
+    from sqlalchemy.orm import joinedload
+    from app.models.lab import Reservation
+    return Reservation.query.options(
+        joinedload(Reservation.instructor), joinedload(Reservation.lab)
+    ).order_by(Reservation.start_time).limit(1000).all()
+
+@benchmark('security.generate_jwt_token')
+def jwt_encode(fixture):
+    from app.utils.security import generate_jwt_token
+    return lambda: generate_jwt_token(fixture.instructor.id)
+
+@benchmark('security.verify_jwt_token')
+def jwt_decode(fixture):
+    from app.utils.security import generate_jwt_token, verify_jwt_token
+    token = generate_jwt_token(fixture.instructor.id)
+    return lambda: verify_jwt_token(token)
+
+@benchmark('auth.validate_password')
+def validate_password(fixture):
+    from app.services.auth_service import AuthService
+    return lambda: AuthService.validate_password('CorrectHorse9battery')
+
+@benchmark('auth.login_user')
+def login_user(fixture):
+    from app import db
+    from app.services.auth_service import AuthService
+    credentials = {'login': fixture.instructor.username, 'password': 'password123'}
+    def run():
+        AuthService.login_user(credentials)
+        db.session.rollback()  # drop the identity map so each call queries again
+    return run
+
+@benchmark('reservations.find_conflicts', sized=True)
+def find_conflicts(fixture):
+    from app import db
+    from app.services.reservation_service import ReservationService
+    interval = [(fixture.probe, fixture.probe + timedelta(hours=1))]
+    def run():
+        ReservationService.find_conflicts(fixture.lab_id, interval)
+        db.session.rollback()
+    return run
+
+@benchmark('tasks.get_stats', sized=True)
+def task_stats(fixture):
+    from app.services.task_service import TaskService, task_counts
+    def run():
+        task_counts.clear()  # time the aggregate query, not the cache
+        TaskService.get_stats(fixture.student.id)
+    return run
+
+@benchmark('dashboard.get_stats.admin', sized=True)
+def dashboard_stats(fixture):
+    from app.services.dashboard_service import DashboardService
+    return lambda: DashboardService.get_stats(fixture.admin)
+
+# Worker: one process per fixture size
+
+def run_worker(args):
+    path = fixture_path(args.size, args.seed)
+    os.makedirs(FIXTURES, exist_ok=True)
+    if args.rebuild and os.path.exists(path):
+        os.remove(path)
+    fresh = not os.path.exists(path)
+
+    os.environ.update(DATABASE_URL=f'sqlite:///{path}', SCHEDULER_ENABLED='false')
+    from app import create_app
+    app = create_app()
+
+    results = {}
+    with app.app_context():
+        if fresh:
+            print(f'Building {args.size:,}-reservation fixture...', file=sys.stderr)
+            build_fixture(args.size, args.seed)
+        fixture = Fixture(app, args.size)
+
+        for name in args.names:
+            setup, sized = BENCHMARKS[name]
+            func = setup(fixture)
+            key = f'{name}[{args.size}]' if sized else name
+            results[key] = measure(func, args.min_time, args.repeat)
+            print(f'  {key:<48}{format_time(results[key]["median"]):>12}', file=sys.stderr)
+
+    with open(args.worker_output, 'w') as f:
+        json.dump(results, f)
+
+def run_all(args):
+    names = [name for name in BENCHMARKS if not args.filter or args.filter in name]
+    if not names:
+        sys.exit(f'No benchmark matches {args.filter!r}')
+
+    results = {}
+    for index, size in enumerate(args.sizes):
+        # Unsized benchmarks only need the first (smallest) fixture
+        selected = [name for name in names if BENCHMARKS[name][1] or index == 0]
+        if not selected:
+            continue
+        with tempfile.NamedTemporaryFile(suffix='.json', delete=False) as tmp:
+            output = tmp.name
+        command = [
+            sys.executable, os.path.abspath(__file__), '--worker', '--size', str(size),
+            '--seed', str(args.seed), '--min-time', str(args.min_time), '--repeat', str(args.repeat),
+            '--worker-output', output, *(['--rebuild'] if args.rebuild else []), '--names', *selected
+        ]
+        print(f'Fixture with {size:,} reservations', file=sys.stderr)
+        subprocess.run(command, check=True, stdout=subprocess.DEVNULL)
+        with open(output) as f:
+            results.update(json.load(f))
+        os.remove(output)
+    return results
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def compare(results, baseline, threshold):
+    """Print median ratios against the baseline; returns the regressed names"""
+    regressions = []
+    print(f"\nAgainst {baseline.get('revision') or 'baseline'} of {baseline.get('created_at')} (threshold {threshold:.0%}):")
+    print(f"{'benchmark':<48}{'baseline':>12}{'current':>12}{'change':>10}")
+    for name, result in results.items():
+        old = baseline['benchmarks'].get(name)
+        if old is None:
+            print(f"{name:<48}{'-':>12}{format_time(result['median']):>12}{'new':>10}")
+            continue
+        ratio = result['median'] / old['median']
+        flag = ''
+        if ratio > 1 + threshold:
+            regressions.append(name)
+            flag = '  REGRESSION'
+        print(f"{name:<48}{format_time(old['median']):>12}{format_time(result['median']):>12}{ratio - 1:>+10.1%}{flag}")
+    return regressions
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Micro-benchmarks for hot paths')
+    parser.add_argument('--sizes', type=lambda value: sorted(int(size) for size in value.split(',')),
+                        default=[1000, 10000, 100000], help='fixture sizes in reservations, comma separated')
+    parser.add_argument('--filter', help='only benchmarks whose name contains this')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--min-time', type=float, default=0.1, help='minimum seconds per sample')
+    parser.add_argument('--repeat', type=int, default=7, help='samples per benchmark')
+    parser.add_argument('--rebuild', action='store_true', help='regenerate the fixture databases')
+    parser.add_argument('--output', help='report path (default benchmarks/results/micro-<timestamp>.json)')
+    parser.add_argument('--compare', help='baseline report; exit 1 when a median regresses beyond --threshold')
+    parser.add_argument('--threshold', type=float, default=0.10, help='allowed slowdown as a fraction')
+    # Internal: measurement in a child process bound to one fixture
+    parser.add_argument('--worker', action='store_true', help=argparse.SUPPRESS)
+    parser.add_argument('--size', type=int, help=argparse.SUPPRESS)
+    parser.add_argument('--names', nargs='*', help=argparse.SUPPRESS)
+    parser.add_argument('--worker-output', help=argparse.SUPPRESS)
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.worker:
+        run_worker(args)
+        return
+
+    created_at = datetime.utcnow()
+    report = {
+        'created_at': created_at.isoformat(timespec='seconds'),
+        'revision': git_revision(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'sizes': args.sizes,
+        'seed': args.seed,
+        'benchmarks': run_all(args)
+    }
+
+    output = args.output or os.path.join(ROOT, 'benchmarks', 'results', f'micro-{created_at:%Y%m%dT%H%M%S}.json')
+    os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(report, f, indent=2)
+
+    print(f"{'benchmark':<48}{'median':>12}{'stdev':>12}{'loops':>8}")
+    for name, result in report['benchmarks'].items():
+        print(f"{name:<48}{format_time(result['median']):>12}{format_time(result['stdev']):>12}{result['loops']:>8}")
+    print(f'Report written to {output}')
+
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(report['benchmarks'], json.load(f), args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} benchmark(s) regressed beyond {args.threshold:.0%}: {', '.join(regressions)}")
+            sys.exit(1)
+
+if __name__ == '__main__':
+    main()
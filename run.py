@@ -4,6 +4,7 @@ Enterprise Task Manager - Main Application Entry Point
 """
 
 import os
+import click
 from app import create_app, db
 from flask_migrate import Migrate
 from dotenv import load_dotenv
@@ -24,7 +25,7 @@ def make_shell_context():
 @app.cli.command("create-admin")
 def create_admin():
     """Create an admin user"""
-    from app.models.user import User
+    from app.models.user import User, UserRole
     from app.utils.security import hash_password
     import getpass
     
@@ -49,7 +50,7 @@ def create_admin():
         password_hash=hash_password(password),
         first_name="Admin",
         last_name="User",
-        is_admin=True
+        role=UserRole.ADMIN
     )
     
     try:
@@ -136,6 +137,222 @@ def seed_data():
         db.session.rollback()
         print(f"Error seeding data: {e}")
 
+@app.cli.command("generate-data")
+@click.option("--seed", type=int, default=42, show_default=True, help="Random seed; the same options give the same data")
+@click.option("--labs", type=int, default=100, show_default=True)
+@click.option("--instructors", type=int, default=2000, show_default=True)
+@click.option("--students", type=int, default=30000, show_default=True)
+@click.option("--terms", type=int, default=10, show_default=True)
+@click.option("--weeks-per-term", type=int, default=16, show_default=True)
+@click.option("--reservations", type=int, default=1000000, show_default=True, help="Target; capped by the labs' weekly slots")
+@click.option("--tasks", type=int, default=100000, show_default=True)
+@click.option("--prefix", default="gen", show_default=True, help="Prefix for generated usernames, labs and terms")
+def generate_data(seed, labs, instructors, students, terms, weeks_per_term, reservations, tasks, prefix):
+    """Generate realistic synthetic data at production scale for load testing"""
+    from app.models.user import User, UserRole
+    from app.services.data_generator import DataGenerator
+    import time
+    
+    admin = User.query.filter_by(role=UserRole.ADMIN).first()
+    generator = DataGenerator(
+        seed=seed, labs=labs, instructors=instructors, students=students, terms=terms,
+        weeks_per_term=weeks_per_term, reservations=reservations, tasks=tasks, prefix=prefix
+    )
+    
+    started = time.perf_counter()
+    try:
+        counts = generator.run(admin_id=admin.id if admin else None)
+    except ValueError as e:
+        print(f"Error generating data: {e}")
+        return
+    
+    print(", ".join(f"{count:,} {name}" for name, count in counts.items()))
+    print(f"Generated in {time.perf_counter() - started:.1f}s (password for generated accounts: password123)")
+
+@app.cli.command("build-assets")
+def build_assets_command():
+    """Bundle, minify and fingerprint static JS/CSS into static/dist"""
+    from app.utils.assets import ASSET_BUNDLES, build_assets
+    import gzip
+    
+    try:
+        manifest = build_assets(app.static_folder)
+    except ValueError as e:
+        print(f"Error building assets: {e}")
+        raise SystemExit(1)
+    
+    for bundle, filename in sorted(manifest.items()):
+        # What the page downloaded before: each source file, gzipped by the response compressor
+        sources = []
+        for source in ASSET_BUNDLES[bundle]:
+            with open(os.path.join(app.static_folder, source), 'rb') as f:
+                sources.append(f.read())
+        source_size = sum(len(data) for data in sources)
+        source_gz = sum(len(gzip.compress(data, compresslevel=6)) for data in sources)
+        size = os.path.getsize(os.path.join(app.static_folder, 'dist', filename))
+        gz_size = os.path.getsize(os.path.join(app.static_folder, 'dist', filename + '.gz'))
+        print(f"{bundle} -> dist/{filename}: {len(sources)} file(s), {source_size:,} bytes ({source_gz:,} gzipped)"
+              f" -> 1 file, {size:,} bytes ({gz_size:,} gzipped)")
+    print("Assets built successfully!")
+
+@app.cli.command("rebuild-search-index")
+def rebuild_search_index():
+    """Rebuild the full-text search indexes from the base tables"""
+    from app.services.search_service import SearchService
+    
+    if not SearchService.install():
+        print("Full-text search is not available for this database.")
+        return
+    
+    SearchService.rebuild()
+    print("Search index rebuilt successfully!")
+
+@app.cli.command("run-worker")
+@click.option("--threads", type=int, default=None, help="Concurrent jobs (default JOB_WORKER_THREADS)")
+@click.option("--once", is_flag=True, help="Exit once the queue is drained")
+def run_worker(threads, once):
+    """Process background jobs until interrupted"""
+    from app.services.job_queue import Worker
+    import signal
+    
+    worker = Worker(app, threads=threads)
+    signal.signal(signal.SIGTERM, lambda *args: worker.stop())
+    
+    print(f"Worker {worker.worker_id} started with {worker.threads} thread(s)")
+    try:
+        worker.run(once=once)
+    except KeyboardInterrupt:
+        worker.stop()
+    print("Worker stopped.")
+
+@app.cli.command("import-timetable")
+@click.argument("path", type=click.Path(exists=True, dir_okay=False))
+@click.option("--dry-run", is_flag=True, help="Validate and report without inserting")
+@click.option("--status", type=click.Choice(['approved', 'pending']), default='approved', help="Status of imported reservations")
+def import_timetable(path, dry_run, status):
+    """Import a registrar timetable CSV of course sections"""
+    from app.services.timetable_service import TimetableService
+    import time
+    
+    started = time.perf_counter()
+    try:
+        with open(path, newline='', encoding='utf-8-sig') as stream:
+            report = TimetableService.import_csv(stream, dry_run=dry_run, status=status)
+        if dry_run:
+            db.session.rollback()
+        else:
+            db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        print(f"Error importing timetable: {e}")
+        return
+    
+    for item in report['errors']:
+        print(f"line {item['line']}: {'; '.join(item['errors'])}")
+    if report['errors_truncated']:
+        print(f"... {report['error_count'] - len(report['errors'])} more line(s) with errors")
+    
+    action = 'would import' if dry_run else 'imported'
+    print(f"{report['rows']} row(s) read, {report['valid']} {action}, "
+          f"{report['error_count']} rejected in {time.perf_counter() - started:.2f}s")
+
+@app.cli.command("export-reservations")
+@click.option("--kind", type=click.Choice(['reservations', 'utilization']), default='reservations')
+@click.option("--format", "fmt", type=click.Choice(['csv', 'parquet']), default='csv')
+@click.option("--output", "-o", type=click.Path(dir_okay=False), default=None, help="File to write (default stdout, CSV only)")
+@click.option("--lab", "lab_id", default=None, help="Lab id")
+@click.option("--term", default=None, help="Term name or id")
+@click.option("--status", default=None, help="Reservation status")
+def export_reservations(kind, fmt, output, lab_id, term, status):
+    """Stream reservations or lab utilization to CSV or Parquet"""
+    from app.services.export_service import ExportService
+    import sys
+    
+    if fmt == 'parquet' and not output:
+        print("Parquet export needs --output")
+        return
+    
+    try:
+        chunks = ExportService.stream(kind=kind, fmt=fmt, lab_id=lab_id, term=term, status=status)
+    except ValueError as e:
+        print(f"Error exporting: {e}")
+        return
+    
+    if output is None:
+        for chunk in chunks:
+            sys.stdout.write(chunk)
+        return
+    
+    with open(output, 'w' if fmt == 'csv' else 'wb', **({'newline': ''} if fmt == 'csv' else {})) as handle:
+        for chunk in chunks:
+            handle.write(chunk)
+    print(f"Exported {kind} to {output} ({os.path.getsize(output):,} bytes)")
+
+@app.cli.command("archive-term")
+@click.argument("term")
+@click.option("--batch-size", type=int, default=None, help="Rows moved per transaction (default ARCHIVE_BATCH_SIZE)")
+def archive_term(term, batch_size):
+    """Move a finished term's reservations into the archive table"""
+    from app.models.term import Term
+    from app.services.archive_service import ArchiveService
+    import time
+    
+    started = time.perf_counter()
+    try:
+        term = Term.resolve(term)
+        moved = ArchiveService.archive_term(term, batch_size=batch_size or app.config['ARCHIVE_BATCH_SIZE'])
+    except ValueError as e:
+        print(f"Error archiving term: {e}")
+        return
+    print(f"Archived {moved:,} reservation(s) from {term.name} in {time.perf_counter() - started:.2f}s")
+
+@app.cli.command("archive-status")
+def archive_status():
+    """Report hot and archived reservation table sizes"""
+    from app.services.archive_service import ArchiveService
+    
+    report = ArchiveService.sizes()
+    hot_bytes = f" ({report['hot_bytes']:,} bytes)" if 'hot_bytes' in report else ''
+    archive_bytes = f" ({report['archive_bytes']:,} bytes)" if 'archive_bytes' in report else ''
+    print(f"Hot reservations: {report['hot_rows']:,} row(s){hot_bytes}")
+    print(f"Archived reservations: {report['archive_rows']:,} row(s){archive_bytes}")
+    for item in report['terms']:
+        print(f"  {item['term']}: {item['rows']:,}")
+
+@app.cli.command("profile-report")
+@click.option("--dir", "directory", help="Profile directory (default PROFILER_DIR)")
+@click.option("--endpoint", help="Only this endpoint, e.g. labs.get_schedule")
+@click.option("--top", type=int, default=15, show_default=True, help="Functions and statements listed per endpoint")
+@click.option("--sort", type=click.Choice(["cumulative", "tottime", "ncalls"]), default="cumulative", show_default=True)
+def profile_report(directory, endpoint, top, sort):
+    """Summarize per-request profiles into a top-N report per endpoint"""
+    from app.utils.profiler import summarize
+    
+    directory = directory or app.config['PROFILER_DIR']
+    summaries = summarize(directory, endpoint, top, sort)
+    if not summaries:
+        print(f"No profiles found in {directory}")
+        return
+    
+    for summary in sorted(summaries, key=lambda item: item['wall_ms']['mean'] * item['requests'], reverse=True):
+        wall = summary['wall_ms']
+        print(f"\n== {summary['endpoint']}: {summary['requests']} request(s), "
+              f"mean {wall['mean']:.1f} ms, p95 {wall['p95']:.1f} ms, max {wall['max']:.1f} ms")
+        print(f"   SQL: {summary['sql_count_mean']} statement(s), {summary['sql_ms_mean']:.1f} ms per request "
+              f"({summary['sql_share']:.0%} of wall time)")
+        
+        print(f"   Top functions by {sort} (ms per request):")
+        for item in summary['functions']:
+            print(f"   {item['cumtime_ms']:>10.2f} cum {item['tottime_ms']:>10.2f} own {item['ncalls']:>8} calls  {item['function']}")
+        
+        if summary['statements']:
+            print("   Top SQL by total time (ms, all requests):")
+            for item in summary['statements']:
+                statement = ' '.join(item['statement'].split())
+                print(f"   {item['time_ms']:>10.2f} {item['count']:>6}x  {statement[:110]}")
+        
+        print(f"   Flame graph input: {summary['collapsed']}")
+
 @app.cli.command("check-config")
 def check_config():
     """Display current configuration"""
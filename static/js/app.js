@@ -3,352 +3,8 @@
  * Advanced Laboratory Management System
  */
 
-// API Service
-const api = {
-    async request(endpoint, options = {}) {
-        const token = localStorage.getItem('access_token');
-        const config = {
-            headers: {
-                'Content-Type': 'application/json',
-                ...(token && { 'Authorization': `Bearer ${token}` }),
-                ...options.headers,
-            },
-            ...options,
-        };
-
-        if (config.body && typeof config.body === 'object') {
-            config.body = JSON.stringify(config.body);
-        }
-
-        try {
-            // Simulate API delay
-            await new Promise(resolve => setTimeout(resolve, 500));
-            
-            // Mock responses for demonstration
-            return this.mockResponse(endpoint, config);
-        } catch (error) {
-            throw new Error(error.message || 'Network error occurred');
-        }
-    },
-
-    mockResponse(endpoint, config) {
-        // Mock authentication endpoints
-        if (endpoint === '/auth/login') {
-            if (config.body?.login && config.body?.password) {
-                return {
-                    success: true,
-                    data: {
-                        access_token: 'mock_jwt_token',
-                        refresh_token: 'mock_refresh_token',
-                        user: {
-                            id: 1,
-                            username: config.body.login,
-                            email: config.body.login.includes('@') ? config.body.login : `${config.body.login}@university.edu`,
-                            first_name: 'John',
-                            last_name: 'Doe',
-                            role: config.body.login.includes('admin') ? 'admin' : 
-                                  config.body.login.includes('instructor') ? 'instructor' : 'student'
-                        }
-                    }
-                };
-            }
-            throw new Error('Invalid credentials');
-        }
-
-        if (endpoint === '/auth/register') {
-            return {
-                success: true,
-                message: 'Registration successful'
-            };
-        }
-
-        if (endpoint === '/profile') {
-            const userData = localStorage.getItem('user_data');
-            if (userData) {
-                return {
-                    success: true,
-                    user: JSON.parse(userData)
-                };
-            }
-            throw new Error('Not authenticated');
-        }
-
-        // Mock data endpoints
-        if (endpoint === '/api/stats') {
-            return {
-                success: true,
-                stats: {
-                    total_labs: 12,
-                    total_reservations: 45,
-                    pending_requests: 3,
-                    utilization_rate: '78%',
-                    available_labs: 4,
-                    my_reservations: 8,
-                    upcoming_sessions: 5,
-                    scheduled_sessions: 15
-                }
-            };
-        }
-
-        if (endpoint === '/api/labs') {
-            return {
-                success: true,
-                labs: [
-                    { id: 1, name: 'Computer Lab A', capacity: 30, location: 'Building A, Room 101', is_active: true, equipment: '25 PCs, 5 Macs, Projector' },
-                    { id: 2, name: 'Programming Lab B', capacity: 25, location: 'Building B, Room 205', is_active: true, equipment: 'High-performance PCs, Dual Monitors' },
-                    { id: 3, name: 'Networking Lab', capacity: 20, location: 'Building C, Room 310', is_active: false, equipment: 'Cisco Routers, Switches' }
-                ]
-            };
-        }
-
-        if (endpoint === '/api/reservations') {
-            return {
-                success: true,
-                reservations: [
-                    { 
-                        id: 1, 
-                        course_code: 'CS101', 
-                        course_name: 'Introduction to Programming',
-                        instructor_name: 'Dr. Smith',
-                        section: 'A',
-                        lab_name: 'Computer Lab A',
-                        start_time: new Date(Date.now() + 86400000).toISOString(),
-                        duration_minutes: 120,
-                        status: 'pending',
-                        purpose: 'Weekly lab session'
-                    },
-                    { 
-                        id: 2, 
-                        course_code: 'CS201', 
-                        course_name: 'Data Structures',
-                        instructor_name: 'Prof. Johnson',
-                        section: 'B',
-                        lab_name: 'Programming Lab B',
-                        start_time: new Date(Date.now() + 172800000).toISOString(),
-                        duration_minutes: 90,
-                        status: 'approved',
-                        purpose: 'Algorithm implementation'
-                    }
-                ]
-            };
-        }
-
-        if (endpoint === '/api/schedule') {
-            return {
-                success: true,
-                schedule: [
-                    {
-                        course_code: 'CS101',
-                        course_name: 'Introduction to Programming',
-                        section: 'A',
-                        instructor_name: 'Dr. Smith',
-                        lab_name: 'Computer Lab A',
-                        start_time: new Date(Date.now() + 3600000).toISOString(),
-                        duration_minutes: 120,
-                        status: 'scheduled'
-                    }
-                ]
-            };
-        }
-
-        if (endpoint === '/api/labs/status') {
-            return {
-                success: true,
-                labs: [
-                    {
-                        id: 1,
-                        name: 'Computer Lab A',
-                        capacity: 30,
-                        location: 'Building A, Room 101',
-                        status: 'occupied',
-                        current_booking: {
-                            course_code: 'CS101',
-                            instructor: 'Dr. Smith',
-                            time_remaining: '45 min'
-                        },
-                        next_booking: {
-                            time: '14:00',
-                            course_code: 'CS201'
-                        }
-                    },
-                    {
-                        id: 2,
-                        name: 'Programming Lab B',
-                        capacity: 25,
-                        location: 'Building B, Room 205',
-                        status: 'available'
-                    },
-                    {
-                        id: 3,
-                        name: 'Networking Lab',
-                        capacity: 20,
-                        location: 'Building C, Room 310',
-                        status: 'maintenance'
-                    }
-                ]
-            };
-        }
-
-        return { success: true, data: {} };
-    },
-
-    async get(endpoint) {
-        return this.request(endpoint);
-    },
-
-    async post(endpoint, data) {
-        return this.request(endpoint, {
-            method: 'POST',
-            body: data
-        });
-    },
-
-    async put(endpoint, data) {
-        return this.request(endpoint, {
-            method: 'PUT',
-            body: data
-        });
-    },
-
-    async delete(endpoint) {
-        return this.request(endpoint, {
-            method: 'DELETE'
-        });
-    }
-};
-
-// Notification System
-const notification = {
-    show(message, type = 'info', duration = 5000) {
-        const notification = document.createElement('div');
-        notification.className = `notification notification-${type}`;
-        notification.innerHTML = `
-            <div class="notification-content">
-                <i class="fas fa-${this.getIcon(type)}"></i>
-                <span>${message}</span>
-            </div>
-            <button class="notification-close" onclick="this.parentElement.remove()">
-                <i class="fas fa-times"></i>
-            </button>
-        `;
-
-        // Add styles if not already added
-        if (!document.querySelector('#notification-styles')) {
-            const styles = document.createElement('style');
-            styles.id = 'notification-styles';
-            styles.textContent = `
-                .notification {
-                    position: fixed;
-                    top: 20px;
-                    right: 20px;
-                    background: white;
-                    border-radius: 8px;
-                    padding: 16px;
-                    box-shadow: 0 4px 12px rgba(0,0,0,0.15);
-                    border-left: 4px solid #007bff;
-                    z-index: 10000;
-                    max-width: 400px;
-                    animation: slideInRight 0.3s ease;
-                }
-                .notification-success { border-left-color: #28a745; }
-                .notification-error { border-left-color: #dc3545; }
-                .notification-warning { border-left-color: #ffc107; }
-                .notification-info { border-left-color: #17a2b8; }
-                .notification-content {
-                    display: flex;
-                    align-items: center;
-                    gap: 12px;
-                }
-                .notification-close {
-                    background: none;
-                    border: none;
-                    position: absolute;
-                    top: 8px;
-                    right: 8px;
-                    cursor: pointer;
-                    opacity: 0.6;
-                }
-                .notification-close:hover { opacity: 1; }
-                @keyframes slideInRight {
-                    from { transform: translateX(100%); opacity: 0; }
-                    to { transform: translateX(0); opacity: 1; }
-                }
-            `;
-            document.head.appendChild(styles);
-        }
-
-        document.body.appendChild(notification);
-
-        if (duration > 0) {
-            setTimeout(() => {
-                if (notification.parentElement) {
-                    notification.remove();
-                }
-            }, duration);
-        }
-
-        return notification;
-    },
-
-    getIcon(type) {
-        const icons = {
-            success: 'check-circle',
-            error: 'exclamation-circle',
-            warning: 'exclamation-triangle',
-            info: 'info-circle'
-        };
-        return icons[type] || 'info-circle';
-    },
-
-    success(message, duration) {
-        return this.show(message, 'success', duration);
-    },
-
-    error(message, duration) {
-        return this.show(message, 'error', duration);
-    },
-
-    warning(message, duration) {
-        return this.show(message, 'warning', duration);
-    },
-
-    info(message, duration) {
-        return this.show(message, 'info', duration);
-    }
-};
-
-// Helper Functions
-const Helpers = {
-    formatDate(dateString) {
-        const date = new Date(dateString);
-        return date.toLocaleDateString() + ' ' + date.toLocaleTimeString([], { 
-            hour: '2-digit', 
-            minute: '2-digit' 
-        });
-    },
-
-    formatDuration(minutes) {
-        const hours = Math.floor(minutes / 60);
-        const mins = minutes % 60;
-        return hours > 0 ? `${hours}h ${mins}m` : `${mins}m`;
-    },
-
-    debounce(func, wait) {
-        let timeout;
-        return function executedFunction(...args) {
-            const later = () => {
-                clearTimeout(timeout);
-                func(...args);
-            };
-            clearTimeout(timeout);
-            timeout = setTimeout(later, wait);
-        };
-    },
-
-    generateId() {
-        return Date.now().toString(36) + Math.random().toString(36).substr(2);
-    }
-};
+// api, notification and Helpers are the globals defined by utils/api.js,
+// components/notification.js and utils/helpers.js, which load first
 
 class ITLabScheduler {
     constructor() {
@@ -356,6 +12,10 @@ class ITLabScheduler {
         this.labs = [];
         this.reservations = [];
         this.schedule = [];
+        this.reservationsTable = null;
+        this.scheduleTable = null;
+        this.notificationTimer = null;
+        this.seenNotifications = new Set();
         this.stats = {};
         this.theme = localStorage.getItem('theme') || 'light';
         this.currentTab = 'dashboard';
@@ -526,9 +186,10 @@ class ITLabScheduler {
 
             const response = await api.get('/profile');
             if (response.success) {
-                this.currentUser = response.user;
+                this.currentUser = response.data.user;
                 this.showDashboard();
                 await this.loadDashboardData();
+                this.startNotificationPolling();
             } else {
                 this.showAuthScreen();
             }
@@ -937,7 +598,7 @@ class ITLabScheduler {
 
             if (response.success) {
                 // Store verification token
-                this.verificationToken = response.token;
+                this.verificationToken = response.data.token;
                 
                 // Move to next step
                 this.showResetStep('step-password');
@@ -1099,6 +760,7 @@ class ITLabScheduler {
                 this.currentUser = response.data.user;
                 this.showDashboard();
                 await this.loadDashboardData();
+                this.startNotificationPolling();
                 
                 notification.show(`Welcome back, ${this.currentUser.first_name || this.currentUser.username}!`, 'success');
             }
@@ -1708,7 +1370,7 @@ class ITLabScheduler {
         try {
             const response = await api.get('/api/labs/status');
             if (response.success) {
-                this.renderLabStatus(response.labs);
+                this.renderLabStatus(response.data.labs);
             }
         } catch (error) {
             console.error('Failed to load lab status:', error);
@@ -1831,12 +1493,9 @@ class ITLabScheduler {
         try {
             this.showLoading(true);
             
-            // Load all data in parallel for better performance
+            // Stats, labs, reservations and lab status arrive in one bundle
             await Promise.all([
-                this.loadStats(),
-                this.loadLabs(),
-                this.loadReservations(),
-                this.loadLabStatus(),
+                this.loadDashboardBundle(),
                 this.loadScheduleTimeline(),
                 this.loadSchedule()
             ]);
@@ -1849,10 +1508,64 @@ class ITLabScheduler {
         }
     }
 
+    // Overdue-task and session reminders written by the server-side scheduler
+    startNotificationPolling() {
+        this.stopNotificationPolling();
+        if (!this.settings.notifications) return;
+
+        this.checkNotifications();
+        this.notificationTimer = setInterval(() => this.checkNotifications(), 60000);
+    }
+
+    stopNotificationPolling() {
+        clearInterval(this.notificationTimer);
+        this.notificationTimer = null;
+        this.seenNotifications.clear();
+    }
+
+    async checkNotifications() {
+        try {
+            const response = await api.get('/api/notifications?unread=true&limit=10');
+            if (!response.success) return;
+
+            const fresh = response.data.notifications.filter(item => !this.seenNotifications.has(item.id));
+            if (fresh.length === 0) return;
+
+            fresh.reverse().forEach(item => {
+                this.seenNotifications.add(item.id);
+                const type = item.kind === 'task_overdue' ? 'warning' : 'info';
+                notification.show(item.message, type, 10000);
+            });
+
+            await api.post('/api/notifications/read', { ids: fresh.map(item => item.id) });
+        } catch (error) {
+            console.error('Failed to check notifications:', error);
+        }
+    }
+
+    async loadDashboardBundle() {
+        const response = await api.get('/api/dashboard');
+        if (!response.success) return;
+
+        const dashboard = response.data.dashboard || {};
+
+        this.stats = dashboard.stats || {};
+        this.updateEnhancedStats(this.stats);
+        this.updateHeaderStats(this.stats);
+
+        this.labs = dashboard.labs || [];
+        this.updateLabFilters();
+
+        this.reservations = dashboard.reservations || [];
+        this.renderRoleSpecificContent();
+
+        this.renderLabStatus(dashboard.lab_status || []);
+    }
+
     async loadStats() {
         const response = await api.get('/api/stats');
         if (response.success) {
-            this.stats = response.stats;
+            this.stats = response.data.stats;
             this.updateEnhancedStats(this.stats);
             this.updateHeaderStats(this.stats);
         }
@@ -1861,7 +1574,7 @@ class ITLabScheduler {
     async loadLabs() {
         const response = await api.get('/api/labs');
         if (response.success) {
-            this.labs = response.labs;
+            this.labs = response.data.labs;
             this.updateLabFilters();
         }
     }
@@ -1869,7 +1582,7 @@ class ITLabScheduler {
     async loadReservations() {
         const response = await api.get('/api/reservations');
         if (response.success) {
-            this.reservations = response.reservations;
+            this.reservations = response.data.reservations;
             this.renderRoleSpecificContent();
         }
     }
@@ -2099,36 +1812,39 @@ class ITLabScheduler {
         const container = document.getElementById('all-reservations-content');
         if (!container) return;
 
-        if (this.reservations.length === 0) {
-            container.innerHTML = this.getEmptyState('No reservations found', 'There are no reservations in the system.');
-            return;
-        }
-
-        container.innerHTML = this.reservations.map(reservation => `
-            <div class="reservation-card-enhanced ${reservation.status}">
-                <div class="reservation-header-enhanced">
-                    <div class="reservation-title">
-                        <h4>${reservation.course_code} - ${reservation.course_name}</h4>
-                        <div class="reservation-meta">
-                            <div class="reservation-meta-item">
-                                <i class="fas fa-user"></i>
-                                ${reservation.instructor_name}
-                            </div>
-                            <div class="reservation-meta-item">
-                                <i class="fas fa-users"></i>
-                                Section ${reservation.section}
-                            </div>
-                        </div>
-                    </div>
-                    <span class="status-badge status-${reservation.status}">${reservation.status}</span>
-                </div>
-                <div class="reservation-details">
-                    <p><strong>Lab:</strong> ${reservation.lab_name}</p>
-                    <p><strong>Date & Time:</strong> ${Helpers.formatDate(reservation.start_time)}</p>
-                    <p><strong>Duration:</strong> ${reservation.duration_minutes} minutes</p>
+        // Thousands of reservations: render only the visible rows and page in
+        // the rest through the cursor-paginated endpoint while scrolling
+        if (this.reservationsTable) {
+            this.reservationsTable.destroy();
+        }
+        this.reservationsTable = new VirtualTable(container, {
+            rowHeight: 64,
+            emptyState: this.getEmptyState('No reservations found', 'There are no reservations in the system.'),
+            renderRow: (row, reservation) => this.renderReservationRow(row, reservation),
+            fetchPage: async (cursor) => {
+                const params = new URLSearchParams({ limit: 200 });
+                if (cursor) params.set('cursor', cursor);
+                const response = await api.get(`/api/reservations?${params}`);
+                return { items: response.data.reservations || [], nextCursor: response.data.next_cursor };
+            }
+        });
+        this.reservationsTable.load();
+    }
+
+    renderReservationRow(row, reservation) {
+        row.className = `virtual-table-row reservation-row ${reservation.status}`;
+        row.innerHTML = `
+            <div class="virtual-row-main">
+                <div class="virtual-row-title">${reservation.course_code} - ${reservation.course_name}</div>
+                <div class="virtual-row-meta">
+                    <span><i class="fas fa-user"></i>${reservation.instructor_name}</span>
+                    <span><i class="fas fa-users"></i>Section ${reservation.section}</span>
+                    <span><i class="fas fa-laptop-house"></i>${reservation.lab_name}</span>
+                    <span><i class="fas fa-clock"></i>${Helpers.formatDate(reservation.start_time)} (${reservation.duration_minutes} min)</span>
                 </div>
             </div>
-        `).join('');
+            <span class="status-badge status-${reservation.status}">${reservation.status}</span>
+        `;
     }
 
     renderLabsManagement() {
@@ -2197,7 +1913,7 @@ class ITLabScheduler {
             
             const response = await api.get(`/api/schedule?lab_id=${labId}&date=${date}&upcoming=true`);
             if (response.success) {
-                this.schedule = response.schedule;
+                this.schedule = response.data.schedule;
                 
                 if (container) {
                     this.renderSchedule(container);
@@ -2214,23 +1930,31 @@ class ITLabScheduler {
     renderSchedule(container) {
         if (!container) return;
 
-        if (this.schedule.length === 0) {
-            container.innerHTML = this.getEmptyState('No scheduled sessions', 'No sessions found for the selected criteria.');
-            return;
+        if (this.scheduleTable && this.scheduleTable.container !== container) {
+            this.scheduleTable.destroy();
+            this.scheduleTable = null;
+        }
+        if (!this.scheduleTable) {
+            this.scheduleTable = new VirtualTable(container, {
+                rowHeight: 64,
+                emptyState: this.getEmptyState('No scheduled sessions', 'No sessions found for the selected criteria.'),
+                renderRow: (row, session) => {
+                    row.className = `virtual-table-row schedule-row ${session.status}`;
+                    row.innerHTML = `
+                        <div class="virtual-row-main">
+                            <div class="virtual-row-title">${session.course_code} - ${session.course_name}</div>
+                            <div class="virtual-row-meta">
+                                <span><i class="fas fa-clock"></i>${Helpers.formatDate(session.start_time)}</span>
+                                <span><i class="fas fa-user"></i>${session.instructor_name}</span>
+                                <span><i class="fas fa-laptop-house"></i>${session.lab_name}</span>
+                                <span>Section ${session.section} &middot; ${session.duration_minutes} min</span>
+                            </div>
+                        </div>
+                    `;
+                }
+            });
         }
-
-        container.innerHTML = this.schedule.map(session => `
-            <div class="schedule-slot-enhanced ${session.status}">
-                <div class="slot-time">${Helpers.formatDate(session.start_time)}</div>
-                <div class="slot-details">
-                    <h4>${session.course_code} - ${session.course_name}</h4>
-                    <p><strong>Section:</strong> ${session.section}</p>
-                    <p><strong>Instructor:</strong> ${session.instructor_name}</p>
-                    <p><strong>Lab:</strong> ${session.lab_name}</p>
-                    <p><strong>Duration:</strong> ${session.duration_minutes} minutes</p>
-                </div>
-            </div>
-        `).join('');
+        this.scheduleTable.setItems(this.schedule);
     }
 
     renderUpcomingSchedule(container) {
@@ -2434,6 +2158,7 @@ class ITLabScheduler {
         } catch (error) {
             console.error('Logout error:', error);
         } finally {
+            this.stopNotificationPolling();
             localStorage.clear();
             this.currentUser = null;
             this.labs = [];
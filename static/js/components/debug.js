@@ -0,0 +1,137 @@
+/**
+ * Debug Panel for IT Lab Scheduler
+ * Shows ApiService cache and request coalescing statistics.
+ * Toggle with Ctrl+Shift+D (state is remembered in localStorage).
+ */
+
+class DebugPanel {
+    constructor() {
+        this.element = null;
+        this.timer = null;
+        this.refreshInterval = 1000;
+
+        this.bindGlobalEvents();
+
+        if (localStorage.getItem('debug_panel') === 'open' || new URLSearchParams(window.location.search).has('debug')) {
+            this.show();
+        }
+    }
+
+    /**
+     * Bind the keyboard toggle
+     */
+    bindGlobalEvents() {
+        document.addEventListener('keydown', (e) => {
+            if ((e.ctrlKey || e.metaKey) && e.shiftKey && e.key.toLowerCase() === 'd') {
+                e.preventDefault();
+                this.toggle();
+            }
+        });
+    }
+
+    /**
+     * Create the panel element
+     */
+    createElement() {
+        this.element = document.createElement('div');
+        this.element.className = 'debug-panel';
+        this.element.style.cssText = `
+            position: fixed;
+            bottom: 12px;
+            left: 12px;
+            z-index: 10001;
+            min-width: 220px;
+            padding: 10px 12px;
+            border-radius: 8px;
+            background: rgba(17, 24, 39, 0.92);
+            color: #e5e7eb;
+            font: 12px/1.5 ui-monospace, SFMono-Regular, Menlo, monospace;
+            box-shadow: 0 4px 12px rgba(0, 0, 0, 0.3);
+        `;
+        document.body.appendChild(this.element);
+    }
+
+    /**
+     * Render current statistics
+     */
+    render() {
+        if (!this.element || typeof api === 'undefined' || typeof api.getCacheStats !== 'function') {
+            return;
+        }
+
+        const stats = api.getCacheStats();
+        const rows = [
+            ['Hit rate', `${(stats.hitRate * 100).toFixed(1)}%`],
+            ['Fresh hits', stats.hits],
+            ['Stale hits', stats.staleHits],
+            ['Misses', stats.misses],
+            ['Coalesced', stats.coalesced],
+            ['Revalidations', stats.revalidations],
+            ['Invalidations', stats.invalidations],
+            ['Cached entries', stats.entries],
+            ['In flight', stats.inflight]
+        ];
+
+        this.element.innerHTML = `
+            <div style="font-weight: 600; margin-bottom: 4px;">API cache</div>
+            ${rows.map(([label, value]) => `
+                <div style="display: flex; justify-content: space-between; gap: 16px;">
+                    <span>${label}</span><span>${value}</span>
+                </div>
+            `).join('')}
+        `;
+    }
+
+    /**
+     * Show the panel and start refreshing
+     */
+    show() {
+        if (!this.element) {
+            this.createElement();
+        }
+        this.element.style.display = 'block';
+        this.render();
+        this.timer = setInterval(() => this.render(), this.refreshInterval);
+        localStorage.setItem('debug_panel', 'open');
+    }
+
+    /**
+     * Hide the panel and stop refreshing
+     */
+    hide() {
+        if (this.element) {
+            this.element.style.display = 'none';
+        }
+        clearInterval(this.timer);
+        this.timer = null;
+        localStorage.removeItem('debug_panel');
+    }
+
+    /**
+     * Toggle visibility
+     */
+    toggle() {
+        if (this.timer) {
+            this.hide();
+        } else {
+            this.show();
+        }
+    }
+}
+
+// Create global debug panel instance once the DOM is ready
+let debugPanel = null;
+if (document.readyState === 'loading') {
+    document.addEventListener('DOMContentLoaded', () => {
+        debugPanel = new DebugPanel();
+        window.debugPanel = debugPanel;
+    });
+} else {
+    debugPanel = new DebugPanel();
+    window.debugPanel = debugPanel;
+}
+
+// Export for module systems
+if (typeof module !== 'undefined' && module.exports) {
+    module.exports = DebugPanel;
+}
@@ -0,0 +1,339 @@
+/**
+ * Virtual Table for IT Lab Scheduler
+ * Windowed list that only keeps the visible rows (plus a small overscan) in
+ * the DOM. Row elements are pooled and recycled while scrolling, and more
+ * rows are fetched through cursor pagination as the end comes into view.
+ */
+
+class VirtualTable {
+    /**
+     * @param {HTMLElement} container - Element the table renders into
+     * @param {Object} options
+     * @param {number} options.rowHeight - Fixed row height in pixels
+     * @param {number} options.height - Viewport height in pixels
+     * @param {number} options.overscan - Extra rows rendered above and below the viewport
+     * @param {number} options.loadThreshold - Fetch the next page when this many rows remain
+     * @param {Function} options.renderRow - (element, item, index) => void, fills a pooled row
+     * @param {Function} options.fetchPage - async (cursor) => ({ items, nextCursor })
+     * @param {string} options.emptyState - HTML shown when there are no rows
+     */
+    constructor(container, options = {}) {
+        this.container = container;
+        this.rowHeight = options.rowHeight || 64;
+        this.height = options.height || 560;
+        this.overscan = options.overscan ?? 6;
+        this.loadThreshold = options.loadThreshold ?? 20;
+        this.renderRow = options.renderRow;
+        this.fetchPage = options.fetchPage || null;
+        this.emptyState = options.emptyState || '';
+
+        this.items = [];
+        this.nextCursor = null;
+        this.loading = false;
+        this.pool = [];
+        this.frame = null;
+        this.destroyed = false;
+
+        this.onScroll = this.onScroll.bind(this);
+        this.onResize = this.onScroll.bind(this);
+
+        this.createElement();
+    }
+
+    /**
+     * Create viewport, spacer and loading indicator
+     */
+    createElement() {
+        this.container.innerHTML = '';
+
+        this.viewport = document.createElement('div');
+        this.viewport.className = 'virtual-table';
+        this.viewport.style.height = `${this.height}px`;
+        this.viewport.setAttribute('role', 'list');
+
+        // The spacer gives the scrollbar the height of every row without rendering them
+        this.spacer = document.createElement('div');
+        this.spacer.className = 'virtual-table-spacer';
+
+        this.loader = document.createElement('div');
+        this.loader.className = 'virtual-table-loader';
+        this.loader.innerHTML = '<i class="fas fa-spinner fa-spin"></i> Loading more...';
+
+        this.viewport.appendChild(this.spacer);
+        this.container.appendChild(this.viewport);
+        this.container.appendChild(this.loader);
+
+        this.viewport.addEventListener('scroll', this.onScroll, { passive: true });
+        window.addEventListener('resize', this.onResize);
+    }
+
+    /**
+     * Replace all rows
+     */
+    setItems(items, nextCursor = null) {
+        this.reset();
+        this.items = items.slice();
+        this.nextCursor = nextCursor;
+        this.update();
+    }
+
+    /**
+     * Drop all rows and scroll back to the top
+     */
+    reset() {
+        this.items = [];
+        this.nextCursor = null;
+        this.viewport.scrollTop = 0;
+        this.pool.forEach(row => {
+            row.dataset.index = '';
+            row.style.display = 'none';
+        });
+    }
+
+    /**
+     * Append a page of rows
+     */
+    appendItems(items, nextCursor = null) {
+        this.items.push(...items);
+        this.nextCursor = nextCursor;
+        this.update();
+    }
+
+    /**
+     * Reset and load the first page through fetchPage
+     */
+    async load() {
+        this.reset();
+        await this.loadMore(true);
+    }
+
+    /**
+     * Fetch the next page if there is one and no fetch is running
+     */
+    async loadMore(initial = false) {
+        if (!this.fetchPage || this.loading || (!initial && !this.nextCursor)) {
+            return;
+        }
+
+        this.loading = true;
+        this.loader.style.display = 'block';
+        try {
+            const page = await this.fetchPage(initial ? null : this.nextCursor);
+            if (!this.destroyed) {
+                this.appendItems(page.items || [], page.nextCursor || null);
+            }
+        } catch (error) {
+            console.error('Failed to load rows:', error);
+        } finally {
+            this.loading = false;
+            this.loader.style.display = 'none';
+        }
+    }
+
+    /**
+     * Coalesce scroll events into one render per animation frame
+     */
+    onScroll() {
+        if (this.frame !== null) return;
+        this.frame = requestAnimationFrame(() => {
+            this.frame = null;
+            this.render();
+        });
+    }
+
+    /**
+     * Resize the spacer and re-render after the row count changed
+     */
+    update() {
+        this.spacer.style.height = `${this.items.length * this.rowHeight}px`;
+
+        if (this.items.length === 0 && !this.loading && this.emptyState) {
+            this.viewport.style.display = 'none';
+            this.showEmptyState();
+        } else {
+            this.viewport.style.display = '';
+            this.hideEmptyState();
+        }
+
+        this.render();
+    }
+
+    showEmptyState() {
+        if (!this.emptyElement) {
+            this.emptyElement = document.createElement('div');
+            this.emptyElement.innerHTML = this.emptyState;
+            this.container.insertBefore(this.emptyElement, this.loader);
+        }
+    }
+
+    hideEmptyState() {
+        if (this.emptyElement) {
+            this.emptyElement.remove();
+            this.emptyElement = null;
+        }
+    }
+
+    /**
+     * Grow the pool to cover the viewport; rows are never destroyed while scrolling
+     */
+    ensurePool(size) {
+        while (this.pool.length < size) {
+            const row = document.createElement('div');
+            row.className = 'virtual-table-row';
+            row.style.height = `${this.rowHeight}px`;
+            row.setAttribute('role', 'listitem');
+            row.dataset.index = '';
+            this.spacer.appendChild(row);
+            this.pool.push(row);
+        }
+    }
+
+    /**
+     * Position pooled rows over the visible window
+     */
+    render() {
+        const viewportHeight = this.viewport.clientHeight || this.height;
+        const visibleRows = Math.ceil(viewportHeight / this.rowHeight);
+        const poolSize = visibleRows + this.overscan * 2;
+        this.ensurePool(poolSize);
+
+        const first = Math.max(0, Math.floor(this.viewport.scrollTop / this.rowHeight) - this.overscan);
+        const last = Math.min(this.items.length, first + poolSize);
+
+        // Each index always maps to the same pooled element, so scrolling by one
+        // row only rewrites the single element that wrapped around
+        for (let index = first; index < last; index++) {
+            const row = this.pool[index % this.pool.length];
+            if (row.dataset.index !== String(index)) {
+                row.dataset.index = String(index);
+                row.style.transform = `translateY(${index * this.rowHeight}px)`;
+                this.renderRow(row, this.items[index], index);
+            }
+            row.style.display = '';
+        }
+
+        // Hide pooled rows left holding indices outside the window (short lists,
+        // end of list, or a mapping that changed because the pool grew)
+        this.pool.forEach((row, slot) => {
+            const index = Number(row.dataset.index);
+            if (row.dataset.index === '' || index < first || index >= last || index % this.pool.length !== slot) {
+                row.style.display = 'none';
+                row.dataset.index = '';
+            }
+        });
+
+        if (this.items.length - last <= this.loadThreshold) {
+            this.loadMore();
+        }
+    }
+
+    /**
+     * Detach listeners; call before discarding the table
+     */
+    destroy() {
+        this.destroyed = true;
+        this.viewport.removeEventListener('scroll', this.onScroll);
+        window.removeEventListener('resize', this.onResize);
+        if (this.frame !== null) {
+            cancelAnimationFrame(this.frame);
+            this.frame = null;
+        }
+        this.pool = [];
+        this.container.innerHTML = '';
+    }
+}
+
+// Virtual table styles
+const virtualTableStyles = `
+.virtual-table {
+    position: relative;
+    overflow-y: auto;
+    contain: strict;
+    border: 1px solid var(--border-light);
+    border-radius: var(--radius-lg);
+    background: var(--bg-primary);
+}
+
+.virtual-table-spacer {
+    position: relative;
+    width: 100%;
+}
+
+.virtual-table-row {
+    position: absolute;
+    top: 0;
+    left: 0;
+    right: 0;
+    box-sizing: border-box;
+    display: flex;
+    align-items: center;
+    gap: var(--space-md);
+    padding: 0 var(--space-md);
+    border-bottom: 1px solid var(--border-light);
+    overflow: hidden;
+    will-change: transform;
+}
+
+.virtual-table-row:hover {
+    background: var(--bg-secondary);
+}
+
+.virtual-table-row.pending { box-shadow: inset 3px 0 0 var(--warning); }
+.virtual-table-row.approved { box-shadow: inset 3px 0 0 var(--success); }
+.virtual-table-row.rejected { box-shadow: inset 3px 0 0 var(--error); }
+.virtual-table-row.cancelled { box-shadow: inset 3px 0 0 var(--text-light); }
+
+.virtual-row-main {
+    flex: 1;
+    min-width: 0;
+}
+
+.virtual-row-title {
+    font-weight: 600;
+    color: var(--text-primary);
+    white-space: nowrap;
+    overflow: hidden;
+    text-overflow: ellipsis;
+}
+
+.virtual-row-meta {
+    display: flex;
+    gap: var(--space-md);
+    font-size: 0.85rem;
+    color: var(--text-secondary);
+    white-space: nowrap;
+    overflow: hidden;
+    text-overflow: ellipsis;
+}
+
+.virtual-row-meta i {
+    margin-right: var(--space-xs);
+}
+
+.virtual-table-loader {
+    display: none;
+    padding: var(--space-sm);
+    text-align: center;
+    font-size: 0.85rem;
+    color: var(--text-secondary);
+}
+
+@media (max-width: 768px) {
+    .virtual-row-meta span:nth-child(n + 3) {
+        display: none;
+    }
+}
+`;
+
+// Inject styles
+const virtualTableStyleSheet = document.createElement('style');
+virtualTableStyleSheet.textContent = virtualTableStyles;
+document.head.appendChild(virtualTableStyleSheet);
+
+// Make VirtualTable available globally
+window.VirtualTable = VirtualTable;
+
+// Export for module systems
+if (typeof module !== 'undefined' && module.exports) {
+    module.exports = VirtualTable;
+}
@@ -11,6 +11,38 @@ class ApiService {
             'Accept': 'application/json'
         };
         this.requests = new Map(); // For request tracking
+        this.reservationStore = new Map(); // Local copy kept current by syncReservations()
+        this.reservationSyncToken = null;
+        this.reservationSync = null;
+
+        // In-flight GETs keyed by URL, so identical concurrent requests share one fetch
+        this.inflight = new Map();
+
+        // Stale-while-revalidate cache for GET responses
+        this.cache = new Map();
+        // Bumped by every invalidation; a GET only caches its response if none of
+        // the prefixes covering its key were invalidated after it started
+        this.generation = 0;
+        this.invalidatedAt = new Map(); // key prefix -> generation of its last invalidation
+        this.cacheTTLs = {
+            '/api/dashboard': 15000,
+            '/api/stats': 15000,
+            '/api/reservations': 15000,
+            '/api/schedule': 30000,
+            '/api/labs/status': 15000,
+            '/api/labs': 60000,
+            '/api/tasks': 15000,
+            '/profile': 300000
+        };
+        // Mutating an endpoint (key prefix) invalidates these cached prefixes
+        this.invalidationRules = {
+            '/api/reservations': ['/api/reservations', '/api/schedule', '/api/stats', '/api/dashboard', '/api/labs/status'],
+            '/api/labs': ['/api/labs', '/api/stats', '/api/dashboard'],
+            '/api/tasks': ['/api/tasks'],
+            '/api/notifications': ['/api/notifications'],
+            '/auth': ['/']
+        };
+        this.cacheStats = { hits: 0, staleHits: 0, misses: 0, coalesced: 0, revalidations: 0, invalidations: 0 };
     }
 
     /**
@@ -53,9 +85,43 @@ class ApiService {
     }
 
     /**
-     * Base request method
+     * Base request method.
+     * Identical GETs issued while one is already in flight share its promise.
      */
     async request(endpoint, options = {}) {
+        const method = (options.method || 'GET').toUpperCase();
+
+        if (method === 'GET' && !options.signal) {
+            const key = this.cacheKey(endpoint);
+            const pending = this.inflight.get(key);
+            if (pending) {
+                this.cacheStats.coalesced++;
+                return pending;
+            }
+
+            const promise = this.performRequest(endpoint, options);
+            this.inflight.set(key, promise);
+            try {
+                return await promise;
+            } finally {
+                // invalidate() may already have replaced or dropped this entry
+                if (this.inflight.get(key) === promise) {
+                    this.inflight.delete(key);
+                }
+            }
+        }
+
+        const response = await this.performRequest(endpoint, options);
+        if (method !== 'GET') {
+            this.invalidate(endpoint);
+        }
+        return response;
+    }
+
+    /**
+     * Perform a single fetch
+     */
+    async performRequest(endpoint, options = {}) {
         const requestId = this.generateRequestId();
         const url = endpoint.startsWith('http') ? endpoint : `${this.baseURL}${endpoint}`;
         
@@ -181,6 +247,8 @@ class ApiService {
     handleUnauthorized() {
         this.setToken(null);
         localStorage.removeItem('user_data');
+        this.resetReservationStore();
+        this.clearCache();
         
         // Redirect to login if not already there
         if (!window.location.pathname.includes('/auth')) {
@@ -214,10 +282,150 @@ class ApiService {
     }
 
     /**
-     * GET request
+     * Normalize an endpoint into a cache / in-flight key
+     */
+    cacheKey(endpoint) {
+        return endpoint.startsWith(this.baseURL) ? endpoint.slice(this.baseURL.length) : endpoint;
+    }
+
+    /**
+     * TTL for an endpoint: the longest matching prefix in cacheTTLs, or 0 (not cached)
+     */
+    getCacheTTL(key) {
+        const path = key.split('?')[0];
+        let match = '';
+        Object.keys(this.cacheTTLs).forEach(prefix => {
+            if (path.startsWith(prefix) && prefix.length > match.length) {
+                match = prefix;
+            }
+        });
+        return match ? this.cacheTTLs[match] : 0;
+    }
+
+    /**
+     * Drop cached responses affected by a mutation on endpoint
+     */
+    invalidate(endpoint) {
+        const path = this.cacheKey(endpoint).split('?')[0];
+        const prefixes = new Set();
+
+        Object.entries(this.invalidationRules).forEach(([rule, targets]) => {
+            if (path.startsWith(rule)) {
+                targets.forEach(target => prefixes.add(target));
+            }
+        });
+
+        this.generation++;
+        prefixes.forEach(prefix => {
+            this.invalidatedAt.set(prefix, this.generation);
+            Array.from(this.cache.keys()).forEach(key => {
+                if (key.startsWith(prefix)) {
+                    this.cache.delete(key);
+                    this.cacheStats.invalidations++;
+                }
+            });
+            // Later GETs must not coalesce onto a fetch that started before the mutation
+            Array.from(this.inflight.keys()).forEach(key => {
+                if (key.startsWith(prefix)) {
+                    this.inflight.delete(key);
+                }
+            });
+        });
+    }
+
+    /**
+     * Whether key was invalidated after generation (so a response fetched since then is outdated)
+     */
+    invalidatedSince(key, generation) {
+        for (const [prefix, invalidated] of this.invalidatedAt) {
+            if (invalidated > generation && key.startsWith(prefix)) {
+                return true;
+            }
+        }
+        return false;
+    }
+
+    /**
+     * Store a GET response unless the key was invalidated while it was in flight
+     */
+    storeResponse(key, response, generation) {
+        if (!this.invalidatedSince(key, generation)) {
+            this.cache.set(key, { response, fetchedAt: Date.now() });
+        }
+    }
+
+    /**
+     * Clear the whole response cache (e.g. on logout)
+     */
+    clearCache() {
+        this.generation++;
+        this.invalidatedAt.set('', this.generation);
+        this.cache.clear();
+        this.inflight.clear();
+    }
+
+    /**
+     * Cache hit statistics for the debug panel
+     */
+    getCacheStats() {
+        const { hits, staleHits, misses } = this.cacheStats;
+        const lookups = hits + staleHits + misses;
+        return {
+            ...this.cacheStats,
+            entries: this.cache.size,
+            inflight: this.inflight.size,
+            hitRate: lookups ? (hits + staleHits) / lookups : 0
+        };
+    }
+
+    /**
+     * Refetch a cached endpoint in the background
+     */
+    revalidate(key, options) {
+        this.cacheStats.revalidations++;
+        const generation = this.generation;
+        this.request(key, { ...options, method: 'GET' })
+            .then(response => {
+                this.storeResponse(key, response, generation);
+            })
+            .catch(error => {
+                console.warn('Background revalidation failed:', key, error);
+            });
+    }
+
+    /**
+     * GET request.
+     * Fresh cached responses are returned immediately; stale ones are returned
+     * immediately too while a background request refreshes them.
+     * Pass { cache: false } to bypass the cache.
      */
     async get(endpoint, options = {}) {
-        return this.request(endpoint, { ...options, method: 'GET' });
+        const { cache = true, ...requestOptions } = options;
+        const key = this.cacheKey(endpoint);
+        const ttl = cache ? this.getCacheTTL(key) : 0;
+
+        if (!ttl) {
+            return this.request(endpoint, { ...requestOptions, method: 'GET' });
+        }
+
+        const entry = this.cache.get(key);
+        if (entry) {
+            if (Date.now() - entry.fetchedAt < ttl) {
+                this.cacheStats.hits++;
+            } else {
+                this.cacheStats.staleHits++;
+                if (!this.inflight.has(key)) {
+                    this.revalidate(key, requestOptions);
+                }
+            }
+            return entry.response;
+        }
+
+        this.cacheStats.misses++;
+        const generation = this.generation;
+        const response = await this.request(endpoint, { ...requestOptions, method: 'GET' });
+        this.storeResponse(key, response, generation);
+        return response;
     }
 
     /**
@@ -390,7 +598,7 @@ class ApiService {
      */
     async healthCheck() {
         try {
-            const response = await this.get('/health', { timeout: 5000 });
+            const response = await this.get('/health', { timeout: 5000, cache: false });
             return {
                 healthy: true,
                 timestamp: new Date().toISOString(),
@@ -405,6 +613,72 @@ class ApiService {
         }
     }
 
+    /**
+     * Sync the local reservation store with the server.
+     * The first call fetches a full snapshot; later calls only fetch changes
+     * since the last sync token and merge them in place.
+     */
+    async syncReservations() {
+        // Concurrent callers share one sync instead of racing on the token
+        if (this.reservationSync) {
+            return this.reservationSync;
+        }
+
+        this.reservationSync = (async () => {
+            let hasMore = true;
+
+            while (hasMore) {
+                const since = this.reservationSyncToken
+                    ? `?since=${encodeURIComponent(this.reservationSyncToken)}`
+                    : '';
+                const response = await this.get(`/api/reservations/changes${since}`, { cache: false });
+                const delta = response.data;
+
+                this.mergeReservationChanges(delta);
+                hasMore = Boolean(delta.has_more);
+            }
+
+            return this.getReservations();
+        })();
+
+        try {
+            return await this.reservationSync;
+        } finally {
+            this.reservationSync = null;
+        }
+    }
+
+    /**
+     * Apply one delta page from /api/reservations/changes to the local store
+     */
+    mergeReservationChanges(delta) {
+        (delta.changes || []).forEach(reservation => {
+            this.reservationStore.set(reservation.id, reservation);
+        });
+        (delta.deleted || []).forEach(id => {
+            this.reservationStore.delete(id);
+        });
+
+        if (delta.next_token) {
+            this.reservationSyncToken = delta.next_token;
+        }
+    }
+
+    /**
+     * Reservations currently held in the local store
+     */
+    getReservations() {
+        return Array.from(this.reservationStore.values());
+    }
+
+    /**
+     * Drop the local reservation store (e.g. on logout)
+     */
+    resetReservationStore() {
+        this.reservationStore.clear();
+        this.reservationSyncToken = null;
+    }
+
     /**
      * Batch requests
      */
@@ -452,7 +726,8 @@ class ApiService {
 const api = new ApiService();
 
 // Mock API responses for development
-if (process.env.NODE_ENV === 'development' || !window.API_BASE_URL) {
+// Only under a Node/bundler development build; browsers always talk to the real backend
+if (typeof process !== 'undefined' && process.env.NODE_ENV === 'development') {
     // Mock responses will be used when no real backend is available
     api.mockResponses = {
         '/auth/login': {
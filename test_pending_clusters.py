@@ -0,0 +1,58 @@
+import os
+import tempfile
+
+# Configuration is read when the app package is imported, so point it at a
+# throwaway database (and keep the background scheduler off) first
+DB_DIR = tempfile.mkdtemp()
+os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(DB_DIR, 'test.db')}"
+os.environ['SCHEDULER_ENABLED'] = 'false'
+
+from flask_jwt_extended import create_access_token
+from app import create_app, db
+from app.models.lab import Lab
+from app.models.user import User
+
+def test_pending_clusters_with_utc_offsets():
+    """from/to with Z or an offset are compared with stored (naive UTC) times"""
+    print("🧪 Testing pending clusters with timezone-qualified bounds")
+    print("=" * 40)
+
+    app = create_app()
+    client = app.test_client()
+    with app.app_context():
+        db.create_all()
+        admin = User(username='clusters_admin', email='clusters_admin@example.com', password_hash='x', role='admin')
+        instructor = User(username='clusters_instructor', email='clusters_instructor@example.com', password_hash='x', role='instructor')
+        lab = Lab(name='Clusters Lab', capacity=30, location='Building T')
+        db.session.add_all([admin, instructor, lab])
+        db.session.commit()
+        admin_headers = {'Authorization': f'Bearer {create_access_token(identity=admin.id)}'}
+        instructor_headers = {'Authorization': f'Bearer {create_access_token(identity=instructor.id)}'}
+        lab_id = lab.id
+
+    # A pending recurring series: expanded lazily when clusters are built
+    response = client.post('/api/reservations', headers=instructor_headers, json={
+        'lab_id': lab_id,
+        'course_code': 'CS101',
+        'course_name': 'Intro',
+        'section': '1',
+        'start_time': '2030-12-02T09:00:00',
+        'end_time': '2030-12-02T10:00:00',
+        'recurrence': {'weekdays': ['MO'], 'count': 4}
+    })
+    assert response.status_code == 201, response.get_json()
+    series_id = response.get_json()['reservation']['id']
+
+    for bounds in ('from=2030-12-01T00:00:00Z',
+                   'from=2030-12-01T02:00:00%2B02:00&to=2030-12-31T00:00:00Z',
+                   'from=2030-12-01T00:00:00'):
+        response = client.get(f'/api/reservations/pending/clusters?{bounds}&include_singletons=true', headers=admin_headers)
+        print(f"{bounds}: {response.status_code}")
+        assert response.status_code == 200, response.get_json()
+        members = [member['id'] for cluster in response.get_json()['clusters'] for member in cluster['members']]
+        assert members == [series_id]
+
+    print("✅ PENDING CLUSTERS ACCEPT UTC OFFSETS")
+
+if __name__ == '__main__':
+    test_pending_clusters_with_utc_offsets()